@@ -2,9 +2,10 @@ import os
 import re
 import json
 import base64
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import boto3
 import portalocker
@@ -152,8 +153,16 @@ class AWSSecretResolver(BaseSecretResolver):
     _SECRET_VERIFY_MAX_ATTEMPTS = 10
     _SECRET_VERIFY_DELAY_SECONDS = 0.2
 
+    # 同じ参照 (username/password 等) はパイプライン内で何度も解決されるため、
+    # 読み出し結果をこの秒数だけ保持して API 呼び出しを省く。
+    # 失敗 (None) は保持せず、write() 時は全件破棄する。
+    _READ_CACHE_TTL_SECONDS = 300.0
+    _READ_CACHE_MAX_ENTRIES = 256
+
     def __init__(self):
         super().__init__()
+        self._read_cache: Dict[str, Tuple[str, float]] = {}
+        self._read_cache_lock = threading.Lock()
         try:
             session = boto3.Session()
             region = session.region_name or "ap-northeast-1"
@@ -168,6 +177,25 @@ class AWSSecretResolver(BaseSecretResolver):
             self.kms_client = None
 
     def read(self, secret_reference: str) -> Optional[str]:
+        now = time.monotonic()
+        with self._read_cache_lock:
+            cached = self._read_cache.get(secret_reference)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        value = self._read_uncached(secret_reference)
+        if value is not None:
+            with self._read_cache_lock:
+                if len(self._read_cache) >= self._READ_CACHE_MAX_ENTRIES:
+                    self._read_cache.clear()
+                self._read_cache[secret_reference] = (value, now + self._READ_CACHE_TTL_SECONDS)
+        return value
+
+    def clear_read_cache(self) -> None:
+        with self._read_cache_lock:
+            self._read_cache.clear()
+
+    def _read_uncached(self, secret_reference: str) -> Optional[str]:
         if secret_reference.startswith("aws_secretsmanager://"):
             return self._read_from_secretsmanager(secret_reference)
         elif secret_reference.startswith("aws_parameterstore://"):
@@ -179,6 +207,8 @@ class AWSSecretResolver(BaseSecretResolver):
             return None
 
     def write(self, secret_reference: str, secret_value: str, **kwargs: Any) -> None:
+        # 同じシークレットを別のキー (name@key) で参照しているエントリもあるため全件破棄する
+        self.clear_read_cache()
         if secret_reference.startswith("aws_secretsmanager://"):
             return self._write_to_secretsmanager(secret_reference, secret_value)
         elif secret_reference.startswith("aws_parameterstore://"):
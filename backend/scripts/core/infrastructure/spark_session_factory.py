@@ -1,15 +1,18 @@
+import atexit
 import os
 import sys
 import threading
 from typing import Optional
 
 from core.infrastructure.env_detector import is_running_on_aws
+from core.infrastructure.storage_path_utils import get_scheme, is_local_path
 
 
 class SparkSessionFactory:
     _spark_session: Optional["object"] = None  # SparkSession or Glue SparkSession
     _glue_context: Optional["object"] = None   # GlueContext for AWS
     _lock: threading.Lock = threading.Lock()
+    _atexit_registered: bool = False
 
     @staticmethod
     def get_spark_session():
@@ -54,6 +57,11 @@ class SparkSessionFactory:
 
                 SparkSessionFactory._spark_session = spark
 
+                # プラグインは実行ごとにセッションを停止しないため、プロセス終了時に JVM を停止する
+                if not SparkSessionFactory._atexit_registered:
+                    atexit.register(SparkSessionFactory.stop_spark_session)
+                    SparkSessionFactory._atexit_registered = True
+
         return SparkSessionFactory._spark_session
 
     @staticmethod
@@ -67,6 +75,17 @@ class SparkSessionFactory:
                 SparkSessionFactory._spark_session = None
                 SparkSessionFactory._glue_context = None
 
+    @staticmethod
+    def can_read_natively(path: str) -> bool:
+        """
+        Spark のリーダー (spark.read) で直接読めるパスかを判定する。
+        ローカルのセッションには S3A を設定していないため、s3:// は Glue 上でのみ読める。
+        http(s):// やメモリ上のファイルは Spark では読めないため、呼び出し側で pandas 経由にする。
+        """
+        if is_local_path(path):
+            return True
+        return get_scheme(path) == "s3" and is_running_on_aws()
+
     @staticmethod
     def get_glue_context():
         # ローカル(Windows)環境で呼ばれた場合に明確なエラーを出す
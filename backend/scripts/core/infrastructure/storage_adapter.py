@@ -1,9 +1,14 @@
+import errno
 import io
 import os
 import shutil
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
 import requests
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, BinaryIO, Dict, List, Optional, Union
 
 from core.data_container.formats import SupportedFormats
 from .storage_path_utils import (
@@ -11,12 +16,21 @@ from .storage_path_utils import (
     normalize_path,
     is_remote_path,
     is_memory_path,
+    is_local_path,
 )
 from .storage_backends import LocalStorageBackend, S3StorageBackend, MemoryStorageBackend
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# read_arrow で CSV / JSONL を解析する単位 (ブロックごとに複数スレッドで並列に解析される)
+ARROW_READ_BLOCK_SIZE = 16 * 1024 * 1024
+# ファイル全体を必要とする読み込み (Parquet のフッター参照等) で S3 から並列に取得する際の設定
+PARALLEL_READ_CONCURRENCY = 8
+PARALLEL_READ_PART_SIZE = 16 * 1024 * 1024
+# Parquet 出力の既定の圧縮形式 (snappy より小さく、展開速度は同程度)。プラグイン間の受け渡しファイルにも使われる
+DEFAULT_PARQUET_COMPRESSION = "zstd"
+
 
 class StorageAdapter:
     """
@@ -59,6 +73,24 @@ class StorageAdapter:
             return path
         return normalize_path(path, os.getcwd())
 
+    @staticmethod
+    def _replace_local_file(source: str, dest: str) -> None:
+        """
+        ローカルファイルを移動する。同一ファイルシステムなら os.replace (rename) で
+        データをコピーせずに移動し、別ファイルシステム (EXDEV) の場合のみ
+        shutil.copyfile (Linux では sendfile によるカーネル内コピー) 後に元ファイルを削除する。
+        """
+        parent = os.path.dirname(dest)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        try:
+            os.replace(source, dest)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.copyfile(source, dest)
+            os.remove(source)
+
     def _get_storage_options(self, path: str) -> Dict[str, Any]:
         """
         pandas の read_csv/to_csv 等に渡す storage_options を解決する。
@@ -102,12 +134,87 @@ class StorageAdapter:
             logger.error(f"Failed to read file from '{path}': {e}")
             raise
 
+    def read_arrow(self, path: str, encoding: str = "utf-8") -> pa.Table:
+        """
+        pandas を経由せず pyarrow で Arrow のテーブルとして読み込む。
+        CSV / JSONL はブロック単位にマルチスレッドで解析する。対応形式は CSV / Parquet / JSONL。
+        """
+        logger.info(f"Reading Arrow table from: {path}")
+        file_format = SupportedFormats.from_path(path)
+        try:
+            if file_format == SupportedFormats.PARQUET:
+                if is_local_path(path):
+                    return pq.read_table(self._normalize(path))
+                return pq.read_table(pa.BufferReader(self.read_bytes(
+                    path,
+                    max_concurrency=PARALLEL_READ_CONCURRENCY,
+                    multipart_chunksize=PARALLEL_READ_PART_SIZE,
+                )))
+            if file_format == SupportedFormats.CSV:
+                with self.open_stream(path) as stream:
+                    return pa_csv.read_csv(
+                        stream,
+                        read_options=pa_csv.ReadOptions(encoding=encoding, block_size=ARROW_READ_BLOCK_SIZE),
+                    )
+            if file_format == SupportedFormats.JSONL:
+                if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+                    raise ValueError("Reading JSONL as Arrow supports only UTF-8 input.")
+                with self.open_stream(path) as stream:
+                    return pa_json.read_json(
+                        stream, read_options=pa_json.ReadOptions(block_size=ARROW_READ_BLOCK_SIZE)
+                    )
+            raise ValueError(f"Reading Arrow table from format '{file_format.value}' is not supported.")
+        except Exception as e:
+            logger.error(f"Failed to read file from '{path}': {e}")
+            raise
+
+    def write_arrow(
+        self,
+        data: Union[pa.Table, pa.RecordBatchReader],
+        path: str,
+        compression: Optional[str] = None,
+    ) -> int:
+        """
+        Arrow のテーブルまたは RecordBatchReader を pandas を経由せずに書き込む。
+        バッチ単位で出力ストリームへ書き出すため、Reader を渡せば全体をメモリに載せない。
+        compression は Parquet にのみ適用される (既定は DEFAULT_PARQUET_COMPRESSION)。対応形式は CSV / Parquet。書き込んだ行数を返す。
+        """
+        logger.info(f"Writing Arrow data to: {path}")
+        file_format = SupportedFormats.from_path(path)
+        if file_format not in (SupportedFormats.CSV, SupportedFormats.PARQUET):
+            raise ValueError(f"Writing Arrow data to format '{file_format.value}' is not supported.")
+        reader = data.to_reader() if isinstance(data, pa.Table) else data
+        rows = 0
+        sink = self.open_write_stream(path)
+        try:
+            if file_format == SupportedFormats.PARQUET:
+                writer = pq.ParquetWriter(sink, reader.schema, compression=compression or DEFAULT_PARQUET_COMPRESSION)
+            else:
+                writer = pa_csv.CSVWriter(sink, reader.schema)
+            with writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+        except BaseException as e:
+            logger.error(f"Failed to write file to '{path}': {e}")
+            # S3 (s3fs) では close するとアップロードが確定するため、途中までの内容を破棄する。
+            # discard 後の s3fs ファイルは close できない (buffer が None になる) ため close しない
+            if hasattr(sink, "discard"):
+                sink.discard()
+            else:
+                sink.close()
+            raise
+        sink.close()
+        return rows
+
     def write_df(self, df: pd.DataFrame, path: str, write_options: Optional[Dict[str, Any]] = None):
         logger.info(f"Writing {len(df)} rows to: {path}")
         write_opts = write_options.copy() if write_options else {}
         spark = write_opts.pop("spark", None)
         normalized = self._normalize(path)
         file_format = SupportedFormats.from_path(normalized)
+        if spark is None and file_format == SupportedFormats.PARQUET:
+            write_opts.setdefault("compression", DEFAULT_PARQUET_COMPRESSION)
 
         try:
             if is_memory_path(path):
@@ -217,22 +324,86 @@ class StorageAdapter:
     # Bytes read/write
     # ------------------------------------------------------------------
 
-    def read_bytes(self, path: str) -> bytes:
+    def read_bytes(
+        self,
+        path: str,
+        max_concurrency: Optional[int] = None,
+        multipart_chunksize: Optional[int] = None,
+    ) -> bytes:
+        """
+        max_concurrency / multipart_chunksize は S3 にのみ適用され、指定時は
+        パートごとの Range GET を並列に発行して読み込む。
+        """
         logger.info(f"Reading bytes from: {path}")
         try:
             if get_scheme(path) in {"http", "https"}:
                 return self._read_http_bytes(path)
             normalized = self._normalize(path)
-            return self._get_backend(path).read_bytes(normalized)
+            backend = self._get_backend(path)
+            if backend is self._s3:
+                return self._s3.read_bytes(
+                    normalized,
+                    max_concurrency=max_concurrency,
+                    multipart_chunksize=multipart_chunksize,
+                )
+            return backend.read_bytes(normalized)
         except Exception as e:
             logger.error(f"Failed to read bytes from '{path}': {e}")
             raise
 
+    def open_stream(self, path: str) -> BinaryIO:
+        """
+        読み込み用のファイルライクオブジェクトを返す (呼び出し側で close すること)。
+        ファイル全体をメモリに載せずに他の転送先へ流し込む用途で使う。
+        """
+        logger.info(f"Opening read stream: {path}")
+        if get_scheme(path) in {"http", "https"}:
+            response = requests.get(path, timeout=60, stream=True)
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return response.raw
+        normalized = self._normalize(path)
+        return self._get_backend(path).open_stream(normalized)
+
+    def open_write_stream(self, path: str) -> BinaryIO:
+        """
+        書き込み用のファイルライクオブジェクトを返す (呼び出し側で close すること)。
+        ライブラリ (pyarrow 等) の出力を全体をメモリに載せずに書き込む用途で使う。
+        """
+        logger.info(f"Opening write stream: {path}")
+        normalized = self._normalize(path)
+        return self._get_backend(path).open_write_stream(normalized)
+
     def write_bytes(self, content: bytes, path: str):
         logger.info(f"Writing {len(content)} bytes to: {path}")
         normalized = self._normalize(path)
         self._get_backend(path).write_bytes(normalized, content)
 
+    def write_stream(
+        self,
+        stream: BinaryIO,
+        path: str,
+        max_concurrency: Optional[int] = None,
+        multipart_chunksize: Optional[int] = None,
+    ):
+        """
+        ファイルライクオブジェクト (HTTPレスポンスの raw、ソケット等) を
+        全体をメモリに載せずに書き込む。
+        max_concurrency / multipart_chunksize は S3 のマルチパート転送にのみ適用される。
+        """
+        logger.info(f"Writing stream to: {path}")
+        normalized = self._normalize(path)
+        backend = self._get_backend(path)
+        if backend is self._s3:
+            self._s3.write_stream(
+                normalized,
+                stream,
+                max_concurrency=max_concurrency,
+                multipart_chunksize=multipart_chunksize,
+            )
+        else:
+            backend.write_stream(normalized, stream)
+
     # ------------------------------------------------------------------
     # File operations
     # ------------------------------------------------------------------
@@ -258,7 +429,17 @@ class StorageAdapter:
             shutil.copy(normalized, local_path)
             logger.info("Copied from local path complete.")
 
-    def upload_local_file(self, local_path: Union[str, os.PathLike], remote_path: str):
+    def upload_local_file(
+        self,
+        local_path: Union[str, os.PathLike],
+        remote_path: str,
+        max_concurrency: Optional[int] = None,
+        multipart_chunksize: Optional[int] = None,
+    ):
+        """
+        ローカルファイルを remote_path にアップロード (ローカルの場合はコピー) する。
+        max_concurrency / multipart_chunksize は S3 のマルチパート転送にのみ適用される。
+        """
         local_path = os.path.abspath(local_path)
         logger.info(f"Uploading local file '{local_path}' to '{remote_path}'...")
         if not os.path.isfile(local_path):
@@ -274,7 +455,12 @@ class StorageAdapter:
             normalized = self._normalize(remote_path)
             if normalized.endswith("/"):
                 normalized = normalized + os.path.basename(local_path)
-            self._s3.upload_file(local_path, normalized)
+            self._s3.upload_file(
+                local_path,
+                normalized,
+                max_concurrency=max_concurrency,
+                multipart_chunksize=multipart_chunksize,
+            )
         else:
             normalized = self._normalize(remote_path)
             parent = os.path.dirname(normalized)
@@ -283,6 +469,36 @@ class StorageAdapter:
             shutil.copy(local_path, normalized)
             logger.info("Copied to local path complete.")
 
+    def move_local_file(
+        self,
+        local_path: Union[str, os.PathLike],
+        remote_path: str,
+        max_concurrency: Optional[int] = None,
+        multipart_chunksize: Optional[int] = None,
+    ):
+        """
+        ローカルファイルを remote_path に移動する (元ファイルは残らない)。
+        ローカル宛ては rename で済ませ、それ以外は upload_local_file 後に元ファイルを削除する。
+        """
+        local_path = os.path.abspath(local_path)
+        if not os.path.isfile(local_path):
+            raise FileNotFoundError(f"Local file to move not found: {local_path}")
+
+        if not is_local_path(remote_path):
+            self.upload_local_file(
+                local_path,
+                remote_path,
+                max_concurrency=max_concurrency,
+                multipart_chunksize=multipart_chunksize,
+            )
+            os.remove(local_path)
+            return
+
+        normalized = self._normalize(remote_path)
+        logger.info(f"Moving local file '{local_path}' to '{normalized}'...")
+        self._replace_local_file(local_path, normalized)
+        logger.info("Moved to local path complete.")
+
     def list_files(self, path: str) -> List[str]:
         normalized = self._normalize(path)
         return self._get_backend(path).list_files(normalized)
@@ -306,14 +522,28 @@ class StorageAdapter:
         logger.info("Copy complete.")
 
     def copy_file_raw(self, source: str, dest: str):
+        """
+        バイナリのままコピーする。ローカル同士は shutil.copyfile (Linux では sendfile による
+        カーネル内コピー)、それ以外はストリーム経由で全体をメモリに載せずにコピーする。
+        """
         logger.info(f"Copying raw file from '{source}' to '{dest}'...")
-        content = self.read_bytes(source)
-        self.write_bytes(content, dest)
+        if is_local_path(source) and is_local_path(dest):
+            normalized_dest = self._normalize(dest)
+            parent = os.path.dirname(normalized_dest)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            shutil.copyfile(self._normalize(source), normalized_dest)
+        else:
+            with self.open_stream(source) as stream:
+                self.write_stream(stream, dest)
         logger.info("Raw copy complete.")
 
     def move_file(self, source: str, dest: str):
-        self.copy_file_raw(source, dest)
-        self.delete(source)
+        if is_local_path(source) and is_local_path(dest):
+            self._replace_local_file(self._normalize(source), self._normalize(dest))
+        else:
+            self.copy_file_raw(source, dest)
+            self.delete(source)
         logger.info(f"Moved file from '{source}' to '{dest}'")
 
     def mkdir(self, path: str, exist_ok: bool = True):
@@ -1,5 +1,6 @@
 import abc
-from typing import Any, Dict, List, Union
+import io
+from typing import Any, BinaryIO, Dict, List, Union
 import os
 
 
@@ -20,6 +21,30 @@ class BaseStorageBackend(abc.ABC):
         """指定パスにバイト列を書き込む"""
         pass
 
+    def write_stream(self, path: str, stream: BinaryIO) -> None:
+        """
+        ファイルライクオブジェクトの内容を指定パスに書き込む。
+        既定実装は全体を読み込んで write_bytes に委譲するため、
+        ストリーミング書き込みが可能なバックエンドはオーバーライドすること。
+        """
+        self.write_bytes(path, stream.read())
+
+    def open_write_stream(self, path: str) -> BinaryIO:
+        """
+        指定パスを書き込み用のファイルライクオブジェクトとして開く。
+        既定実装はメモリ上に蓄積し close 時に write_bytes へ委譲するため、
+        逐次書き込みが可能なバックエンドはオーバーライドすること。
+        """
+        return _WriteOnCloseBuffer(self, path)
+
+    def open_stream(self, path: str) -> BinaryIO:
+        """
+        指定パスを読み込み用のファイルライクオブジェクトとして開く。
+        既定実装は全体を read_bytes で読み込むため、
+        逐次読み込みが可能なバックエンドはオーバーライドすること。
+        """
+        return io.BytesIO(self.read_bytes(path))
+
     @abc.abstractmethod
     def read_text(self, path: str, encoding: str = 'utf-8') -> str:
         """指定パスからテキストを読み込む"""
@@ -68,4 +93,18 @@ class BaseStorageBackend(abc.ABC):
     @abc.abstractmethod
     def stat(self, path: str) -> Dict[str, Any]:
         """ファイルのメタデータを返す"""
-        pass
\ No newline at end of file
+        pass
+
+
+class _WriteOnCloseBuffer(io.BytesIO):
+    """close 時に内容を backend.write_bytes で書き込む BytesIO"""
+
+    def __init__(self, backend: BaseStorageBackend, path: str):
+        super().__init__()
+        self._backend = backend
+        self._path = path
+
+    def close(self) -> None:
+        if not self.closed:
+            self._backend.write_bytes(self._path, self.getvalue())
+        super().close()
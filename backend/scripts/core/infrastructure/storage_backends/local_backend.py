@@ -1,13 +1,16 @@
 import os
 import shutil
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, List
 
 from .base_backend import BaseStorageBackend
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# write_stream でのコピー単位。小さすぎると read/write の往復回数が増える。
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 
 class LocalStorageBackend(BaseStorageBackend):
     """
@@ -27,6 +30,33 @@ class LocalStorageBackend(BaseStorageBackend):
         with open(path, 'wb') as f:
             f.write(data)
 
+    def write_stream(self, path: str, stream: BinaryIO) -> None:
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with open(path, 'wb') as f:
+            readinto = getattr(stream, 'readinto', None)
+            if readinto is None:
+                shutil.copyfileobj(stream, f, STREAM_CHUNK_SIZE)
+                return
+            # 1つのバッファを使い回し、チャンクごとの bytes 生成を避ける
+            buffer = bytearray(STREAM_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                n = readinto(buffer)
+                if not n:
+                    break
+                f.write(view[:n])
+
+    def open_stream(self, path: str) -> BinaryIO:
+        return open(path, 'rb')
+
+    def open_write_stream(self, path: str) -> BinaryIO:
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        return open(path, 'wb')
+
     def read_text(self, path: str, encoding: str = 'utf-8') -> str:
         if not os.path.isfile(path):
             raise FileNotFoundError(f"Local file not found: {path}")
@@ -1,5 +1,6 @@
+import io
 import os
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, List, Optional
 
 from .base_backend import BaseStorageBackend
 from core.infrastructure.storage_path_utils import parse_s3_path
@@ -7,6 +8,9 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# upload_fileobj が先読みしてメモリに保持するパート数の上限 (boto3 の TransferConfig の既定値)
+MAX_IN_MEMORY_UPLOAD_CHUNKS = 10
+
 
 class S3StorageBackend(BaseStorageBackend):
     """
@@ -28,16 +32,74 @@ class S3StorageBackend(BaseStorageBackend):
         except ImportError:
             raise ImportError("s3fs is required for S3 text/stream operations. Please install it.")
 
-    def read_bytes(self, path: str) -> bytes:
+    def _transfer_config(self, max_concurrency: Optional[int] = None,
+                         multipart_chunksize: Optional[int] = None):
+        """
+        マルチパート転送の並列数・パートサイズを指定された場合のみ TransferConfig を生成する。
+        未指定時は None を返し、boto3 の既定値に委ねる。
+        """
+        if max_concurrency is None and multipart_chunksize is None:
+            return None
+        from boto3.s3.transfer import TransferConfig
+        options: Dict[str, Any] = {"use_threads": True}
+        if max_concurrency is not None:
+            options["max_concurrency"] = max_concurrency
+        if multipart_chunksize is not None:
+            options["multipart_chunksize"] = multipart_chunksize
+        config = TransferConfig(**options)
+        if max_concurrency is not None:
+            # upload_fileobj は送信スレッドで次のパートを読みながら、ワーカースレッドが
+            # upload_part を並列実行する。先読みできるパート数 (メモリに載る量) を
+            # 送信中の分 + 同数の待ち行列に抑えるが、boto3 の既定値 (10) は超えないようにし、
+            # 並列数を上げてもメモリに載るのは最大「パートサイズ × 10」に留める。
+            # (boto3 の TransferConfig はコンストラクタ引数として受け付けないため属性で設定する)
+            config.max_in_memory_upload_chunks = min(MAX_IN_MEMORY_UPLOAD_CHUNKS, max_concurrency * 2)
+        return config
+
+    def read_bytes(self, path: str,
+                   max_concurrency: Optional[int] = None,
+                   multipart_chunksize: Optional[int] = None) -> bytes:
+        config = self._transfer_config(max_concurrency, multipart_chunksize)
+        if config is None:
+            s3 = self._s3fs()
+            with s3.open(path, 'rb') as f:
+                return f.read()
+        # download_fileobj は multipart_chunksize ごとの Range GET を並列に発行し、
+        # シーク可能な出力には各パートを到着順に該当オフセットへ書き込む
+        s3 = self._s3_client()
+        bucket, key = parse_s3_path(path)
+        buffer = io.BytesIO()
+        s3.download_fileobj(bucket, key, buffer, Config=config)
+        return buffer.getvalue()
+
+    def open_stream(self, path: str) -> BinaryIO:
+        # get_object の StreamingBody は read(n) のたびにソケットから読むため、
+        # オブジェクト全体をメモリに載せない
+        s3 = self._s3_client()
+        bucket, key = parse_s3_path(path)
+        return s3.get_object(Bucket=bucket, Key=key)["Body"]
+
+    def open_write_stream(self, path: str) -> BinaryIO:
+        # s3fs のファイルはブロックサイズごとにマルチパートでアップロードするため、
+        # 書き込み内容全体をメモリに載せない
         s3 = self._s3fs()
-        with s3.open(path, 'rb') as f:
-            return f.read()
+        return s3.open(path, 'wb')
 
     def write_bytes(self, path: str, data: bytes) -> None:
         s3 = self._s3fs()
         with s3.open(path, 'wb') as f:
             f.write(data)
 
+    def write_stream(self, path: str, stream: BinaryIO,
+                     max_concurrency: Optional[int] = None,
+                     multipart_chunksize: Optional[int] = None) -> None:
+        # upload_fileobj はマルチパートアップロードで逐次送信するため、
+        # ストリーム全体をメモリに載せない
+        s3 = self._s3_client()
+        bucket, key = parse_s3_path(path)
+        config = self._transfer_config(max_concurrency, multipart_chunksize)
+        s3.upload_fileobj(stream, bucket, key, Config=config)
+
     def read_text(self, path: str, encoding: str = 'utf-8') -> str:
         s3 = self._s3fs()
         with s3.open(path, 'r', encoding=encoding) as f:
@@ -136,8 +198,11 @@ class S3StorageBackend(BaseStorageBackend):
         s3.download_file(bucket, key, local_path)
         logger.info("Download from S3 complete.")
 
-    def upload_file(self, local_path: str, remote_path: str) -> None:
+    def upload_file(self, local_path: str, remote_path: str,
+                    max_concurrency: Optional[int] = None,
+                    multipart_chunksize: Optional[int] = None) -> None:
         s3 = self._s3_client()
         bucket, key = parse_s3_path(remote_path)
-        s3.upload_file(local_path, bucket, key)
+        config = self._transfer_config(max_concurrency, multipart_chunksize)
+        s3.upload_file(local_path, bucket, key, Config=config)
         logger.info("Upload to S3 complete.")
\ No newline at end of file
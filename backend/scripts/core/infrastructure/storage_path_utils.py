@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from urllib.parse import urlparse
 from urllib.request import url2pathname
 from pathlib import Path
@@ -7,7 +8,10 @@ from typing import Callable, Dict
 NormalizeFunc = Callable[[str, str], str]
 
 
+@lru_cache(maxsize=4096)
 def get_scheme(path: str) -> str:
+    # 1回のストレージ操作で is_local_path / _normalize / _get_backend から
+    # 同じパスが繰り返し判定されるため、urlparse の結果をキャッシュする
     parsed = urlparse(path)
     scheme = parsed.scheme
 
@@ -114,7 +118,11 @@ SCHEME_NORMALIZERS: Dict[str, NormalizeFunc] = {
 }
 
 
+@lru_cache(maxsize=4096)
 def normalize_path(path: str, project_root: str) -> str:
+    # プラグインは実行ごとに同じ output_path を os.getcwd() 基準で正規化するため、
+    # Path() の生成や正規表現判定を伴う結果を (path, project_root) 単位でキャッシュする。
+    # cwd 自体はキャッシュせず引数に含めるので、chdir 後も正しく解決される。
     scheme = get_scheme(path)
     normalizer = SCHEME_NORMALIZERS.get(scheme)
     if normalizer is None:
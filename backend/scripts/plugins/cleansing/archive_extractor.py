@@ -15,6 +15,10 @@ logger = setup_logger(__name__)
 
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
+# S3 上のアーカイブはパートごとの Range GET を並列に発行して取得する
+DOWNLOAD_MAX_CONCURRENCY = 8
+DOWNLOAD_PART_SIZE = 16 * 1024 * 1024
+
 class ArchiveExtractor(BasePlugin):
     """
     (Storage Aware) Extracts files from an archive (local or S3) to a
@@ -58,7 +62,11 @@ class ArchiveExtractor(BasePlugin):
 
             logger.info(f"[{self.get_plugin_name()}] Reading archive '{input_path}' using StorageAdapter...")
             try:
-                archive_content_bytes = storage_adapter.read_bytes(input_path)
+                archive_content_bytes = storage_adapter.read_bytes(
+                    input_path,
+                    max_concurrency=DOWNLOAD_MAX_CONCURRENCY,
+                    multipart_chunksize=DOWNLOAD_PART_SIZE,
+                )
                 with open(local_archive_path, 'wb') as f:
                     f.write(archive_content_bytes)
             except Exception as e:
@@ -1,5 +1,6 @@
+import io
 import os
-import tempfile
+import codecs
 import charset_normalizer
 from typing import Dict, Any
 import pluggy
@@ -14,6 +15,46 @@ logger = setup_logger(__name__)
 
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
+# 入力を読み出して変換する単位。ファイル全体を bytes / str として保持しない。
+CONVERSION_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class _TranscodingStream(io.RawIOBase):
+    """
+    source を読みながら source_encoding から target_encoding へ変換して返す読み出し専用ストリーム。
+    チャンク境界で分断されたマルチバイト文字はインクリメンタルデコーダーが次のチャンクと結合する。
+    テキストモードでの読み込みと同様に、改行コード (\r\n, \r) は \n に統一する。
+    head は source から既に読み出した先頭部分 (エンコーディング判定用のサンプル)。
+    """
+
+    def __init__(self, source, head: bytes, source_encoding: str, target_encoding: str):
+        super().__init__()
+        self._source = source
+        self._head = head
+        self._decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(source_encoding)(errors='replace'), translate=True
+        )
+        self._encoder = codecs.getincrementalencoder(target_encoding)()
+        self._pending = memoryview(b"")
+        self._done = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._pending and not self._done:
+            chunk = self._head or self._source.read(CONVERSION_CHUNK_SIZE)
+            self._head = b""
+            final = not chunk
+            text = self._decoder.decode(chunk, final)
+            self._pending = memoryview(self._encoder.encode(text, final))
+            self._done = final
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
 class EncodingConverter(BasePlugin):
     """
     (Storage Aware) Converts the character encoding of a text file from local or S3.
@@ -46,11 +87,8 @@ class EncodingConverter(BasePlugin):
             "required": ["input_path", "output_path"]
         }
 
-    def _detect_encoding(self, file_path: str, sample_size: int) -> str:
+    def _detect_encoding(self, raw_data: bytes, file_path: str) -> str:
         try:
-            with open(file_path, 'rb') as f:
-                raw_data = f.read(sample_size)
-
             result = charset_normalizer.from_bytes(raw_data).best()
             file_name = os.path.basename(file_path)
 
@@ -73,24 +111,25 @@ class EncodingConverter(BasePlugin):
         if not input_path or not output_path:
             raise ValueError("Missing required parameters: 'input_path' and 'output_path'.")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_input_path = os.path.join(temp_dir, "input_file_for_conversion")
+        try:
+            stream = storage_adapter.open_stream(input_path)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read input file: {str(e)}")
 
+        with stream:
             try:
-                file_content_bytes = storage_adapter.read_bytes(input_path)
-                with open(temp_input_path, 'wb') as f:
-                    f.write(file_content_bytes)
+                head = b"" if source_encoding else stream.read(sample_size)
             except Exception as e:
                 raise RuntimeError(f"Failed to read input file: {str(e)}")
 
-            source_enc = source_encoding or self._detect_encoding(temp_input_path, sample_size)
+            source_enc = source_encoding or self._detect_encoding(head, input_path)
 
             logger.info(f"[{self.get_plugin_name()}] Converting from '{source_enc}' to '{target_encoding}'...")
 
             try:
-                with open(temp_input_path, 'r', encoding=source_enc, errors='replace') as f:
-                    content = f.read()
-                storage_adapter.write_text(content, output_path)
+                # 一時ファイルや変換後の全文を作らず、チャンクごとに変換しながら書き込む
+                converted = _TranscodingStream(stream, head, source_enc, target_encoding)
+                storage_adapter.write_stream(converted, output_path, multipart_chunksize=CONVERSION_CHUNK_SIZE)
                 logger.info(f"[{self.get_plugin_name()}] File successfully converted and saved to '{output_path}'.")
             except Exception as e:
                 raise RuntimeError(f"Encoding conversion failed: {str(e)}")
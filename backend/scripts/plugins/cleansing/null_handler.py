@@ -1,9 +1,14 @@
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import pluggy
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 from core.data_container.container import DataContainer
-from core.infrastructure import storage_adapter
+from core.data_container.formats import SupportedFormats
+from core.infrastructure import storage_adapter, is_local_path, normalize_path
+from core.infrastructure.storage_adapter import DEFAULT_PARQUET_COMPRESSION
 from core.plugin_manager.base_plugin import BasePlugin
 
 from utils.logger import setup_logger
@@ -12,6 +17,11 @@ logger = setup_logger(__name__)
 
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
+# ローカル Parquet 同士の処理では、この行数ごとにレコードバッチを読み書きし
+# ファイル全体を DataFrame に載せない。
+PARQUET_BATCH_SIZE = 100_000
+
+
 class NullHandler(BasePlugin):
     """
     (Storage Aware) Handles missing values in a tabular file (local or S3),
@@ -37,17 +47,106 @@ class NullHandler(BasePlugin):
             "required": ["input_path", "output_path", "strategy"]
         }
 
-    def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
-        input_path = str(self.params.get("input_path"))
-        output_path = str(self.params.get("output_path"))
-        strategy = self.params.get("strategy")
-        subset: Optional[List[str]] = self.params.get("subset")
-        fill_value = self.params.get("value")
-        fill_method = self.params.get("method")
+    def _can_stream_parquet(self, input_path: str, output_path: str, strategy: str,
+                            fill_value: Any, fill_method: Optional[str]) -> bool:
+        if not (is_local_path(input_path) and is_local_path(output_path)):
+            return False
+        if SupportedFormats.from_path(input_path) != SupportedFormats.PARQUET:
+            return False
+        if SupportedFormats.from_path(output_path) != SupportedFormats.PARQUET:
+            return False
+        if strategy == 'drop_row':
+            return True
+        # method (ffill 等) はバッチ境界をまたぐため pandas で処理する
+        return strategy == 'fill' and fill_value is not None and fill_method is None
 
-        if not all([input_path, output_path, strategy]):
-            raise ValueError("Missing required parameters: 'input_path', 'output_path', and 'strategy'.")
+    @staticmethod
+    def _build_fill_scalars(schema: pa.Schema, fill_value: Any) -> Optional[Dict[str, pa.Scalar]]:
+        """
+        列ごとの補完値を列の型にキャストしておく。
+        キャストできない列がある場合は None を返し、pandas での処理に切り替える。
+        """
+        scalars = {}
+        for field in schema:
+            value = fill_value.get(field.name) if isinstance(fill_value, dict) else fill_value
+            if value is None:
+                continue
+            try:
+                scalars[field.name] = pa.scalar(value).cast(field.type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                return None
+        return scalars
+
+    @staticmethod
+    def _nan_to_null(table: pa.Table) -> pa.Table:
+        """
+        pandas (isnull / dropna / fillna) と同様に浮動小数点列の NaN も欠損値として扱うため、
+        NaN を null に置き換える (pandas 経由で書き出した場合も NaN は null として保存される)。
+        """
+        for index, field in enumerate(table.schema):
+            if pa.types.is_floating(field.type):
+                column = table.column(index)
+                nan_mask = pc.is_nan(column)
+                if pc.any(nan_mask).as_py():
+                    table = table.set_column(index, field, pc.if_else(nan_mask, pa.scalar(None, field.type), column))
+        return table
+
+    @staticmethod
+    def _count_nulls(table: pa.Table) -> int:
+        return sum(column.null_count for column in table.columns)
+
+    @staticmethod
+    def _drop_null_rows(table: pa.Table, subset: Optional[List[str]]) -> pa.Table:
+        if not subset:
+            return pc.drop_null(table)
+        mask = pc.is_valid(table.column(subset[0]))
+        for name in subset[1:]:
+            mask = pc.and_(mask, pc.is_valid(table.column(name)))
+        return table.filter(mask)
+
+    @staticmethod
+    def _fill_nulls(table: pa.Table, fill_scalars: Dict[str, pa.Scalar]) -> pa.Table:
+        for name, scalar in fill_scalars.items():
+            index = table.schema.get_field_index(name)
+            table = table.set_column(index, name, pc.fill_null(table.column(index), scalar))
+        return table
+
+    def _process_parquet_batches(self, input_path: str, output_path: str, strategy: str,
+                                 subset: Optional[List[str]], fill_value: Any) -> Optional[Tuple[int, int]]:
+        source = normalize_path(input_path, os.getcwd())
+        destination = normalize_path(output_path, os.getcwd())
+        if os.path.abspath(source) == os.path.abspath(destination):
+            return None
 
+        reader = pq.ParquetFile(source)
+        schema = reader.schema_arrow
+        fill_scalars = None
+        if strategy == 'fill':
+            fill_scalars = self._build_fill_scalars(schema, fill_value)
+            if fill_scalars is None:
+                return None
+
+        parent = os.path.dirname(destination)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        logger.info(f"[{self.get_plugin_name()}] Processing '{input_path}' in record batches of {PARQUET_BATCH_SIZE} rows.")
+        initial_nulls = 0
+        final_nulls = 0
+        with pq.ParquetWriter(destination, schema, compression=DEFAULT_PARQUET_COMPRESSION) as writer:
+            for batch in reader.iter_batches(batch_size=PARQUET_BATCH_SIZE):
+                table = self._nan_to_null(pa.Table.from_batches([batch], schema=schema))
+                initial_nulls += self._count_nulls(table)
+                if strategy == 'drop_row':
+                    table = self._drop_null_rows(table, subset)
+                else:
+                    table = self._fill_nulls(table, fill_scalars)
+                final_nulls += self._count_nulls(table)
+                writer.write_table(table)
+        return initial_nulls, final_nulls
+
+    def _process_dataframe(self, input_path: str, output_path: str, strategy: str, subset: Optional[List[str]],
+                           fill_value: Any, fill_method: Optional[str]) -> Tuple[int, int]:
         try:
             df = storage_adapter.read_df(input_path)
         except Exception as e:
@@ -61,7 +160,11 @@ class NullHandler(BasePlugin):
             if strategy == 'drop_row':
                 processed_df.dropna(axis=0, subset=subset, inplace=True)
             elif strategy == 'fill':
-                processed_df.fillna(value=fill_value, method=fill_method, inplace=True)
+                # method を指定しない場合は渡さない (pandas 3 では method 引数自体が廃止されている)
+                if fill_method:
+                    processed_df.fillna(value=fill_value, method=fill_method, inplace=True)
+                else:
+                    processed_df.fillna(value=fill_value, inplace=True)
             else:
                 raise ValueError(f"Unsupported strategy: '{strategy}'")
         except Exception as e:
@@ -72,9 +175,31 @@ class NullHandler(BasePlugin):
 
         try:
             storage_adapter.write_df(processed_df, output_path)
-            logger.info(f"[{self.get_plugin_name()}] File successfully saved to '{output_path}'.")
         except Exception as e:
             raise RuntimeError(f"Failed to write output file: {str(e)}")
+        return initial_nulls, final_nulls
+
+    def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
+        input_path = str(self.params.get("input_path"))
+        output_path = str(self.params.get("output_path"))
+        strategy = self.params.get("strategy")
+        subset: Optional[List[str]] = self.params.get("subset")
+        fill_value = self.params.get("value")
+        fill_method = self.params.get("method")
+
+        if not all([input_path, output_path, strategy]):
+            raise ValueError("Missing required parameters: 'input_path', 'output_path', and 'strategy'.")
+
+        null_counts = None
+        if self._can_stream_parquet(input_path, output_path, strategy, fill_value, fill_method):
+            try:
+                null_counts = self._process_parquet_batches(input_path, output_path, strategy, subset, fill_value)
+            except Exception as e:
+                raise RuntimeError(f"Null handling failed: {str(e)}")
+        if null_counts is None:
+            null_counts = self._process_dataframe(input_path, output_path, strategy, subset, fill_value, fill_method)
+        initial_nulls, final_nulls = null_counts
+        logger.info(f"[{self.get_plugin_name()}] File successfully saved to '{output_path}'.")
 
         return self.finalize_container(
             container,
@@ -1,24 +1,138 @@
 import os
+import atexit
 import ftplib
-import tempfile
-from typing import Dict, Any
+import hashlib
+import threading
+from typing import Dict, Any, Optional, Tuple
 import pluggy
 
-from core.infrastructure import storage_adapter
+from core.infrastructure import storage_adapter, is_local_path, normalize_path
 from core.data_container.container import DataContainer
 from core.plugin_manager.base_plugin import BasePlugin
 
+from utils.dns_cache import connect_any
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
+# retrbinary はデータソケットから受信するたびにコールバックを呼ぶため、
+# 大きめのバッファを挟んで write(2) の回数を減らす。
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+
+# 同一ホストから複数ファイルを取得するパイプラインで、接続・LOGIN の往復を
+# 毎回払わないよう、ログイン済みの制御コネクションを (host, user, パスワードのハッシュ) 単位で保持する。
+# 取得時にプールから取り出すため、1つのコネクションを複数スレッドが同時に使うことはない。
+_FTP_POOL: Dict[Tuple[str, Optional[str], str], ftplib.FTP] = {}
+_FTP_POOL_LOCK = threading.Lock()
+
+
+def _close_quietly(ftp: ftplib.FTP) -> None:
+    try:
+        ftp.quit()
+    except ftplib.all_errors:
+        ftp.close()
+
+
+def _pool_key(host: str, user: Optional[str], password: Optional[str]) -> Tuple[str, Optional[str], str]:
+    # 異なるパスワードでログインした接続を共有しないよう、パスワードはハッシュでキーに含める
+    digest = hashlib.sha256((password or "").encode("utf-8")).hexdigest()
+    return host, user, digest
+
+
+def _acquire_ftp(host: str, user: Optional[str], password: Optional[str]) -> ftplib.FTP:
+    with _FTP_POOL_LOCK:
+        ftp = _FTP_POOL.pop(_pool_key(host, user, password), None)
+    if ftp is not None:
+        try:
+            ftp.voidcmd('NOOP')
+            return ftp
+        except ftplib.all_errors:
+            logger.info(f"Pooled FTP connection to {host} is stale. Reconnecting...")
+            ftp.close()
+    ftp = connect_any(host, lambda address: ftplib.FTP(address, timeout=60))
+    try:
+        ftp.login(user=user, passwd=password)
+    except ftplib.all_errors:
+        ftp.close()
+        raise
+    return ftp
+
+
+def _release_ftp(host: str, user: Optional[str], password: Optional[str], ftp: ftplib.FTP) -> None:
+    key = _pool_key(host, user, password)
+    with _FTP_POOL_LOCK:
+        if key not in _FTP_POOL:
+            _FTP_POOL[key] = ftp
+            return
+    _close_quietly(ftp)
+
+
+@atexit.register
+def _close_ftp_pool() -> None:
+    with _FTP_POOL_LOCK:
+        connections = list(_FTP_POOL.values())
+        _FTP_POOL.clear()
+    for ftp in connections:
+        _close_quietly(ftp)
+
+
+_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "host": {
+            "type": "string",
+            "title": "FTP Host",
+            "description": "Hostname or IP address of the FTP server."
+        },
+        "remote_path": {
+            "type": "string",
+            "title": "Remote File Path",
+            "description": "The full path to the file on the FTP server."
+        },
+        "output_path": {
+            "type": "string",
+            "title": "Output Path (local or s3://)",
+            "description": "The final destination for the downloaded file."
+        },
+        "user": {
+            "type": "string",
+            "title": "Username",
+            "description": "(Optional) Username for FTP authentication."
+        },
+        "password": {
+            "type": "string",
+            "title": "Password",
+            "description": "(Optional) Password for FTP authentication.",
+            "format": "password"
+        },
+        "upload_concurrency": {
+            "type": "integer",
+            "title": "Upload Concurrency",
+            "description": "(Optional) Number of parallel part uploads when the destination is S3.",
+            "default": 8,
+            "minimum": 1
+        },
+        "upload_chunksize_mb": {
+            "type": "integer",
+            "title": "Upload Part Size (MB)",
+            "description": "(Optional) Multipart upload part size in MB when the destination is S3.",
+            "default": 8,
+            "minimum": 5
+        }
+    },
+    "required": ["host", "remote_path", "output_path"]
+}
+
+
 class FtpExtractor(BasePlugin):
     """
     (Storage Aware) Downloads a file from an FTP server.
-    It downloads to a temporary local file first, then uses the StorageAdapter
-    to move it to the final destination (local or S3).
+    For local destinations it downloads straight into the destination
+    directory and renames the file into place once complete. For S3 and
+    memory destinations the data connection is streamed straight into the
+    StorageAdapter without touching the local disk.
     """
 
     @hookimpl
@@ -27,38 +141,65 @@ class FtpExtractor(BasePlugin):
 
     @hookimpl
     def get_parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "host": {
-                    "type": "string",
-                    "title": "FTP Host",
-                    "description": "Hostname or IP address of the FTP server."
-                },
-                "remote_path": {
-                    "type": "string",
-                    "title": "Remote File Path",
-                    "description": "The full path to the file on the FTP server."
-                },
-                "output_path": {
-                    "type": "string",
-                    "title": "Output Path (local or s3://)",
-                    "description": "The final destination for the downloaded file."
-                },
-                "user": {
-                    "type": "string",
-                    "title": "Username",
-                    "description": "(Optional) Username for FTP authentication."
-                },
-                "password": {
-                    "type": "string",
-                    "title": "Password",
-                    "description": "(Optional) Password for FTP authentication.",
-                    "format": "password"
-                }
-            },
-            "required": ["host", "remote_path", "output_path"]
-        }
+        return _SCHEMA
+
+    def _local_target_path(self, remote_path: str, output_path_str: str) -> str:
+        final_path = normalize_path(output_path_str, os.getcwd())
+        if output_path_str.endswith('/') or os.path.isdir(final_path):
+            final_path = os.path.join(final_path, os.path.basename(remote_path.rstrip('/')))
+        parent = os.path.dirname(final_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        return final_path
+
+    def _download_to_local(self, ftp: ftplib.FTP, host: str, user: Optional[str], password: Optional[str],
+                           remote_path: str, output_path_str: str) -> None:
+        # 宛先と同じディレクトリの .part に直接受信し、完了後に rename する。
+        # 一時ディレクトリ経由のコピーを省きつつ、失敗時に壊れたファイルを残さない。
+        part_path = None
+        try:
+            final_path = self._local_target_path(remote_path, output_path_str)
+            part_path = final_path + ".part"
+            with open(part_path, 'wb', buffering=DOWNLOAD_BUFFER_SIZE) as f:
+                ftp.retrbinary(f'RETR {remote_path}', f.write, blocksize=DOWNLOAD_BUFFER_SIZE)
+            os.replace(part_path, final_path)
+        except BaseException as e:
+            # ftplib 以外の失敗 (パスの解決や rename、中断など) でも接続をプールにも残さず閉じる
+            ftp.close()
+            if part_path and os.path.exists(part_path):
+                os.remove(part_path)
+            if isinstance(e, ftplib.all_errors):
+                raise RuntimeError(f"FTP download operation failed: {e}")
+            raise
+        _release_ftp(host, user, password, ftp)
+        logger.info(f"[{self.get_plugin_name()}] Successfully downloaded to '{final_path}'.")
+
+    def _stream_to_storage(self, ftp: ftplib.FTP, host: str, user: Optional[str], password: Optional[str],
+                           remote_path: str, output_path_str: str) -> None:
+        if output_path_str.endswith('/'):
+            output_path_str = output_path_str + os.path.basename(remote_path.rstrip('/'))
+        # S3 宛ての場合はパートを並列送信し、FTP 受信とアップロードを重ねる
+        upload_concurrency = int(self.params.get("upload_concurrency", 8))
+        upload_chunksize = int(self.params.get("upload_chunksize_mb", 8)) * 1024 * 1024
+        logger.info(f"[{self.get_plugin_name()}] Streaming '{remote_path}' to '{output_path_str}'...")
+        try:
+            ftp.voidcmd('TYPE I')
+            with ftp.transfercmd(f'RETR {remote_path}') as conn, conn.makefile('rb') as reader:
+                storage_adapter.write_stream(
+                    reader,
+                    output_path_str,
+                    max_concurrency=upload_concurrency,
+                    multipart_chunksize=upload_chunksize,
+                )
+            ftp.voidresp()
+        except ftplib.all_errors as e:
+            ftp.close()
+            raise RuntimeError(f"FTP download operation failed: {e}")
+        except Exception as e:
+            ftp.close()
+            raise RuntimeError(f"Storage upload failed: {e}")
+        _release_ftp(host, user, password, ftp)
+        logger.info(f"[{self.get_plugin_name()}] Successfully streamed to '{output_path_str}'.")
 
     def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
         host = self.params.get("host")
@@ -67,28 +208,19 @@ class FtpExtractor(BasePlugin):
         remote_path = self.params.get("remote_path")
         output_path_str = str(self.params.get("output_path"))
 
-        if not all([host, remote_path, output_path_str]):
+        if not (host and remote_path and output_path_str):
             raise ValueError("Missing required FTP parameters.")
 
-        filename = os.path.basename(remote_path)
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            local_temp_path = os.path.join(temp_dir, filename)
-
-            logger.info(f"[{self.get_plugin_name()}] Connecting to FTP at {host} to download to temporary storage...")
-            try:
-                with ftplib.FTP(host, timeout=60) as ftp:
-                    ftp.login(user=user, passwd=password)
-                    with open(local_temp_path, 'wb') as f:
-                        ftp.retrbinary(f'RETR {remote_path}', f.write)
-                logger.info(f"[{self.get_plugin_name()}] Successfully downloaded to temporary location: {local_temp_path}")
-            except ftplib.all_errors as e:
-                raise RuntimeError(f"FTP download operation failed: {e}")
+        logger.info(f"[{self.get_plugin_name()}] Connecting to FTP at {host}...")
+        try:
+            ftp = _acquire_ftp(host, user, password)
+        except ftplib.all_errors as e:
+            raise RuntimeError(f"FTP download operation failed: {e}")
 
-            try:
-                storage_adapter.upload_local_file(local_temp_path, output_path_str)
-            except Exception as e:
-                raise RuntimeError(f"Storage upload failed: {e}")
+        if is_local_path(output_path_str):
+            self._download_to_local(ftp, host, user, password, remote_path, output_path_str)
+        else:
+            self._stream_to_storage(ftp, host, user, password, remote_path, output_path_str)
 
         return self.finalize_container(
             container,
@@ -1,10 +1,14 @@
 import os
+import asyncio
+import posixpath
+import aiohttp
 import requests
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
 from urllib.parse import urlparse
 import pluggy
 
-from core.infrastructure import storage_adapter
+from core.infrastructure import storage_adapter, is_local_path, normalize_path
 from core.data_container.container import DataContainer
 from core.plugin_manager.base_plugin import BasePlugin
 
@@ -14,6 +18,66 @@ logger = setup_logger(__name__)
 
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
+BATCH_CHUNK_SIZE = 256 * 1024
+
+
+@lru_cache(maxsize=1024)
+def _infer_filename(url: str) -> str:
+    return posixpath.basename(urlparse(url).path)
+
+
+def _is_directory_target(path: str) -> bool:
+    # 拡張子付きのパスやリモートパスはファイルとみなし、stat を発行しない
+    if path.endswith('/'):
+        return True
+    if '://' in path or os.path.splitext(path)[1]:
+        return False
+    return os.path.isdir(path)
+
+
+async def _write_remote_chunks(chunks, output_path: str) -> None:
+    """
+    受信したチャンクをリモート (S3 等) の出力ストリームへ逐次書き込む。
+    書き込みはブロッキングするため、ワーカースレッドで行いイベントループを止めない。
+    """
+    sink = await asyncio.to_thread(storage_adapter.open_write_stream, output_path)
+    try:
+        async for chunk in chunks:
+            await asyncio.to_thread(sink.write, chunk)
+    except BaseException:
+        # s3fs は close でアップロードが確定するため、途中までの内容は破棄する (discard 後は close しない)
+        if hasattr(sink, "discard"):
+            sink.discard()
+        else:
+            sink.close()
+        raise
+    await asyncio.to_thread(sink.close)
+
+
+_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "url": {
+            "oneOf": [
+                {"type": "string"},
+                {"type": "array", "items": {"type": "string"}, "minItems": 1},
+            ],
+            "description": (
+                "Source URL, or an array of URLs to download concurrently. "
+                "When an array is given, output_path must be a directory."
+            ),
+        },
+        "output_path": {"type": "string"},
+        "concurrency": {
+            "type": "integer",
+            "title": "Max Connections (batch mode)",
+            "default": 10
+        }
+    },
+    "required": ["url", "output_path"]
+}
+
+
 class HttpExtractor(BasePlugin):
 
     @hookimpl
@@ -22,14 +86,62 @@ class HttpExtractor(BasePlugin):
 
     @hookimpl
     def get_parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "url": {"type": "string"},
-                "output_path": {"type": "string"}
-            },
-            "required": ["url", "output_path"]
-        }
+        return _SCHEMA
+
+    def _resolve_output_path(self, url: str, output_path_str: str) -> str:
+        if not _is_directory_target(output_path_str):
+            return output_path_str
+        filename = _infer_filename(url)
+        if not filename:
+            raise ValueError(f"Could not infer filename from URL: {url}")
+        return output_path_str.rstrip('/') + '/' + filename
+
+    async def _download(self, session: aiohttp.ClientSession, url: str, output_path: str) -> None:
+        # レスポンス全体をメモリに載せず、受信しながら書き込む
+        async with session.get(url) as response:
+            response.raise_for_status()
+            chunks = response.content.iter_chunked(BATCH_CHUNK_SIZE)
+            if is_local_path(output_path):
+                # file:// やプロジェクト基準の相対パスも StorageAdapter と同じ規則で解決する
+                local_path = normalize_path(output_path, os.getcwd())
+                parent = os.path.dirname(local_path)
+                if parent:
+                    os.makedirs(parent, exist_ok=True)
+                with open(local_path, 'wb') as f:
+                    async for chunk in chunks:
+                        f.write(chunk)
+            else:
+                await _write_remote_chunks(chunks, output_path)
+        logger.info(f"[{self.get_plugin_name()}] Downloaded '{url}' to '{output_path}'.")
+
+    async def _download_all(self, targets: List[Tuple[str, str]], concurrency: int) -> None:
+        conn = aiohttp.TCPConnector(limit=concurrency)
+        # total は接続プールの空き待ちやファイル全体の転送時間も含むため指定せず、
+        # 接続確立と無通信時間のみを制限する
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=5, sock_read=60)
+        async with aiohttp.ClientSession(connector=conn, timeout=timeout) as session:
+            tasks = [self._download(session, url, path) for url, path in targets]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        errors = [e for e in results if isinstance(e, Exception)]
+        if errors:
+            raise RuntimeError(f"{len(errors)} HTTP downloads failed. First error: {errors[0]}") from errors[0]
+
+    def _run_batch(self, urls: List[str], output_path_str: str, container: DataContainer) -> DataContainer:
+        if not _is_directory_target(output_path_str):
+            raise ValueError("'output_path' must be a directory when 'url' is a list.")
+        concurrency = self.params.get("concurrency", 10)
+        targets = [(url, self._resolve_output_path(url, output_path_str)) for url in urls]
+
+        logger.info(f"[{self.get_plugin_name()}] Downloading {len(targets)} files to '{output_path_str}' with concurrency {concurrency}...")
+        asyncio.run(self._download_all(targets, concurrency))
+        logger.info(f"[{self.get_plugin_name()}] All files downloaded and saved successfully.")
+
+        for _, path in targets:
+            container.add_file_path(path)
+        return self.finalize_container(
+            container,
+            metadata={"source_url": urls}
+        )
 
     def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
         url = self.params.get("url")
@@ -38,19 +150,17 @@ class HttpExtractor(BasePlugin):
         if not url or not output_path_str:
             raise ValueError("Missing required parameters: 'url' and 'output_path'.")
 
-        final_output_path = output_path_str
-        if final_output_path.endswith('/'):
-            parsed_url = urlparse(url)
-            filename = os.path.basename(parsed_url.path)
-            if not filename:
-                raise ValueError("Could not infer filename from URL.")
-            final_output_path = os.path.join(final_output_path, filename)
+        if isinstance(url, list):
+            return self._run_batch(url, output_path_str, container)
+
+        final_output_path = self._resolve_output_path(url, output_path_str)
 
         logger.info(f"[{self.get_plugin_name()}] Downloading from '{url}' to '{final_output_path}'...")
         try:
-            response = requests.get(url=url, timeout=60)
-            response.raise_for_status()
-            storage_adapter.write_bytes(response.content, final_output_path)
+            with requests.get(url=url, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                storage_adapter.write_stream(response.raw, final_output_path)
             logger.info(f"[{self.get_plugin_name()}] File downloaded and saved successfully.")
         except requests.RequestException as e:
             raise RuntimeError(f"HTTP request failed: {e}")
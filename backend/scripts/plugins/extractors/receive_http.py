@@ -14,6 +14,23 @@ logger = setup_logger(__name__)
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
 
+_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "output_path": {
+            "type": "string",
+            "title": "Output File Path",
+            "description": (
+                "リクエストボディを保存するファイルパス。"
+                "後続プラグインはこのパスを input_path として参照する。"
+                "相対パスの場合は project_root からの相対パスとして解決される。"
+            )
+        }
+    },
+    "required": ["output_path"]
+}
+
+
 class ReceiveHttp(BasePlugin):
     """
     (Configured Service 専用) HTTP リクエストボディを受け取り、指定パスに保存する。
@@ -59,21 +76,7 @@ class ReceiveHttp(BasePlugin):
 
     @hookimpl
     def get_parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "output_path": {
-                    "type": "string",
-                    "title": "Output File Path",
-                    "description": (
-                        "リクエストボディを保存するファイルパス。"
-                        "後続プラグインはこのパスを input_path として参照する。"
-                        "相対パスの場合は project_root からの相対パスとして解決される。"
-                    )
-                }
-            },
-            "required": ["output_path"]
-        }
+        return _SCHEMA
 
     def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
         """
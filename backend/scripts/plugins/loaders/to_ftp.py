@@ -1,19 +1,278 @@
 import os
+import io
+import atexit
+import asyncio
 import ftplib
-import tempfile
-from typing import Dict, Any
+import hashlib
+import posixpath
+import socket
+import threading
+import time
+from pathlib import PurePosixPath
+from typing import Dict, Any, List, Optional, Set, Tuple
 import pluggy
 
 from core.data_container.container import DataContainer
-from core.infrastructure import storage_adapter
+from core.infrastructure import storage_adapter, is_local_path
 from core.plugin_manager.base_plugin import BasePlugin
 
+from utils.dns_cache import connect_any
+from utils.prefetch_reader import PrefetchReader
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
+# storbinary が1回の read/sendall で扱うサイズ
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+# データソケットの送受信バッファ。既定 (数十〜数百KB) では高遅延の WAN で
+# 帯域遅延積を埋めきれないため、大きめに確保する。
+DATA_SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def _tune_data_socket(conn: socket.socket) -> None:
+    conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, DATA_SOCKET_BUFFER_SIZE)
+    conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, DATA_SOCKET_BUFFER_SIZE)
+    # ブロック末尾の半端なセグメントを Nagle で遅らせない
+    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class _TunedFTP(ftplib.FTP):
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = super().ntransfercmd(cmd, rest)
+        _tune_data_socket(conn)
+        return conn, size
+
+    def storfile(self, cmd: str, fp) -> str:
+        """
+        storbinary と同じ手順で、データ転送だけを socket.sendfile で行う。
+        ローカルファイルは os.sendfile によりカーネル内でソケットへ送られ、
+        Python 側の read/sendall ループとバッファ確保が発生しない。
+        """
+        self.voidcmd('TYPE I')
+        with self.transfercmd(cmd) as conn:
+            conn.sendfile(fp)
+        return self.voidresp()
+
+
+class _TunedFTP_TLS(ftplib.FTP_TLS):
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = super().ntransfercmd(cmd, rest)
+        _tune_data_socket(conn)
+        return conn, size
+
+
+def _buffered(stream, blocksize: int = UPLOAD_BLOCK_SIZE):
+    """
+    要求より短い read を返しうるストリーム (S3 の StreamingBody 等) を BufferedReader で包み、
+    storbinary の1ブロックが常に blocksize 単位で送られるようにする。
+    既にバッファ付きのもの (ローカルファイル等) はそのまま返す。
+    """
+    if isinstance(stream, io.BufferedIOBase) or not hasattr(stream, "readinto"):
+        return stream
+    return io.BufferedReader(stream, buffer_size=blocksize)
+
+
+def _store(ftp: ftplib.FTP, cmd: str, source, use_sendfile: bool, blocksize: int) -> None:
+    if use_sendfile:
+        ftp.storfile(cmd, source)
+    else:
+        ftp.storbinary(cmd, source, blocksize=blocksize)
+
+
+def _remote_size(ftp: ftplib.FTP, path: str) -> Optional[int]:
+    """
+    SIZE でリモートファイルのサイズを取得する。ファイルが存在しない場合や
+    サーバーが SIZE に対応していない場合は None を返す。
+    """
+    try:
+        # SIZE は ASCII モードでは拒否するサーバーがあるため、先にバイナリモードにする
+        ftp.voidcmd('TYPE I')
+        return ftp.size(path)
+    except ftplib.error_perm:
+        return None
+
+
+# 同じサーバーへ複数ファイルを送るパイプラインで、接続・LOGIN (FTPS ではハンドシェイクも) を
+# 実行ごとに払わないよう、ログイン済みの制御コネクションを (host, user, tls) 単位で保持する。
+# 値は (接続, ログイン直後のディレクトリ, 現在のディレクトリ, 返却時刻)。
+# 別の認証情報での実行がログイン済みの接続を使わないよう、キーにはパスワードのハッシュも含める。
+# 取得時にプールから取り出すため、1つのコネクションを複数スレッドが同時に使うことはない。
+_FTP_POOL: Dict[Tuple[str, Optional[str], bool, str], Tuple[ftplib.FTP, Optional[str], Optional[str], float]] = {}
+_FTP_POOL_LOCK = threading.Lock()
+# これより長くアイドルだった接続はサーバー側で切断されている可能性が高いため、確認せず作り直す
+FTP_POOL_IDLE_TIMEOUT = 60.0
+
+
+def _close_quietly(ftp: ftplib.FTP) -> None:
+    try:
+        ftp.quit()
+    except ftplib.all_errors:
+        ftp.close()
+
+
+def _pool_key(host: str, user: Optional[str], password: Optional[str],
+              use_tls: bool) -> Tuple[str, Optional[str], bool, str]:
+    digest = hashlib.sha256((password or "").encode("utf-8")).hexdigest()
+    return host, user, use_tls, digest
+
+
+def _connect_ftp(host: str, user: Optional[str], password: Optional[str], use_tls: bool) -> ftplib.FTP:
+    # TLS の場合は SNI にホスト名を使うため、名前のまま接続する
+    if use_tls:
+        ftp = _TunedFTP_TLS(host, timeout=60)
+    else:
+        ftp = connect_any(host, lambda address: _TunedFTP(address, timeout=60))
+    try:
+        ftp.login(user=user, passwd=password)
+        if use_tls:
+            ftp.prot_p()
+        ftp.set_pasv(True)
+    except ftplib.all_errors:
+        ftp.close()
+        raise
+    return ftp
+
+
+def _acquire_ftp(host: str, user: Optional[str], password: Optional[str],
+                 use_tls: bool) -> Tuple[ftplib.FTP, Optional[str], Optional[str]]:
+    """(接続, ログイン直後のディレクトリ, 現在のディレクトリ) を返す。"""
+    with _FTP_POOL_LOCK:
+        entry = _FTP_POOL.pop(_pool_key(host, user, password, use_tls), None)
+    if entry is not None:
+        ftp, home, cwd, released_at = entry
+        if time.monotonic() - released_at <= FTP_POOL_IDLE_TIMEOUT:
+            try:
+                ftp.voidcmd('NOOP')
+                return ftp, home, cwd
+            except ftplib.all_errors:
+                logger.info(f"Pooled FTP connection to {host} is stale. Reconnecting...")
+        ftp.close()
+
+    ftp = _connect_ftp(host, user, password, use_tls)
+    try:
+        home = ftp.pwd()
+    except ftplib.all_errors:
+        home = None
+    return ftp, home, home
+
+
+def _release_ftp(host: str, user: Optional[str], password: Optional[str], use_tls: bool,
+                 ftp: ftplib.FTP, home: Optional[str], cwd: Optional[str]) -> None:
+    # ログイン直後のディレクトリが不明なまま移動した接続は、次の利用者が元に戻せないため保持しない
+    if home is not None or cwd is None:
+        key = _pool_key(host, user, password, use_tls)
+        with _FTP_POOL_LOCK:
+            if key not in _FTP_POOL:
+                _FTP_POOL[key] = (ftp, home, cwd, time.monotonic())
+                return
+    _close_quietly(ftp)
+
+
+@atexit.register
+def _close_ftp_pool() -> None:
+    with _FTP_POOL_LOCK:
+        entries = list(_FTP_POOL.values())
+        _FTP_POOL.clear()
+    for ftp, _, _, _ in entries:
+        _close_quietly(ftp)
+
+
+# 存在を確認 (または作成) 済みの (host, user, remote_dir)。
+# 同一プロセスでの2回目以降は CWD/MKD の往復を省き、パス指定で直接 STOR する。
+_FTP_DIR_CACHE: Set[Tuple[str, Optional[str], str]] = set()
+
+
+# SITE MKDIR -p を解釈しないと判明したホスト。2回目以降はプローブを省く。
+_SITE_MKDIR_UNSUPPORTED: Set[str] = set()
+# コマンド自体を受け付けない応答 (未実装・構文エラー)
+_UNSUPPORTED_COMMAND_CODES = ('500', '501', '502', '504')
+
+
+def _split_path_parts(path: str) -> List[str]:
+    return [part for part in PurePosixPath(path).parts if part != '/']
+
+
+def _change_to_remote_dir(ftp: ftplib.FTP, host: str, remote_dir: str) -> None:
+    """
+    remote_dir に移動する。存在しない場合はまず SITE MKDIR -p で一括作成を試み、
+    サーバーが対応していなければ存在しない階層のみ MKD で作成する。
+    """
+    try:
+        ftp.cwd(remote_dir)
+        return
+    except ftplib.error_perm:
+        logger.warning(f"Remote directory '{remote_dir}' not found. Attempting to create...")
+
+    if host not in _SITE_MKDIR_UNSUPPORTED:
+        try:
+            ftp.voidcmd(f'SITE MKDIR -p {remote_dir}')
+            ftp.cwd(remote_dir)
+            logger.info(f"Created and navigated to '{remote_dir}'.")
+            return
+        except ftplib.error_perm as e:
+            if str(e)[:3] in _UNSUPPORTED_COMMAND_CODES:
+                _SITE_MKDIR_UNSUPPORTED.add(host)
+
+    if remote_dir.startswith('/'):
+        ftp.cwd('/')
+    for part in _split_path_parts(remote_dir):
+        # 既存の階層は CWD だけで済ませ、失敗した階層のみ MKD する
+        try:
+            ftp.cwd(part)
+        except ftplib.error_perm:
+            ftp.mkd(part)
+            ftp.cwd(part)
+    logger.info(f"Navigated to '{remote_dir}'.")
+
+
+_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "input_path": {
+            "oneOf": [
+                {"type": "string"},
+                {"type": "array", "items": {"type": "string"}, "minItems": 1},
+            ],
+            "title": "Input File Path (local/s3)",
+            "description": "Input file path, or an array of paths to upload concurrently."
+        },
+        "host": {"type": "string", "title": "FTP Host"},
+        "remote_dir": {"type": "string", "title": "Remote Directory", "default": "/"},
+        "user": {"type": "string", "title": "Username"},
+        "password": {"type": "string", "title": "Password", "format": "password"},
+        "tls": {
+            "type": "boolean",
+            "title": "Use FTPS (explicit TLS)",
+            "description": "(Optional) Connect with FTP over TLS and protect the data channel.",
+            "default": False
+        },
+        "concurrency": {
+            "type": "integer",
+            "title": "Max Concurrent Connections (batch mode)",
+            "default": 4,
+            "minimum": 1
+        },
+        "blocksize": {
+            "type": "integer",
+            "title": "Upload Block Size (bytes)",
+            "description": "(Optional) Bytes read and sent per block when uploading.",
+            "default": UPLOAD_BLOCK_SIZE,
+            "minimum": 8192
+        },
+        "skip_if_same_size": {
+            "type": "boolean",
+            "title": "Skip If Same Size",
+            "description": "(Optional) Skip the upload when the remote file already exists with the same size.",
+            "default": False
+        }
+    },
+    "required": ["input_path", "host"]
+}
+
+
 class FtpLoader(BasePlugin):
     """
     (Storage Aware) Loads (uploads) a file from local or S3 to an FTP server.
@@ -24,76 +283,203 @@ class FtpLoader(BasePlugin):
 
     @hookimpl
     def get_parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "input_path": {"type": "string", "title": "Input File Path (local/s3)"},
-                "host": {"type": "string", "title": "FTP Host"},
-                "remote_dir": {"type": "string", "title": "Remote Directory", "default": "/"},
-                "user": {"type": "string", "title": "Username"},
-                "password": {"type": "string", "title": "Password", "format": "password"}
-            },
-            "required": ["input_path", "host"]
-        }
+        return _SCHEMA
+
+    async def _upload_file(self, client, input_path: str) -> None:
+        import aioftp
+
+        remote_filename = os.path.basename(input_path.rstrip('/'))
+        blocksize = int(self.params.get("blocksize", UPLOAD_BLOCK_SIZE))
+        if self.params.get("skip_if_same_size", False):
+            size = await asyncio.to_thread(storage_adapter.get_size, input_path)
+            try:
+                info = await client.stat(remote_filename)
+                if int(info.get("size", -1)) == size:
+                    logger.info(f"[{self.get_plugin_name()}] Skipped '{input_path}': remote file has the same size.")
+                    return
+            except aioftp.StatusCodeError:
+                pass
+        # 入力の読み出し (ローカル/S3) はブロッキングのため、イベントループを止めないようスレッドで行う
+        source = await asyncio.to_thread(storage_adapter.open_stream, input_path)
+        with source:
+            async with client.upload_stream(remote_filename) as stream:
+                while True:
+                    block = await asyncio.to_thread(source.read, blocksize)
+                    if not block:
+                        break
+                    await stream.write(block)
+        logger.info(f"[{self.get_plugin_name()}] Uploaded '{input_path}' as '{remote_filename}'.")
+
+    async def _upload_group(self, host: str, user: Optional[str], password: Optional[str],
+                            remote_dir: str, input_paths: List[str],
+                            dir_lock: asyncio.Lock) -> List[Optional[Exception]]:
+        """
+        1本の制御接続でログイン・ディレクトリ移動を1回だけ行い、割り当てられたファイルを順に送る。
+        ファイル単位の失敗は記録して残りの送信を続ける。
+        """
+        import aioftp
+
+        credentials = {}
+        if user:
+            credentials["user"] = user
+        if password:
+            credentials["password"] = password
+        results: List[Optional[Exception]] = []
+        # aioftp はイベントループ上で非同期に名前解決し、得られたアドレスを順に試すため、ホスト名のまま渡す
+        async with aioftp.Client.context(host, socket_timeout=60, **credentials) as client:
+            if remote_dir != '/':
+                # 複数の接続が同時に同じ階層を作成しようとして衝突しないよう、作成は1接続ずつ行う
+                async with dir_lock:
+                    try:
+                        await client.change_directory(remote_dir)
+                    except aioftp.StatusCodeError:
+                        await client.make_directory(remote_dir)
+                        await client.change_directory(remote_dir)
+            for input_path in input_paths:
+                try:
+                    await self._upload_file(client, input_path)
+                    results.append(None)
+                except Exception as e:
+                    results.append(e)
+        return results
+
+    async def _upload_all(self, host: str, user: Optional[str], password: Optional[str],
+                          remote_dir: str, input_paths: List[str], concurrency: int) -> None:
+        # aioftp はバッチ送信の場合のみ必要なため遅延 import する
+        try:
+            import aioftp  # noqa: F401
+        except ImportError:
+            raise ImportError("aioftp is required for FTP batch uploads. Please install 'aioftp'.")
+        groups = [input_paths[i::concurrency] for i in range(min(concurrency, len(input_paths)))]
+        dir_lock = asyncio.Lock()
+        tasks = [
+            self._upload_group(host, user, password, remote_dir, group, dir_lock)
+            for group in groups
+        ]
+        group_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        errors: List[Exception] = []
+        for result in group_results:
+            if isinstance(result, Exception):
+                errors.append(result)
+            else:
+                errors.extend(e for e in result if e is not None)
+        if errors:
+            raise RuntimeError(f"{len(errors)} FTP uploads failed. First error: {errors[0]}") from errors[0]
+
+    def _run_batch(self, input_paths: List[str], host: str, user: Optional[str], password: Optional[str],
+                   remote_dir: str, container: DataContainer) -> DataContainer:
+        if self.params.get("tls", False):
+            raise ValueError("'tls' is not supported when 'input_path' is a list.")
+        concurrency = max(1, int(self.params.get("concurrency", 4)))
+        input_paths = [str(path) for path in input_paths]
+
+        logger.info(f"[{self.get_plugin_name()}] Uploading {len(input_paths)} files to FTP with {concurrency} connections...")
+        asyncio.run(self._upload_all(host, user, password, remote_dir, input_paths, concurrency))
+        logger.info(f"[{self.get_plugin_name()}] All uploads successful.")
+
+        return self.finalize_container(
+            container,
+            metadata={
+                "input_path": input_paths,
+                "ftp_host": host,
+                "remote_dir": remote_dir,
+                "tls": False,
+                "uploaded_filename": [os.path.basename(path.rstrip('/')) for path in input_paths]
+            }
+        )
 
     def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
-        input_path_str = str(self.params.get("input_path"))
+        input_path = self.params.get("input_path")
         host = self.params.get("host")
         user = self.params.get("user")
         password = self.params.get("password")
         remote_dir = self.params.get("remote_dir", "/")
+        use_tls = bool(self.params.get("tls", False))
+        blocksize = int(self.params.get("blocksize", UPLOAD_BLOCK_SIZE))
 
-        if not input_path_str or not host:
+        if not input_path or not host:
             raise ValueError("Missing required parameters: 'input_path' and 'host'.")
 
-        def basename(path: str) -> str:
-            return os.path.basename(path.rstrip('/'))
+        # 複数ファイルは aioftp で複数の制御接続に振り分け、コマンドの往復待ちを重ねる
+        if isinstance(input_path, list):
+            return self._run_batch(input_path, host, user, password, remote_dir, container)
 
-        def split_path_parts(path: str):
-            return [part for part in path.strip('/').split('/') if part]
+        input_path_str = str(input_path)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_local_path = os.path.join(temp_dir, basename(input_path_str))
+        remote_filename = os.path.basename(input_path_str.rstrip('/'))
 
-            try:
-                if input_path_str.startswith("s3://"):
-                    logger.info(f"[{self.get_plugin_name()}] Downloading '{input_path_str}' from S3...")
-                    file_content_bytes = storage_adapter.read_bytes(input_path_str)
-                    with open(temp_local_path, 'wb') as f:
-                        f.write(file_content_bytes)
-                    local_file_to_upload = temp_local_path
-                else:
-                    local_file_to_upload = input_path_str
-
-                if not os.path.isfile(local_file_to_upload):
-                    raise FileNotFoundError(f"File not found: {local_file_to_upload}")
-            except Exception as e:
-                raise RuntimeError(f"Failed to prepare file for upload: {str(e)}")
+        # 入力 (ローカル/S3) を一時ファイルに展開せず、ブロック単位で読みながら送信する。
+        # 平文接続でローカルファイルを送る場合は sendfile でカーネルに直接コピーさせる。
+        use_sendfile = not use_tls and is_local_path(input_path_str)
+        skip_if_same_size = bool(self.params.get("skip_if_same_size", False))
 
-            remote_filename = basename(local_file_to_upload)
+        try:
+            logger.info(f"[{self.get_plugin_name()}] Opening '{input_path_str}' for streaming upload...")
+            local_size = storage_adapter.get_size(input_path_str) if skip_if_same_size else None
+            stream = storage_adapter.open_stream(input_path_str)
+        except Exception as e:
+            raise RuntimeError(f"Failed to prepare file for upload: {str(e)}")
 
-            try:
-                with ftplib.FTP(host, timeout=60) as ftp:
-                    ftp.login(user=user, passwd=password)
+        ftp = None
+        released = False
+        skipped = False
+        try:
+            with stream:
+                ftp, home, cwd = _acquire_ftp(host, user, password, use_tls)
+                dir_key = (host, user, remote_dir)
+                target_name = remote_filename
+                dir_verified = False
+                if remote_dir == '/' or cwd != remote_dir:
+                    # プールの接続が前回の実行で別のディレクトリに移動している場合は戻す
+                    if cwd != home:
+                        ftp.cwd(home)
+                        cwd = home
                     if remote_dir != '/':
-                        try:
-                            ftp.cwd(remote_dir)
-                        except ftplib.error_perm:
-                            logger.warning(f"[{self.get_plugin_name()}] Remote directory '{remote_dir}' not found. Attempting to create...")
-                            for part in split_path_parts(remote_dir):
-                                try:
-                                    ftp.mkd(part)
-                                except ftplib.error_perm:
-                                    pass
-                                ftp.cwd(part)
-                            logger.info(f"[{self.get_plugin_name()}] Navigated to '{remote_dir}'.")
+                        if dir_key in _FTP_DIR_CACHE:
+                            target_name = posixpath.join(remote_dir, remote_filename)
+                        else:
+                            _change_to_remote_dir(ftp, host, remote_dir)
+                            _FTP_DIR_CACHE.add(dir_key)
+                            cwd = remote_dir
+                            dir_verified = True
 
+                if skip_if_same_size:
+                    skipped = _remote_size(ftp, target_name) == local_size
+
+                if skipped:
+                    logger.info(f"[{self.get_plugin_name()}] Skipped '{remote_filename}': remote file has the same size.")
+                else:
                     logger.info(f"[{self.get_plugin_name()}] Uploading '{remote_filename}' to FTP...")
-                    with open(local_file_to_upload, 'rb') as local_file:
-                        ftp.storbinary(f'STOR {remote_filename}', local_file)
+                    source = stream
+                    if not use_sendfile:
+                        # storbinary は読み出しと送信を同じスレッドで交互に行うため、
+                        # 読み出しを別スレッドで先行させて入力側と送信側の待ち時間を重ねる
+                        source = PrefetchReader(stream, blocksize)
+                    with _buffered(source, blocksize) as source:
+                        try:
+                            _store(ftp, f'STOR {target_name}', source, use_sendfile, blocksize)
+                        except ftplib.error_perm:
+                            if remote_dir == '/' or dir_verified:
+                                raise
+                            # キャッシュ後にディレクトリが消された場合。STOR はデータ送信前に
+                            # 拒否されるため source は未読のまま、作り直して再送できる。
+                            _FTP_DIR_CACHE.discard(dir_key)
+                            if cwd != home:
+                                ftp.cwd(home)
+                            _change_to_remote_dir(ftp, host, remote_dir)
+                            _FTP_DIR_CACHE.add(dir_key)
+                            cwd = remote_dir
+                            _store(ftp, f'STOR {remote_filename}', source, use_sendfile, blocksize)
                     logger.info(f"[{self.get_plugin_name()}] Upload successful.")
-            except ftplib.all_errors as e:
-                raise RuntimeError(f"FTP upload failed: {str(e)}")
+            _release_ftp(host, user, password, use_tls, ftp, home, cwd)
+            released = True
+        except ftplib.all_errors as e:
+            raise RuntimeError(f"FTP upload failed: {str(e)}")
+        finally:
+            # 失敗した接続は状態が不明なためプールに戻さない
+            if ftp is not None and not released:
+                ftp.close()
 
         return self.finalize_container(
             container,
@@ -101,6 +487,8 @@ class FtpLoader(BasePlugin):
                 "input_path": input_path_str,
                 "ftp_host": host,
                 "remote_dir": remote_dir,
-                "uploaded_filename": remote_filename
+                "tls": use_tls,
+                "uploaded_filename": remote_filename,
+                "skipped": skipped
             }
         )
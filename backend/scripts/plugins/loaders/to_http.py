@@ -1,8 +1,12 @@
 import os
+import atexit
 import asyncio
+import threading
 import aiohttp
 import json
-from typing import Dict, Any, List
+from multidict import CIMultiDict
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit
 import pluggy
 
 from core.data_container.container import DataContainer
@@ -15,12 +19,138 @@ logger = setup_logger(__name__)
 
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
-def run_async(coro):
+# aiohttp のセッションは生成したイベントループに結び付くため、execute ごとに asyncio.run で
+# ループを作り直すとコネクションプールも毎回破棄される。専用スレッドで1つのループを動かし続け、
+# 送信先オリジンごとのセッション (keep-alive 接続・TLS セッション) を実行をまたいで再利用する。
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+# _SESSIONS / _HTTP2_CLIENTS は _LOOP のスレッドからのみ参照・更新する
+_SESSIONS: Dict[str, aiohttp.ClientSession] = {}
+_HTTP2_CLIENTS: Dict[str, Any] = {}
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    # ETL_USE_UVLOOP=1 の場合は libuv ベースの uvloop を使う (Windows 非対応のため既定では無効)。
+    # ポリシーを差し替える uvloop.install() は API サーバー等の他のループにも影響するため使わず、
+    # このプラグイン専用のループにのみ適用する。
+    if os.getenv("ETL_USE_UVLOOP") == "1":
+        try:
+            import uvloop
+            return uvloop.new_event_loop()
+        except ImportError:
+            logger.warning("ETL_USE_UVLOOP=1 but uvloop is not installed. Using the default event loop.")
+    return asyncio.new_event_loop()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = _new_event_loop()
+            threading.Thread(target=loop.run_forever, name="to_http-loop", daemon=True).start()
+            _LOOP = loop
+        return _LOOP
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _get_session(url: str) -> aiohttp.ClientSession:
+    origin = _origin(url)
+    session = _SESSIONS.get(origin)
+    if session is None or session.closed:
+        conn = aiohttp.TCPConnector(limit=0, keepalive_timeout=60, ttl_dns_cache=300)
+        session = aiohttp.ClientSession(connector=conn)
+        _SESSIONS[origin] = session
+    return session
+
+
+def _get_http2_client(url: str):
+    # HTTP/2 では1本の接続上で全リクエストを多重化する。
+    # httpx / h2 は http2 を指定した場合のみ必要なため遅延 import する。
+    try:
+        import httpx
+        import h2  # noqa: F401
+    except ImportError:
+        raise ImportError("httpx and h2 are required for HTTP/2 uploads. Please install 'httpx[http2]'.")
+    origin = _origin(url)
+    client = _HTTP2_CLIENTS.get(origin)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(http2=True, timeout=httpx.Timeout(60.0, connect=5.0))
+        _HTTP2_CLIENTS[origin] = client
+    return client
+
+
+async def _close_sessions() -> None:
+    sessions = list(_SESSIONS.values())
+    _SESSIONS.clear()
+    for session in sessions:
+        await session.close()
+    clients = list(_HTTP2_CLIENTS.values())
+    _HTTP2_CLIENTS.clear()
+    for client in clients:
+        await client.aclose()
+
+
+@atexit.register
+def _shutdown_loop() -> None:
+    if _LOOP is None:
+        return
     try:
-        loop = asyncio.get_running_loop()
-        return loop.create_task(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+        asyncio.run_coroutine_threadsafe(_close_sessions(), _LOOP).result(timeout=5)
+    except Exception:
+        pass
+    _LOOP.call_soon_threadsafe(_LOOP.stop)
+
+
+def run_async(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+# 入力 JSONL を読み出す単位。ファイル全体は読み込まず、この単位で行に分割しながら送信する。
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "input_path": {"type": "string", "title": "Input JSONL File Path (local/s3)"},
+        "url": {"type": "string", "title": "Target URL"},
+        "method": {"type": "string", "title": "HTTP Method", "enum": ["POST", "PUT"], "default": "POST"},
+        "concurrency": {"type": "integer", "title": "Concurrency", "default": 10},
+        "headers": {"type": "object", "title": "HTTP Headers", "default": {}},
+        "stop_on_fail": {"type": "boolean", "title": "Stop on first request failure", "default": True},
+        "batch_size": {
+            "type": "integer",
+            "title": "Lines per Request",
+            "description": (
+                "(Optional) Number of JSONL lines combined into one request body "
+                "(e.g. NGSI-LD entityOperations/upsert). 1 sends each line as is."
+            ),
+            "default": 1,
+            "minimum": 1
+        },
+        "batch_template": {
+            "type": "string",
+            "title": "Batch Body Template",
+            "description": "(Optional) Body used when batch_size > 1. '{items}' is replaced with the comma-joined lines.",
+            "default": "[{items}]"
+        },
+        "http2": {
+            "type": "boolean",
+            "title": "Use HTTP/2",
+            "description": (
+                "(Optional) Multiplex requests over HTTP/2 using httpx. "
+                "Falls back to HTTP/1.1 when the server does not negotiate h2."
+            ),
+            "default": False
+        }
+    },
+    "required": ["input_path", "url"]
+}
+
 
 class HttpLoader(BasePlugin):
     """
@@ -33,71 +163,157 @@ class HttpLoader(BasePlugin):
 
     @hookimpl
     def get_parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "input_path": {"type": "string", "title": "Input JSONL File Path (local/s3)"},
-                "url": {"type": "string", "title": "Target URL"},
-                "method": {"type": "string", "title": "HTTP Method", "enum": ["POST", "PUT"], "default": "POST"},
-                "concurrency": {"type": "integer", "title": "Concurrency", "default": 10},
-                "headers": {"type": "object", "title": "HTTP Headers", "default": {}},
-                "stop_on_fail": {"type": "boolean", "title": "Stop on first request failure", "default": True}
-            },
-            "required": ["input_path", "url"]
-        }
+        return _SCHEMA
 
-    async def _send_request(self, session: aiohttp.ClientSession, payload: str, index: int):
+    async def _send_request(self, session: aiohttp.ClientSession, payload: bytes, index: int):
         try:
-            async with session.request(self.method, self.url, data=payload.encode('utf-8'), headers=self.headers) as response:
+            async with session.request(self.method, self.url, data=payload, headers=self.headers) as response:
                 if response.status >= 400:
                     error_text = await response.text()
                     logger.warning(f"[{self.get_plugin_name()}] Request {index+1} failed with status {response.status}: {error_text[:200]}")
                     response.raise_for_status()
+                # 本文を読み切らないと接続が閉じられ、keep-alive のプールに戻らない
+                await response.read()
                 logger.info(f"[{self.get_plugin_name()}] Request {index+1} succeeded.")
         except aiohttp.ClientError as e:
             logger.error(f"[{self.get_plugin_name()}] Request {index+1} failed: {e}")
             if self.stop_on_fail:
                 raise
 
-    async def _main(self, payloads: List[str]):
-        conn = aiohttp.TCPConnector(limit_per_host=self.concurrency)
-        async with aiohttp.ClientSession(connector=conn) as session:
-            tasks = [self._send_request(session, payload, i) for i, payload in enumerate(payloads)]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-        errors = [e for e in results if isinstance(e, Exception)]
+    async def _send_request_http2(self, client, payload: bytes, index: int):
+        import httpx
+        try:
+            response = await client.request(self.method, self.url, content=payload, headers=self.headers)
+            if response.status_code >= 400:
+                logger.warning(f"[{self.get_plugin_name()}] Request {index+1} failed with status {response.status_code}: {response.text[:200]}")
+                response.raise_for_status()
+            logger.info(f"[{self.get_plugin_name()}] Request {index+1} succeeded ({response.http_version}).")
+        except httpx.HTTPError as e:
+            logger.error(f"[{self.get_plugin_name()}] Request {index+1} failed: {e}")
+            if self.stop_on_fail:
+                raise
+
+    async def _produce(self, stream, queue: asyncio.Queue, num_workers: int) -> int:
+        """
+        入力を READ_CHUNK_SIZE ずつ読み、空でない行をキューに積む。
+        batch_size > 1 の場合は batch_size 行ごとに1つのリクエスト本文にまとめる。
+        キューは上限付きのため、送信が追いつかない間は読み出しも待機する。
+        戻り値は積んだリクエスト数。
+        """
+        count = 0
+        batch: List[bytes] = []
+
+        async def put(line: bytes) -> None:
+            nonlocal count
+            if self.batch_size == 1:
+                payload = line
+            else:
+                batch.append(line)
+                if len(batch) < self.batch_size:
+                    return
+                payload = self._batch_body(batch)
+                batch.clear()
+            await queue.put((count, payload))
+            count += 1
+
+        try:
+            remainder = b""
+            while True:
+                # 読み出し (ローカル/S3) はブロッキングのため、共有ループを止めないようスレッドで行う
+                chunk = await asyncio.to_thread(stream.read, READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                lines = (remainder + chunk).split(b"\n")
+                remainder = lines.pop()
+                for line in lines:
+                    line = line.strip()
+                    if line:
+                        await put(line)
+            remainder = remainder.strip()
+            if remainder:
+                await put(remainder)
+            if batch:
+                await queue.put((count, self._batch_body(batch)))
+                count += 1
+        finally:
+            for _ in range(num_workers):
+                await queue.put(None)
+        return count
+
+    def _batch_body(self, lines: List[bytes]) -> bytes:
+        # 各行は JSON として解析し直さず、そのまま連結する
+        return self.batch_prefix + b",".join(lines) + self.batch_suffix
+
+    async def _worker(self, send, session, queue: asyncio.Queue, errors: List[Exception]):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, payload = item
+            try:
+                await send(session, payload, index)
+            except Exception as e:
+                errors.append(e)
+
+    async def _main(self, stream) -> int:
+        if self.http2:
+            send, session = self._send_request_http2, _get_http2_client(self.url)
+        else:
+            send, session = self._send_request, _get_session(self.url)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.concurrency)
+        errors: List[Exception] = []
+        workers = [
+            asyncio.create_task(self._worker(send, session, queue, errors))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            count = await self._produce(stream, queue, len(workers))
+        finally:
+            await asyncio.gather(*workers)
         if errors:
             raise RuntimeError(f"{len(errors)} HTTP requests failed. First error: {errors[0]}") from errors[0]
+        return count
 
     def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
         input_path = str(self.params.get("input_path"))
         self.url = self.params.get("url")
         self.method = self.params.get("method", "POST").upper()
-        self.headers = self.params.get("headers", {})
+        # aiohttp は dict のヘッダーをリクエストごとに CIMultiDict へ変換するため、1回だけ変換しておく
+        self.headers = CIMultiDict(self.params.get("headers") or {})
         self.concurrency = self.params.get("concurrency", 10)
         self.stop_on_fail = self.params.get("stop_on_fail", True)
+        self.http2 = bool(self.params.get("http2", False))
+        self.batch_size = int(self.params.get("batch_size", 1))
+        batch_template = self.params.get("batch_template", "[{items}]")
 
         if not input_path or not self.url:
             raise ValueError("Missing required parameters: 'input_path' and 'url'.")
+        if self.batch_size < 1:
+            raise ValueError("'batch_size' must be 1 or greater.")
+        if batch_template.count("{items}") != 1:
+            raise ValueError("'batch_template' must contain '{items}' exactly once.")
+        prefix, suffix = batch_template.split("{items}")
+        self.batch_prefix, self.batch_suffix = prefix.encode("utf-8"), suffix.encode("utf-8")
 
-        if 'Content-Type' not in self.headers:
-            self.headers['Content-Type'] = 'application/json'
+        self.headers.setdefault('Content-Type', 'application/json')
 
         try:
-            file_content = storage_adapter.read_text(input_path)
-            payloads = [line.strip() for line in file_content.splitlines() if line.strip()]
+            stream = storage_adapter.open_stream(input_path)
         except Exception as e:
             raise RuntimeError(f"Failed to read input file: {str(e)}")
 
-        if not payloads:
-            raise RuntimeError("Input file contains no valid lines.")
-
-        logger.info(f"[{self.get_plugin_name()}] Sending {len(payloads)} HTTP {self.method} requests to {self.url} with concurrency {self.concurrency}...")
+        logger.info(f"[{self.get_plugin_name()}] Sending HTTP {self.method} requests from '{input_path}' to {self.url} with concurrency {self.concurrency}...")
 
         try:
-            run_async(self._main(payloads))
+            with stream:
+                requests_sent = run_async(self._main(stream))
         except Exception as e:
             raise RuntimeError(f"HTTP loading failed: {str(e)}")
 
+        if not requests_sent:
+            raise RuntimeError("Input file contains no valid lines.")
+        logger.info(f"[{self.get_plugin_name()}] Sent {requests_sent} requests.")
+
         return self.finalize_container(
             container,
             output_path=input_path,
@@ -105,7 +321,8 @@ class HttpLoader(BasePlugin):
                 "input_path": input_path,
                 "url": self.url,
                 "method": self.method,
-                "requests_sent": len(payloads),
+                "requests_sent": requests_sent,
+                "batch_size": self.batch_size,
                 "concurrency": self.concurrency
             }
         )
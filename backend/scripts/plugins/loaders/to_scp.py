@@ -1,19 +1,301 @@
 import os
+import atexit
+import hashlib
+import queue
+import shlex
+import socket
+import threading
+import time
 import paramiko
-import tempfile
-from typing import Dict, Any
+from pathlib import PurePosixPath
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple
 import pluggy
 
 from core.data_container.container import DataContainer
-from core.infrastructure import storage_adapter
+from core.infrastructure import storage_adapter, is_local_path
 from core.plugin_manager.base_plugin import BasePlugin
 
 from utils.logger import setup_logger
+from utils.prefetch_reader import PrefetchReader
 
 logger = setup_logger(__name__)
 
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
+# paramiko 既定のチャネル (ウィンドウ 2MB / パケット 32KB) では、パイプライン化された
+# WRITE 要求がウィンドウを使い切って ACK 待ちになりやすいため大きめに取る。
+SFTP_WINDOW_SIZE = 2 ** 27
+SFTP_MAX_PACKET_SIZE = 2 ** 19
+# SSH 接続の送信バッファ。大きなチャネルウィンドウを実際に使い切れるよう OS 既定より広げる。
+SSH_SOCKET_SNDBUF_SIZE = 4 * 1024 * 1024
+# 1つの SFTP WRITE 要求で送るデータ量。paramiko 既定の 32KB では要求ごとの処理が CPU を占めるため、
+# OpenSSH の sftp-server が受け付けるメッセージ上限 (256KB) にヘッダー分の余裕を残した値にする。
+# SFTP の仕様が保証するのは 32KB までのため、指定がない場合は OpenSSH のサーバーにのみ適用する。
+SFTP_WRITE_REQUEST_SIZE = 255 * 1024
+# 入力から1回に読み出すサイズ (paramiko の put/putfo は 32KB ずつ読む)
+UPLOAD_READ_SIZE = 1024 * 1024
+
+# 同じホストへ複数ファイルを送るパイプラインで、SSH の鍵交換・認証を実行ごとに払わないよう、
+# 認証済みの SSH 接続と SFTP セッションを (host, port, user) 単位で保持する。
+# 並列アップロードの各スレッドが使った接続も再利用できるよう、キーごとに複数保持する。
+# 別の認証情報での実行が認証済みの接続を使わないよう、キーには認証情報のハッシュも含める。
+# 取得時にプールから取り出すため、1つのセッションを複数スレッドが同時に使うことはない。
+_SFTP_POOL: Dict[Tuple[str, int, str, str, bool], List[Tuple[paramiko.SSHClient, paramiko.SFTPClient, float]]] = {}
+_SFTP_POOL_LOCK = threading.Lock()
+# これより長くアイドルだった接続はサーバー側 (ClientAliveInterval 等) で切断されうるため作り直す
+SFTP_POOL_IDLE_TIMEOUT = 60.0
+# キーごとに保持するアイドル接続の上限
+SFTP_POOL_MAX_IDLE = 8
+# プール中の接続が NAT やファイアウォールのアイドルタイムアウトで切られないよう送る keepalive の間隔 (秒)
+SSH_KEEPALIVE_INTERVAL = 30
+
+
+def _pool_key(host: str, port: int, user: str, password: Optional[str],
+              key_filepath: Optional[str], compress: bool) -> Tuple[str, int, str, str, bool]:
+    credentials = f"{password or ''}\0{key_filepath or ''}"
+    return host, port, user, hashlib.sha256(credentials.encode("utf-8")).hexdigest(), compress
+
+
+def _acquire_sftp(host: str, port: int, user: str, password: Optional[str], key_filepath: Optional[str],
+                  timeout: int, window_size: int, max_packet_size: int,
+                  compress: bool) -> Tuple[paramiko.SSHClient, paramiko.SFTPClient]:
+    while True:
+        with _SFTP_POOL_LOCK:
+            entries = _SFTP_POOL.get(_pool_key(host, port, user, password, key_filepath, compress))
+            entry = entries.pop() if entries else None
+        if entry is None:
+            break
+        ssh_client, sftp, released_at = entry
+        transport = ssh_client.get_transport()
+        if (time.monotonic() - released_at <= SFTP_POOL_IDLE_TIMEOUT
+                and transport is not None and transport.is_active()):
+            return ssh_client, sftp
+        ssh_client.close()
+
+    ssh_client = paramiko.SSHClient()
+    ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        logger.info("Connecting to %s:%s as user '%s'...", host, port, user)
+        ssh_client.connect(
+            hostname=host, port=port, username=user,
+            password=password, key_filename=key_filepath, timeout=timeout,
+            compress=compress
+        )
+        transport = ssh_client.get_transport()
+        # パイプライン化した WRITE の小さなパケットや ACK を Nagle で待たせない
+        transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        transport.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SSH_SOCKET_SNDBUF_SIZE)
+        transport.set_keepalive(SSH_KEEPALIVE_INTERVAL)
+        sftp = paramiko.SFTPClient.from_transport(
+            transport,
+            window_size=window_size,
+            max_packet_size=max_packet_size,
+        )
+    except BaseException:
+        ssh_client.close()
+        raise
+    return ssh_client, sftp
+
+
+def _release_sftp(host: str, port: int, user: str, password: Optional[str], key_filepath: Optional[str],
+                  compress: bool, ssh_client: paramiko.SSHClient, sftp: paramiko.SFTPClient) -> None:
+    key = _pool_key(host, port, user, password, key_filepath, compress)
+    with _SFTP_POOL_LOCK:
+        entries = _SFTP_POOL.setdefault(key, [])
+        if len(entries) < SFTP_POOL_MAX_IDLE:
+            entries.append((ssh_client, sftp, time.monotonic()))
+            return
+    ssh_client.close()
+
+
+# 存在を確認・作成済みのリモートディレクトリ (host, port, user, remote_dir)。
+# 2回目以降の同じ宛先へのアップロードでは stat を送らない。
+_SFTP_DIR_CACHE: Set[Tuple[str, int, str, str]] = set()
+
+
+def _ensure_remote_dir(sftp: paramiko.SFTPClient, remote_dir: str) -> None:
+    """
+    remote_dir を stat で1回だけ確認し、存在しない場合は上位から順に mkdir する。
+    既存の階層の mkdir は失敗するが無視する (階層ごとの stat の往復を省く)。
+    作成できなかった場合はその後の書き込みでエラーになる。
+    """
+    if not remote_dir:
+        return
+    try:
+        sftp.stat(remote_dir)
+        return
+    except FileNotFoundError:
+        logger.info("Creating remote directory '%s'...", remote_dir)
+    current_path = PurePosixPath()
+    for part in PurePosixPath(remote_dir).parts:
+        current_path /= part
+        if part == '/':
+            continue
+        try:
+            sftp.mkdir(str(current_path))
+        except IOError:
+            pass
+
+
+def _write_request_size(sftp: paramiko.SFTPClient, requested: Optional[int]) -> int:
+    """
+    WRITE 要求のサイズを決める。指定がない場合、サーバーの識別文字列が OpenSSH のときだけ
+    SFTP_WRITE_REQUEST_SIZE に広げ、それ以外のサーバーでは paramiko の既定値 (32KB) のままにする。
+    """
+    if requested:
+        return requested
+    remote_version = sftp.get_channel().get_transport().remote_version or ""
+    if "OpenSSH" in remote_version:
+        return SFTP_WRITE_REQUEST_SIZE
+    return paramiko.SFTPFile.MAX_REQUEST_SIZE
+
+
+def _upload_fileobj(sftp: paramiko.SFTPClient, source, remote_path: str,
+                    pipelined: bool, confirm: bool, request_size: Optional[int],
+                    digest: Optional["hashlib._Hash"] = None) -> int:
+    """
+    source を remote_path に書き込み、送信したバイト数を返す。
+    pipelined の場合は WRITE 要求ごとの応答を待たずに次を送り、往復遅延を重ねる
+    (応答はクローズ時にまとめて確認される)。
+    digest を渡した場合は、送信するデータで同時に更新する (入力を読み直さない)。
+    """
+    size = 0
+    with sftp.open(remote_path, 'wb') as remote_file:
+        remote_file.set_pipelined(pipelined)
+        # クラス属性 (全 SFTPFile 共通) は変えず、このファイルの要求サイズだけを広げる
+        remote_file.MAX_REQUEST_SIZE = _write_request_size(sftp, request_size)
+        while True:
+            data = source.read(UPLOAD_READ_SIZE)
+            if not data:
+                break
+            if digest is not None:
+                digest.update(data)
+            remote_file.write(data)
+            size += len(data)
+    if confirm:
+        remote_size = sftp.stat(remote_path).st_size
+        if remote_size != size:
+            raise IOError(f"size mismatch in upload! {remote_size} != {size}")
+    return size
+
+
+def _remote_sha256(ssh_client: paramiko.SSHClient, remote_path: str, timeout: int) -> str:
+    """リモートで sha256sum を実行し、remote_path の SHA-256 (16進) を返す。"""
+    _, stdout, stderr = ssh_client.exec_command(f"sha256sum -- {shlex.quote(remote_path)}", timeout=timeout)
+    output = stdout.read().decode("utf-8", errors="replace")
+    if stdout.channel.recv_exit_status() != 0:
+        error = stderr.read().decode("utf-8", errors="replace").strip()
+        raise IOError(f"sha256sum failed on the remote host: {error or output.strip()}")
+    return output.split(maxsplit=1)[0].lower() if output.strip() else ""
+
+
+@atexit.register
+def _close_sftp_pool() -> None:
+    with _SFTP_POOL_LOCK:
+        entries = [entry for entries in _SFTP_POOL.values() for entry in entries]
+        _SFTP_POOL.clear()
+    for ssh_client, _, _ in entries:
+        ssh_client.close()
+
+
+_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "input_path": {
+            "oneOf": [
+                {"type": "string"},
+                {"type": "array", "items": {"type": "string"}, "minItems": 1},
+            ],
+            "title": "Input File Path (local/s3)",
+            "description": "Input file path, or an array of paths to upload concurrently."
+        },
+        "host": {"type": "string", "title": "SSH Host"},
+        "port": {"type": "integer", "title": "SSH Port", "default": 22},
+        "user": {"type": "string", "title": "SSH Username"},
+        "remote_path": {
+            "type": "string",
+            "title": "Remote Path",
+            "description": "Must be a directory ending with '/' when 'input_path' is an array."
+        },
+        "password": {"type": "string", "title": "Password (Optional)", "format": "password"},
+        "key_filepath": {"type": "string", "title": "SSH Key File Path (Optional)"},
+        "timeout": {"type": "integer", "title": "Connection Timeout in seconds", "default": 30},
+        "concurrency": {
+            "type": "integer",
+            "title": "Max Concurrent Uploads (batch mode)",
+            "default": 4,
+            "minimum": 1
+        },
+        "channels_per_connection": {
+            "type": "integer",
+            "title": "SFTP Channels per SSH Connection (batch mode)",
+            "description": (
+                "(Optional) Number of concurrent uploads sharing one SSH connection as separate SFTP channels. "
+                "1 uses a separate connection per upload. Keep it within the server's MaxSessions (OpenSSH default: 10)."
+            ),
+            "default": 1,
+            "minimum": 1
+        },
+        "sftp_window_size": {
+            "type": "integer",
+            "title": "SFTP Window Size (bytes)",
+            "default": SFTP_WINDOW_SIZE
+        },
+        "sftp_max_packet_size": {
+            "type": "integer",
+            "title": "SFTP Max Packet Size (bytes)",
+            "default": SFTP_MAX_PACKET_SIZE
+        },
+        "sftp_write_request_size": {
+            "type": "integer",
+            "title": "SFTP Write Request Size (bytes)",
+            "description": (
+                "(Optional) Data sent per SFTP WRITE request. When omitted, 261120 bytes is used for "
+                "OpenSSH servers and paramiko's default (32768) for other servers."
+            )
+        },
+        "pipelined": {
+            "type": "boolean",
+            "title": "Pipelined Writes",
+            "description": "(Optional) Send SFTP write requests without waiting for each acknowledgement.",
+            "default": True
+        },
+        "compress": {
+            "type": "boolean",
+            "title": "SSH Compression",
+            "description": (
+                "(Optional) Compress the SSH transport (zlib). Speeds up text files over slow links, "
+                "but costs CPU and slows down already-compressed data on fast networks."
+            ),
+            "default": False
+        },
+        "skip_if_same_size": {
+            "type": "boolean",
+            "title": "Skip If Same Size",
+            "description": "(Optional) Skip the upload when the remote file already exists with the same size.",
+            "default": False
+        },
+        "confirm_upload": {
+            "type": "boolean",
+            "title": "Confirm Upload",
+            "description": "(Optional) Stat the remote file after upload and verify its size.",
+            "default": False
+        },
+        "verify_checksum": {
+            "type": "boolean",
+            "title": "Verify SHA-256",
+            "description": (
+                "(Optional) Hash the data while uploading it and compare with 'sha256sum' run on the remote host. "
+                "Requires shell access with sha256sum on the server."
+            ),
+            "default": False
+        }
+    },
+    "required": ["input_path", "host", "user", "remote_path"]
+}
+
+
 class ScpLoader(BasePlugin):
     """
     (Storage Aware) Loads (uploads) a file from local or S3 to a remote server using SCP.
@@ -24,97 +306,232 @@ class ScpLoader(BasePlugin):
 
     @hookimpl
     def get_parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "input_path": {"type": "string", "title": "Input File Path (local/s3)"},
-                "host": {"type": "string", "title": "SSH Host"},
-                "port": {"type": "integer", "title": "SSH Port", "default": 22},
-                "user": {"type": "string", "title": "SSH Username"},
-                "remote_path": {"type": "string", "title": "Remote Path"},
-                "password": {"type": "string", "title": "Password (Optional)", "format": "password"},
-                "key_filepath": {"type": "string", "title": "SSH Key File Path (Optional)"},
-                "timeout": {"type": "integer", "title": "Connection Timeout in seconds", "default": 30}
-            },
-            "required": ["input_path", "host", "user", "remote_path"]
-        }
+        return _SCHEMA
 
-    def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
-        input_path_str = str(self.params.get("input_path"))
+    def _upload_one(self, input_path_str: str, remote_path_str: str,
+                    session: Optional[Tuple[paramiko.SSHClient, paramiko.SFTPClient]] = None) -> bool:
+        """
+        1ファイルをアップロードする。サイズ一致でスキップした場合は True を返す。
+        session を渡した場合はその SFTP セッションを使い、プールからの取得・返却は呼び出し側に任せる。
+        """
         host = self.params.get("host")
         port = self.params.get("port", 22)
         user = self.params.get("user")
         password = self.params.get("password")
         key_filepath = self.params.get("key_filepath")
-        remote_path_str = str(self.params.get("remote_path"))
         timeout = self.params.get("timeout", 30)
+        window_size = int(self.params.get("sftp_window_size", SFTP_WINDOW_SIZE))
+        max_packet_size = int(self.params.get("sftp_max_packet_size", SFTP_MAX_PACKET_SIZE))
+        confirm = bool(self.params.get("confirm_upload", False))
+        verify_checksum = bool(self.params.get("verify_checksum", False))
+        pipelined = bool(self.params.get("pipelined", True))
+        request_size = self.params.get("sftp_write_request_size")
+        request_size = int(request_size) if request_size else None
+        compress = bool(self.params.get("compress", False))
+        skip_if_same_size = bool(self.params.get("skip_if_same_size", False))
 
-        if not all([input_path_str, host, user, remote_path_str]):
-            raise ValueError("Missing required parameters: 'input_path', 'host', 'user', 'remote_path'.")
-        if not password and not key_filepath:
-            raise ValueError("Either 'password' or 'key_filepath' must be provided.")
+        upload_filename = os.path.basename(input_path_str.rstrip('/'))
+        try:
+            if is_local_path(input_path_str):
+                if not os.path.isfile(input_path_str):
+                    raise FileNotFoundError(f"File not found: {input_path_str}")
+                local_size = os.path.getsize(input_path_str) if skip_if_same_size else None
+                source = open(input_path_str, 'rb')
+            else:
+                local_size = storage_adapter.get_size(input_path_str) if skip_if_same_size else None
+                # S3 等はローカルの一時ファイルに展開せず、ストリームのまま SFTP へ流す
+                logger.info("[%s] Opening '%s' for streaming upload...", self.get_plugin_name(), input_path_str)
+                source = storage_adapter.open_stream(input_path_str)
+        except Exception as e:
+            raise RuntimeError(f"Failed to prepare file for upload: {str(e)}")
 
-        def basename(path: str) -> str:
-            return os.path.basename(path.rstrip('/'))
+        ssh_client = None
+        released = False
+        skipped = False
+        try:
+            if session is None:
+                ssh_client, sftp = _acquire_sftp(
+                    host, port, user, password, key_filepath, timeout, window_size, max_packet_size, compress
+                )
+            else:
+                ssh_client, sftp = session
+            # リモート側は常に POSIX パスとして扱う (ローカルが Windows でも '/' 区切り)
+            remote_path = PurePosixPath(remote_path_str)
+            if remote_path_str.endswith('/') or not remote_path.name:
+                remote_path /= upload_filename
+            final_remote_path = str(remote_path)
 
-        def dirname(path: str) -> str:
-            return os.path.dirname(path.rstrip('/'))
+            if skip_if_same_size:
+                try:
+                    skipped = sftp.stat(final_remote_path).st_size == local_size
+                except FileNotFoundError:
+                    pass
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_local_path = os.path.join(temp_dir, basename(input_path_str))
+            remote_dir = str(remote_path.parent)
+            dir_key = (host, port, user, remote_dir)
+            dir_cached = dir_key in _SFTP_DIR_CACHE
+            if skipped:
+                logger.info("[%s] Skipped '%s': remote file has the same size.", self.get_plugin_name(), final_remote_path)
+            else:
+                if not dir_cached:
+                    _ensure_remote_dir(sftp, remote_dir)
+                    _SFTP_DIR_CACHE.add(dir_key)
 
-            try:
-                if input_path_str.startswith("s3://"):
-                    logger.info(f"[{self.get_plugin_name()}] Downloading '{input_path_str}' from S3...")
-                    file_content_bytes = storage_adapter.read_bytes(input_path_str)
-                    with open(temp_local_path, 'wb') as f:
-                        f.write(file_content_bytes)
-                    local_file_to_upload = temp_local_path
+                logger.info("[%s] Uploading to '%s'...", self.get_plugin_name(), final_remote_path)
+                # 入力の読み出しを別スレッドで先行させ、SFTP への送信と並行させる
+                source = PrefetchReader(source, UPLOAD_READ_SIZE)
+                digest = hashlib.sha256() if verify_checksum else None
+                try:
+                    _upload_fileobj(sftp, source, final_remote_path, pipelined, confirm, request_size, digest)
+                except FileNotFoundError:
+                    if not dir_cached:
+                        raise
+                    # キャッシュ後にディレクトリが消された場合。open の時点で失敗するため
+                    # source は未読のまま、作り直して再送できる。
+                    _SFTP_DIR_CACHE.discard(dir_key)
+                    _ensure_remote_dir(sftp, remote_dir)
+                    _SFTP_DIR_CACHE.add(dir_key)
+                    _upload_fileobj(sftp, source, final_remote_path, pipelined, confirm, request_size, digest)
+                if digest is not None:
+                    remote_digest = _remote_sha256(ssh_client, final_remote_path, timeout)
+                    if remote_digest != digest.hexdigest():
+                        raise IOError(
+                            f"SHA-256 mismatch in upload! {remote_digest} != {digest.hexdigest()}"
+                        )
+                    logger.info("[%s] Verified SHA-256 of '%s'.", self.get_plugin_name(), final_remote_path)
+            if session is None:
+                _release_sftp(host, port, user, password, key_filepath, compress, ssh_client, sftp)
+                released = True
+        except Exception as e:
+            raise RuntimeError(f"SCP upload failed: {str(e)}")
+        finally:
+            source.close()
+            # 失敗した接続は状態が不明なためプールに戻さない
+            if session is None and ssh_client and not released:
+                ssh_client.close()
+        return skipped
+
+    def _upload_over_channels(self, input_paths: List[str], remote_path_str: str,
+                              workers: int, channels: int) -> List[Future]:
+        """
+        1本の SSH 接続上に channels 個の SFTP チャネルを開き、workers 個の並列アップロードで共有する。
+        鍵交換・認証と TCP の輻輳ウィンドウの立ち上がりを接続数分に抑える。
+        """
+        host = self.params.get("host")
+        port = self.params.get("port", 22)
+        user = self.params.get("user")
+        password = self.params.get("password")
+        key_filepath = self.params.get("key_filepath")
+        timeout = self.params.get("timeout", 30)
+        window_size = int(self.params.get("sftp_window_size", SFTP_WINDOW_SIZE))
+        max_packet_size = int(self.params.get("sftp_max_packet_size", SFTP_MAX_PACKET_SIZE))
+        compress = bool(self.params.get("compress", False))
+
+        connections: List[Tuple[paramiko.SSHClient, paramiko.SFTPClient]] = []
+        extra_channels: List[paramiko.SFTPClient] = []
+        sessions: "queue.Queue" = queue.Queue()
+        futures: List[Future] = []
+        try:
+            for i in range(workers):
+                if i % channels == 0:
+                    ssh_client, sftp = _acquire_sftp(
+                        host, port, user, password, key_filepath, timeout, window_size, max_packet_size, compress
+                    )
+                    connections.append((ssh_client, sftp))
                 else:
-                    local_file_to_upload = input_path_str
-
-                if not os.path.isfile(local_file_to_upload):
-                    raise FileNotFoundError(f"File not found: {local_file_to_upload}")
-            except Exception as e:
-                raise RuntimeError(f"Failed to prepare file for upload: {str(e)}")
-
-            ssh_client = None
-            try:
-                ssh_client = paramiko.SSHClient()
-                ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                logger.info(f"[{self.get_plugin_name()}] Connecting to {host}:{port} as user '{user}'...")
-                ssh_client.connect(
-                    hostname=host, port=port, username=user,
-                    password=password, key_filename=key_filepath, timeout=timeout
-                )
+                    ssh_client = connections[-1][0]
+                    sftp = paramiko.SFTPClient.from_transport(
+                        ssh_client.get_transport(),
+                        window_size=window_size,
+                        max_packet_size=max_packet_size,
+                    )
+                    extra_channels.append(sftp)
+                sessions.put((ssh_client, sftp))
+
+            def upload(path: str) -> bool:
+                session = sessions.get()
+                try:
+                    return self._upload_one(path, remote_path_str, session)
+                finally:
+                    sessions.put(session)
 
-                with ssh_client.open_sftp() as sftp:
-                    final_remote_path = remote_path_str
-                    if remote_path_str.endswith('/') or not basename(remote_path_str):
-                        final_remote_path = remote_path_str.rstrip('/') + '/' + basename(local_file_to_upload)
-
-                    remote_dir = dirname(final_remote_path)
-                    try:
-                        sftp.stat(remote_dir)
-                    except FileNotFoundError:
-                        logger.info(f"[{self.get_plugin_name()}] Creating remote directory '{remote_dir}'...")
-                        current_path = ""
-                        for part in remote_dir.split('/'):
-                            if not part:
-                                continue
-                            current_path = current_path + '/' + part if current_path else part
-                            try:
-                                sftp.stat(current_path)
-                            except FileNotFoundError:
-                                sftp.mkdir(current_path)
-
-                    logger.info(f"[{self.get_plugin_name()}] Uploading to '{final_remote_path}'...")
-                    sftp.put(local_file_to_upload, final_remote_path)
-            except Exception as e:
-                raise RuntimeError(f"SCP upload failed: {str(e)}")
-            finally:
-                if ssh_client:
+            logger.info(
+                f"[{self.get_plugin_name()}] Uploading {len(input_paths)} files with {workers} SFTP channels "
+                f"over {len(connections)} connections..."
+            )
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(upload, path) for path in input_paths]
+        finally:
+            for sftp in extra_channels:
+                sftp.close()
+            # 失敗したアップロードがあった接続は状態が不明なためプールに戻さない
+            failed = any(future.exception() is not None for future in futures) or len(futures) != len(input_paths)
+            for ssh_client, sftp in connections:
+                transport = ssh_client.get_transport()
+                if not failed and transport is not None and transport.is_active():
+                    _release_sftp(host, port, user, password, key_filepath, compress, ssh_client, sftp)
+                else:
                     ssh_client.close()
+        return futures
+
+    def _run_batch(self, input_paths: List[str], remote_path_str: str,
+                   container: DataContainer) -> DataContainer:
+        if not remote_path_str.endswith('/'):
+            raise ValueError("'remote_path' must be a directory ending with '/' when 'input_path' is a list.")
+        concurrency = max(1, int(self.params.get("concurrency", 4)))
+        input_paths = [str(path) for path in input_paths]
+
+        channels = max(1, int(self.params.get("channels_per_connection", 1)))
+        workers = min(concurrency, len(input_paths))
+
+        if channels == 1:
+            # 各スレッドがプールから別々の SSH 接続を取り出して並列に送る
+            logger.info(f"[{self.get_plugin_name()}] Uploading {len(input_paths)} files with {workers} connections...")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._upload_one, path, remote_path_str) for path in input_paths]
+        else:
+            futures = self._upload_over_channels(input_paths, remote_path_str, workers, channels)
+        skipped: List[bool] = []
+        errors: List[Exception] = []
+        for future in futures:
+            error = future.exception()
+            if error is None:
+                skipped.append(future.result())
+            else:
+                errors.append(error)
+        if errors:
+            raise RuntimeError(f"{len(errors)} SCP uploads failed. First error: {errors[0]}") from errors[0]
+        logger.info(f"[{self.get_plugin_name()}] All uploads successful.")
+
+        return self.finalize_container(
+            container,
+            metadata={
+                "input_path": input_paths,
+                "remote_host": self.params.get("host"),
+                "remote_path": remote_path_str,
+                "uploaded_filename": [os.path.basename(path.rstrip('/')) for path in input_paths],
+                "skipped": skipped
+            }
+        )
+
+    def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
+        input_path = self.params.get("input_path")
+        host = self.params.get("host")
+        user = self.params.get("user")
+        password = self.params.get("password")
+        key_filepath = self.params.get("key_filepath")
+        remote_path_str = str(self.params.get("remote_path"))
+
+        if not all([input_path, host, user, remote_path_str]):
+            raise ValueError("Missing required parameters: 'input_path', 'host', 'user', 'remote_path'.")
+        if not password and not key_filepath:
+            raise ValueError("Either 'password' or 'key_filepath' must be provided.")
+
+        if isinstance(input_path, list):
+            return self._run_batch(input_path, remote_path_str, container)
+
+        input_path_str = str(input_path)
+        skipped = self._upload_one(input_path_str, remote_path_str)
 
         return self.finalize_container(
             container,
@@ -122,6 +539,7 @@ class ScpLoader(BasePlugin):
                 "input_path": input_path_str,
                 "remote_host": host,
                 "remote_path": remote_path_str,
-                "uploaded_filename": basename(local_file_to_upload)
+                "uploaded_filename": os.path.basename(input_path_str.rstrip('/')),
+                "skipped": skipped
             }
         )
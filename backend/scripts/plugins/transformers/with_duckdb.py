@@ -1,11 +1,19 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, closing
+from functools import lru_cache
 import duckdb
 import pandas as pd
-from typing import Dict, Any
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from typing import Dict, Any, List, Optional, Set, Tuple
 import pluggy
 
 from core.data_container.container import DataContainer
-from core.infrastructure.storage_adapter import storage_adapter
+from core.data_container.formats import SupportedFormats
+from core.infrastructure.storage_adapter import ARROW_READ_BLOCK_SIZE, DEFAULT_PARQUET_COMPRESSION, storage_adapter
+from core.infrastructure.storage_path_utils import get_scheme, is_local_path, normalize_path
 from core.plugin_manager.base_plugin import BasePlugin
 
 from utils.logger import setup_logger
@@ -15,13 +23,93 @@ logger = setup_logger(__name__)
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
 os.environ["HOME"] = "/tmp"
-os.environ["DUCKDB_TMPDIR"] = "/tmp/duckdb_cache"
+
+
+def _default_temp_dir() -> str:
+    # ソートやハッシュ集約がメモリに収まらない場合の退避先。Linux では tmpfs の /dev/shm を使い、
+    # ディスク (コンテナの /tmp は overlayfs の場合が多い) への書き込みを避ける。
+    # tmpfs に退避した分はメモリを消費するため、メモリが厳しい環境では DUCKDB_TMPDIR で変更する。
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm/duckdb_cache"
+    return "/tmp/duckdb_cache"
+
+
+os.environ.setdefault("DUCKDB_TMPDIR", _default_temp_dir())
+
+# 実行ごとにデータベースを作り直さないよう、プロセス内でインメモリ DB を保持する。
+# threads / memory_limit は DB 全体の設定のため、設定の組み合わせ (threads, memory_limit) ごとに分ける。
+# 各実行はこの接続から作ったカーソルを使う。カーソルは DB を共有しつつ、登録したテーブルは
+# カーソルごとに独立しているため、並行して実行しても互いに見えない。
+_CONNECTIONS: Dict[Tuple[Optional[int], Optional[str]], duckdb.DuckDBPyConnection] = {}
+_CONNECTION_LOCK = threading.Lock()
+# httpfs の読み込みは DB 単位のため、DB ごとに1回だけ行う (id(接続) を保持)
+_S3_READY: Set[int] = set()
+
+
+# DuckDB が直接走査できる入力形式と、そのテーブル関数
+_DIRECT_READERS: Dict[SupportedFormats, str] = {
+    SupportedFormats.PARQUET: "read_parquet",
+    SupportedFormats.CSV: "read_csv_auto",
+    SupportedFormats.JSONL: "read_json_auto",
+}
+
+# Parquet 出力時に DuckDB から Arrow で受け取る1バッチの行数
+ARROW_BATCH_ROWS = 100_000
+
+
+def _get_connection(threads: Optional[int] = None,
+                    memory_limit: Optional[str] = None) -> duckdb.DuckDBPyConnection:
+    key = (threads, memory_limit)
+    with _CONNECTION_LOCK:
+        con = _CONNECTIONS.get(key)
+        if con is None:
+            temp_dir = os.environ["DUCKDB_TMPDIR"]
+            os.makedirs(temp_dir, exist_ok=True)
+            config: Dict[str, Any] = {"temp_directory": temp_dir}
+            # 未指定の場合は DuckDB の既定値 (全コア / メモリの 80%) を使う
+            if threads is not None:
+                config["threads"] = threads
+            if memory_limit is not None:
+                config["memory_limit"] = memory_limit
+            con = duckdb.connect(database=':memory:', config=config)
+            _CONNECTIONS[key] = con
+        return con
+
+
+def _prepare_s3(con: duckdb.DuckDBPyConnection) -> None:
+    """
+    DuckDB が S3 を直接読めるよう httpfs を読み込み、認証情報を boto3 と同じ
+    既定のチェーン (環境変数・プロファイル・IAM ロール) から解決するシークレットを作る。
+    シークレットは作成時に解決した認証情報を保持し、DB はプロセスの間使い続けるため、
+    STS / ECS タスクロール / SSO の一時的な認証情報が失効しないよう実行ごとに作り直す。
+    """
+    with _CONNECTION_LOCK:
+        if id(con) not in _S3_READY:
+            con.execute("INSTALL httpfs")
+            con.execute("LOAD httpfs")
+            _S3_READY.add(id(con))
+        con.execute("CREATE OR REPLACE SECRET etl_s3 (TYPE S3, PROVIDER CREDENTIAL_CHAIN)")
+
+
+@lru_cache(maxsize=256)
+def _read_query(path: str, version: Any) -> str:
+    # version (ETag / 更新日時とサイズ) が変わればキーも変わり、ファイルを読み直す
+    return storage_adapter.read_text(path)
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _sql_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
 
 class DuckDBTransformer(BasePlugin):
     """
     (Storage Aware) Transforms data using a SQL query powered by DuckDB.
-    Reads input data into a pandas DataFrame using StorageAdapter,
-    then registers it with DuckDB for transformation.
+    Local Parquet and UTF-8 CSV/JSONL inputs are scanned by DuckDB directly;
+    other inputs are read using StorageAdapter and registered with DuckDB.
     """
 
     @hookimpl
@@ -34,9 +122,15 @@ class DuckDBTransformer(BasePlugin):
             "type": "object",
             "properties": {
                 "input_path": {
-                    "type": "string",
-                    "title": "Input File Path (local/s3)",
-                    "description": "The file to be read by StorageAdapter and registered as a table in DuckDB."
+                    "oneOf": [
+                        {"type": "string"},
+                        {"type": "array", "items": {"type": "string"}, "minItems": 1}
+                    ],
+                    "title": "Input File Path(s) (local/s3)",
+                    "description": (
+                        "The file(s) to be registered as a table in DuckDB. Multiple files of the same format "
+                        "are combined into one table; local Parquet paths may also be globs (e.g. 'data/*.parquet')."
+                    )
                 },
                 "input_encoding": {
                     "type": "string",
@@ -55,42 +149,242 @@ class DuckDBTransformer(BasePlugin):
                     "type": "string",
                     "title": "Table Name for Input",
                     "default": "source_data"
+                },
+                "threads": {
+                    "type": "integer",
+                    "title": "DuckDB Threads",
+                    "description": (
+                        "(Optional) Worker threads for query execution. Defaults to all CPU cores. "
+                        "Steps with the same threads/memory_limit share one in-memory database."
+                    ),
+                    "minimum": 1
+                },
+                "memory_limit": {
+                    "type": "string",
+                    "title": "DuckDB Memory Limit",
+                    "description": (
+                        "(Optional) e.g. '4GB'. Defaults to 80% of RAM; data beyond the limit spills to DUCKDB_TMPDIR. "
+                        "Steps with the same threads/memory_limit share one in-memory database."
+                    )
+                },
+                "parquet_compression": {
+                    "type": "string",
+                    "title": "Parquet Compression",
+                    "description": "(Optional) Codec used when output_path is a Parquet file.",
+                    "enum": ["snappy", "zstd", "gzip", "lz4", "none"],
+                    "default": DEFAULT_PARQUET_COMPRESSION
+                },
+                "s3_direct_read": {
+                    "type": "boolean",
+                    "title": "Read S3 Input with DuckDB",
+                    "description": (
+                        "(Optional) Let DuckDB read S3 Parquet/UTF-8 CSV inputs itself via the httpfs extension "
+                        "(parallel range requests) instead of downloading them first. "
+                        "Requires the httpfs and aws extensions to be installable."
+                    ),
+                    "default": False
+                },
+                "stream_csv_input": {
+                    "type": "boolean",
+                    "title": "Stream CSV Input",
+                    "description": (
+                        "(Optional) Feed CSV inputs that DuckDB does not scan itself (remote or non-UTF-8) "
+                        "batch by batch instead of loading the whole table first. "
+                        "Column types are inferred from the first block, and the query may scan the input table only once "
+                        "(no self-joins or repeated CTE references)."
+                    ),
+                    "default": False
                 }
             },
             "required": ["input_path", "output_path", "query_file"]
         }
 
     def _get_query(self, path: str) -> str:
-        return storage_adapter.read_text(path)
+        """
+        クエリファイルの内容を返す。同じパスを繰り返し実行する場合に S3 から毎回本文を
+        取得しないよう、ETag (ローカルは更新日時とサイズ) が変わらない限りキャッシュを使う。
+        """
+        try:
+            stat = storage_adapter.stat(path)
+        except Exception:
+            # stat に対応しないパス (http 等) は毎回読む
+            return storage_adapter.read_text(path)
+        version = (stat.get("etag") or stat.get("last_modified"), stat.get("size"))
+        return _read_query(path, version)
+
+    def _open_csv_batches(self, input_paths: List[str], input_encoding: str,
+                          resources: ExitStack) -> pa.RecordBatchReader:
+        """
+        CSV をブロックごとに解析しながら返す RecordBatchReader を作る。複数ファイルは順に連結し、
+        2つ目以降のファイルは前のファイルを読み終えてから開く。開いたストリームは resources が閉じる。
+        """
+        read_options = pa_csv.ReadOptions(encoding=input_encoding, block_size=ARROW_READ_BLOCK_SIZE)
+
+        def open_reader(path: str) -> pa.RecordBatchReader:
+            stream = storage_adapter.open_stream(path)
+            resources.callback(stream.close)
+            return pa_csv.open_csv(stream, read_options=read_options)
+
+        first = open_reader(input_paths[0])
+
+        def batches():
+            yield from first
+            for path in input_paths[1:]:
+                reader = open_reader(path)
+                if not reader.schema.equals(first.schema):
+                    raise ValueError(
+                        f"'{path}' does not match the columns/types of '{input_paths[0]}': {reader.schema}"
+                    )
+                yield from reader
+
+        return pa.RecordBatchReader.from_batches(first.schema, batches())
+
+    def _register_input(self, database: duckdb.DuckDBPyConnection,
+                        con: duckdb.DuckDBPyConnection, table_name: str,
+                        input_paths: List[str], input_encoding: str, s3_direct_read: bool,
+                        stream_csv_input: bool, resources: ExitStack) -> None:
+        """
+        入力を table_name として登録する。複数ファイルは1つのテーブルとして連結する。
+        ローカル (と s3_direct_read 指定時の S3) の Parquet / UTF-8 の CSV・JSONL は DuckDB が直接読む
+        一時ビューにする (pandas を経由せず、クエリが参照する列だけをファイルをまたいで並列に読む)。
+        stream_csv_input 指定時のそれ以外の CSV はテーブル全体を読み込まず、バッチ単位で DuckDB に渡す。
+        それ以外は StorageAdapter で読んだ Arrow テーブル (CSV / Parquet / JSONL) か
+        DataFrame (その他の形式) を登録する。
+        """
+        formats = {SupportedFormats.from_path(path) for path in input_paths}
+        if len(formats) != 1:
+            raise ValueError("All input files must have the same format.")
+        fmt = formats.pop()
+        is_utf8 = input_encoding.lower().replace("_", "-") in ("utf-8", "utf8")
+        # DuckDB の CSV / JSON リーダーは UTF-8 のみ対応
+        reader = _DIRECT_READERS.get(fmt) if is_utf8 or fmt == SupportedFormats.PARQUET else None
+        all_local = all(is_local_path(path) for path in input_paths)
+        all_s3 = all(get_scheme(path) == "s3" for path in input_paths)
+        if reader and not (all_local or (s3_direct_read and all_s3)):
+            reader = None
+        if reader and all_s3:
+            _prepare_s3(database)
+
+        if reader:
+            # ビュー定義にはプリペアドパラメータを使えないため、パスはエスケープしたリテラルで渡す。
+            # 相対パスや file:// は StorageAdapter と同じ規則で解決してから渡す
+            sources = ", ".join(_sql_literal(normalize_path(path, os.getcwd())) for path in input_paths)
+            # 一時ビューはカーソル (接続) ごとに独立しているため、並行実行でも名前が衝突しない
+            # 複数ファイルは列名で揃えて連結する (一部のファイルにない列は NULL)
+            options = ", union_by_name = true" if len(input_paths) > 1 else ""
+            con.execute(
+                f"CREATE OR REPLACE TEMP VIEW {_sql_identifier(table_name)} AS "
+                f"SELECT * FROM {reader}([{sources}]{options})"
+            )
+            return
+        if stream_csv_input and fmt == SupportedFormats.CSV:
+            table = self._open_csv_batches(input_paths, input_encoding, resources)
+        elif fmt in (SupportedFormats.PARQUET, SupportedFormats.CSV) or (fmt == SupportedFormats.JSONL and is_utf8):
+            # pandas を経由せず、pyarrow のマルチスレッドのパーサーで Arrow のテーブルとして読む
+            tables = [storage_adapter.read_arrow(path, encoding=input_encoding) for path in input_paths]
+            table = tables[0] if len(tables) == 1 else pa.concat_tables(tables, promote_options="default")
+        else:
+            frames = [storage_adapter.read_df(path, read_options={"encoding": input_encoding}) for path in input_paths]
+            table = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        con.register(table_name, table)
+
+    def _copy_to_local(self, con: duckdb.DuckDBPyConnection, sql_query: str, output_path: str,
+                       output_format: SupportedFormats, compression: str) -> Optional[int]:
+        """
+        単一の SELECT 文の結果を COPY でローカルファイルに直接書き込み、書き込んだ行数を返す。
+        結果を Python 側に取り出さず、DuckDB が並列に書き出す。
+        COPY で包めないクエリ (複数の文・SELECT 以外) の場合は何もせず None を返す。
+        """
+        statements = con.extract_statements(sql_query)
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            return None
+        query = statements[0].query.strip().rstrip(";")
+        path = normalize_path(output_path, os.getcwd())
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        if output_format == SupportedFormats.PARQUET:
+            codec = "uncompressed" if compression == "none" else compression
+            options = f"FORMAT PARQUET, COMPRESSION {_sql_literal(codec)}"
+        else:
+            options = "FORMAT CSV, HEADER"
+        try:
+            # クエリ末尾の行コメントで閉じ括弧が無効にならないよう改行を挟む
+            return con.execute(f"COPY (\n{query}\n) TO {_sql_literal(path)} ({options})").fetchone()[0]
+        except duckdb.ParserException:
+            # 文の後ろにコメントが続く場合等。通常の実行に戻す
+            return None
+
+    def _fetch_arrow_reader(self, result: duckdb.DuckDBPyConnection) -> pa.RecordBatchReader:
+        # DuckDB 1.4 以降は to_arrow_reader (fetch_record_batch は非推奨)
+        to_reader = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+        return to_reader(ARROW_BATCH_ROWS)
 
     def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
-        input_path = str(self.params.get("input_path"))
+        input_path = self.params.get("input_path")
+        input_paths = [str(path) for path in input_path] if isinstance(input_path, list) else [str(input_path)]
         input_encoding = str(self.params.get("input_encoding", "utf-8"))
         output_path = str(self.params.get("output_path"))
         query_path = str(self.params.get("query_file"))
         table_name = str(self.params.get("table_name", "source_data"))
+        s3_direct_read = bool(self.params.get("s3_direct_read", False))
+        stream_csv_input = bool(self.params.get("stream_csv_input", False))
+        parquet_compression = str(self.params.get("parquet_compression", DEFAULT_PARQUET_COMPRESSION))
+        threads = self.params.get("threads")
+        threads = int(threads) if threads is not None else None
+        memory_limit = self.params.get("memory_limit")
+        memory_limit = str(memory_limit) if memory_limit is not None else None
+        output_format = SupportedFormats.from_path(output_path)
+        # CSV / Parquet 出力は pandas を経由しない。ローカルは DuckDB の COPY で直接書き込み、
+        # それ以外は Arrow のバッチ単位で storage_adapter に渡す
+        arrow_output = output_format in (SupportedFormats.CSV, SupportedFormats.PARQUET)
+        copy_output = arrow_output and is_local_path(output_path)
+        written = False
+
+        if not input_paths:
+            raise ValueError("'input_path' must contain at least one path.")
 
         try:
-            sql_query = self._get_query(query_path)
-            logger.info(f"[{self.get_plugin_name()}] Connecting to DuckDB in-memory database.")
-            con = duckdb.connect(database=':memory:')
-
-            logger.info(f"[{self.get_plugin_name()}] Reading input file '{input_path}' with encoding '{input_encoding}'.")
-            input_df = storage_adapter.read_df(input_path, read_options={"encoding": input_encoding})
-
-            con.register(table_name, input_df)
-            logger.info(f"[{self.get_plugin_name()}] Executing SQL query:\n{sql_query}")
-            result_df = con.execute(sql_query).fetch_df()
-            con.close()
-            logger.info(f"[{self.get_plugin_name()}] Query executed. Result has {len(result_df)} rows.")
+            # 入力ストリームは結果を取り出し終えるまで開いておき、カーソルより先に閉じる
+            with ExitStack() as resources:
+                # クエリファイルの読み込み (S3 等) は入力の登録と独立しているため、別スレッドで並行して行う
+                executor = resources.enter_context(ThreadPoolExecutor(max_workers=1))
+                query_future = executor.submit(self._get_query, query_path)
+                logger.info(f"[{self.get_plugin_name()}] Reading input file '{input_path}' with encoding '{input_encoding}'.")
+                database = _get_connection(threads, memory_limit)
+                con = resources.enter_context(closing(database.cursor()))
+                self._register_input(
+                    database, con, table_name, input_paths, input_encoding, s3_direct_read, stream_csv_input, resources
+                )
+                sql_query = query_future.result()
+                logger.info(f"[{self.get_plugin_name()}] Executing SQL query:\n{sql_query}")
+                rows_output = None
+                if copy_output:
+                    rows_output = self._copy_to_local(
+                        con, sql_query, output_path, output_format, parquet_compression
+                    )
+                if rows_output is not None:
+                    written = True
+                    logger.info(f"[{self.get_plugin_name()}] Result ({rows_output} rows) copied to '{output_path}'.")
+                elif arrow_output:
+                    rows_output = storage_adapter.write_arrow(
+                        self._fetch_arrow_reader(con.execute(sql_query)), output_path, compression=parquet_compression
+                    )
+                    written = True
+                    logger.info(f"[{self.get_plugin_name()}] Result ({rows_output} rows) saved to '{output_path}'.")
+                else:
+                    result_df = con.execute(sql_query).fetch_df()
+                    rows_output = len(result_df)
+            logger.info(f"[{self.get_plugin_name()}] Query executed. Result has {rows_output} rows.")
         except Exception as e:
             raise RuntimeError(f"DuckDB transformation failed: {str(e)}")
 
-        try:
-            storage_adapter.write_df(result_df, output_path)
-            logger.info(f"[{self.get_plugin_name()}] Result saved to '{output_path}'.")
-        except Exception as e:
-            raise RuntimeError(f"Failed to write output file: {str(e)}")
+        if not written:
+            try:
+                storage_adapter.write_df(result_df, output_path)
+                logger.info(f"[{self.get_plugin_name()}] Result saved to '{output_path}'.")
+            except Exception as e:
+                raise RuntimeError(f"Failed to write output file: {str(e)}")
 
         return self.finalize_container(
             container,
@@ -99,6 +393,6 @@ class DuckDBTransformer(BasePlugin):
                 "input_path": input_path,
                 "query_file": query_path,
                 "table_name": table_name,
-                "rows_output": len(result_df)
+                "rows_output": rows_output
             }
         )
@@ -1,10 +1,18 @@
+import io
 import os
 import json
+import multiprocessing
+import threading
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+import duckdb
 import pandas as pd
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 import pluggy
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, nodes
 
 from core.data_container.container import DataContainer
 from core.infrastructure import storage_adapter
@@ -16,10 +24,166 @@ logger = setup_logger(__name__)
 
 hookimpl = pluggy.HookimplMarker("etl_framework")
 
+_ENVIRONMENTS: Dict[str, Environment] = {}
+_ENVIRONMENTS_LOCK = threading.Lock()
+# テンプレートの構文解析のみに使う (ローダー以外の設定は _new_environment と同じ)
+_PARSE_ENV = Environment(trim_blocks=True, lstrip_blocks=True)
+
+# workers > 1 の場合に1つのワーカーへ渡す最小の行数 (これより少ない入力は並列化しない)
+RENDER_CHUNK_MIN_ROWS = 10_000
+# 描画した行を書き込みへ渡す単位
+LINE_STREAM_BUFFER_SIZE = 1024 * 1024
+# sql_projection の結果を DuckDB から取り出して書き込む単位 (行数)
+PROJECTION_BATCH_ROWS = 100_000
+
+
+def _new_environment(template_dir: str) -> Environment:
+    # バイトコードキャッシュ (一時ディレクトリ) により、別プロセス (workers) でもコンパイルを省略する
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        bytecode_cache=FileSystemBytecodeCache(),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+
+
+@lru_cache(maxsize=256)
+def _substitution_parts(source: str) -> Optional[Tuple[Tuple[bool, str], ...]]:
+    """
+    テンプレートが定数テキストと {{ 変数名 }} (フィルタ・制御構文なし) のみで構成される場合、
+    (変数か, テキストまたは変数名) の組を返す。それ以外は None。
+    """
+    parts: List[Tuple[bool, str]] = []
+    for node in _PARSE_ENV.parse(source).body:
+        if not isinstance(node, nodes.Output):
+            return None
+        for child in node.nodes:
+            if isinstance(child, nodes.TemplateData):
+                parts.append((False, child.data))
+            elif isinstance(child, nodes.Name) and child.ctx == "load":
+                parts.append((True, child.name))
+            else:
+                return None
+    return tuple(parts)
+
+
+def _render_substitution(df: pd.DataFrame, parts: Tuple[Tuple[bool, str], ...]) -> pd.Series:
+    # Jinja2 と同じく各値を str() で文字列化し、行ごとの render を呼ばずに列単位で連結する
+    rendered = pd.Series([""] * len(df), index=df.index, dtype=object)
+    for is_field, value in parts:
+        rendered = rendered + (df[value].map(str) if is_field else value)
+    return rendered
+
+
+def _json_normalizer(fast_json: bool) -> Callable[[str], bytes]:
+    """描画結果を JSON として検証し、1行分の正規化したバイト列を返す関数を返す"""
+    if not fast_json:
+        return lambda text: json.dumps(json.loads(text)).encode("utf-8")
+    # orjson は fast_json を指定した場合のみ必要なため遅延 import する
+    try:
+        import orjson
+    except ImportError:
+        raise ImportError("orjson is required when 'fast_json' is enabled. Please install 'orjson'.")
+    return lambda text: orjson.dumps(orjson.loads(text))
+
+
+def _load_template(template_path: str) -> Tuple[Environment, Template]:
+    template_dir = os.path.dirname(template_path)
+    template_file = os.path.basename(template_path)
+    # Environment はコンパイル済みテンプレートを保持し、ファイルの更新時刻が変わった場合のみ再コンパイルする。
+    # 実行ごとに作り直さないよう、テンプレートのディレクトリごとに再利用する
+    with _ENVIRONMENTS_LOCK:
+        env = _ENVIRONMENTS.get(template_dir)
+        if env is None:
+            env = _new_environment(template_dir)
+            _ENVIRONMENTS[template_dir] = env
+    try:
+        return env, env.get_template(template_file)
+    except Exception as e:
+        raise RuntimeError(f"Failed to load Jinja2 template: {str(e)}")
+
+
+def _render_rows(df: pd.DataFrame, template_path: str, fast_json: bool) -> Iterator[bytes]:
+    template_file = os.path.basename(template_path)
+    env, template = _load_template(template_path)
+    normalize = _json_normalizer(fast_json)
+
+    parts = _substitution_parts(env.loader.get_source(env, template_file)[0])
+    # 参照する変数がすべて (重複のない) 列名の場合のみ列単位で展開する。未定義の変数を含む場合は従来どおり
+    if parts is not None and df.columns.is_unique and all(value in df.columns for is_field, value in parts if is_field):
+        logger.info("Template is plain field substitution. Rendering by column.")
+        rendered_strings = _render_substitution(df, parts).tolist()
+        records = None
+    else:
+        rendered_strings = None
+        # to_dict(orient='records') のように全行分の dict を先に作らず、1行ずつ組み立てる
+        # (itertuples は to_dict と同じく値を Python の型で返す)
+        columns = list(df.columns)
+        records = (dict(zip(columns, row)) for row in df.itertuples(index=False, name=None))
+        # render() は行ごとにグローバル変数と行の dict を結合した新しい dict を作るため、
+        # ChainMap で参照だけを重ね、コンパイル済みの root_render_func を直接呼び出す
+        template_globals = template.globals
+
+    def error_line(record: Dict[str, Any], e: Exception) -> bytes:
+        logger.error(f"Template rendering error for record: {record}. Error: {e}")
+        return json.dumps({"error": str(e), "source_record": record}).encode("utf-8")
+
+    def render_lines() -> Iterator[bytes]:
+        if records is None:
+            for i, rendered_string in enumerate(rendered_strings):
+                try:
+                    yield normalize(rendered_string)
+                except Exception as e:
+                    yield error_line(df.iloc[[i]].to_dict(orient='records')[0], e)
+            return
+        for record in records:
+            try:
+                context = template.new_context(ChainMap(record, template_globals), shared=True)
+                yield normalize(env.concat(template.root_render_func(context)))
+            except Exception as e:
+                yield error_line(record, e)
+
+    return render_lines()
+
+
+class _LineStream(io.RawIOBase):
+    """
+    行 (bytes) のイテレーターを改行区切りで連結した内容として返す読み出し専用ストリーム。
+    描画しながら storage_adapter.write_stream に渡すために使う。
+    """
+
+    def __init__(self, lines: Iterator[bytes]):
+        super().__init__()
+        self._lines = lines
+        self._pending = memoryview(b"")
+        self._started = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._pending:
+            line = next(self._lines, None)
+            if line is None:
+                return 0
+            self._pending = memoryview(b"\n" + line if self._started else line)
+            self._started = True
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+def _render_chunk(df: pd.DataFrame, template_path: str, fast_json: bool) -> bytes:
+    """ワーカープロセスで実行する。分割した行を描画し、改行区切りで連結したバイト列を返す"""
+    return b"\n".join(_render_rows(df, template_path, fast_json))
+
+
 class Jinja2Transformer(BasePlugin):
     """
     (Storage Aware) Transforms rows from a tabular file (local or S3) into a
-    structured text file (local or S3) using a Jinja2 template.
+    structured text file (local or S3) using a Jinja2 template, or a DuckDB
+    projection for templates that only map fields to JSON.
     """
 
     @hookimpl
@@ -42,20 +206,129 @@ class Jinja2Transformer(BasePlugin):
                 "template_path": {
                     "type": "string",
                     "title": "Jinja2 Template Path (local)"
+                },
+                "sql_projection": {
+                    "type": "string",
+                    "title": "SQL Projection (DuckDB)",
+                    "description": (
+                        "(Optional) Used instead of template_path. A DuckDB expression written as one JSON line per row, "
+                        "e.g. {id: 'urn:' || id, name: name}. Evaluated inside DuckDB (table 'source_data') "
+                        "without per-row Python rendering; use a template for control flow."
+                    )
+                },
+                "fast_json": {
+                    "type": "boolean",
+                    "title": "Use orjson",
+                    "description": (
+                        "(Optional) Validate and re-serialize each line with orjson (must be installed). "
+                        "Lines are written compactly with non-ASCII characters as UTF-8."
+                    ),
+                    "default": False
+                },
+                "upload_concurrency": {
+                    "type": "integer",
+                    "title": "Upload Concurrency",
+                    "description": "(Optional) Number of parallel part uploads when the destination is S3.",
+                    "default": 8,
+                    "minimum": 1
+                },
+                "upload_chunksize_mb": {
+                    "type": "integer",
+                    "title": "Upload Part Size (MB)",
+                    "description": "(Optional) Multipart upload part size in MB when the destination is S3.",
+                    "default": 8,
+                    "minimum": 5
+                },
+                "workers": {
+                    "type": "integer",
+                    "title": "Worker Processes",
+                    "description": (
+                        "(Optional) Render template rows in this many processes. "
+                        "Worth it for large inputs with CPU-heavy templates; each worker starts a new Python process."
+                    ),
+                    "default": 1,
+                    "minimum": 1
                 }
             },
-            "required": ["input_path", "output_path", "template_path"]
+            "required": ["input_path", "output_path"]
         }
 
+    def _write_lines(self, lines: Iterator[bytes], output_path: str,
+                     upload_concurrency: int, upload_chunksize: int) -> None:
+        """
+        描画した行を全体を連結せずに書き込む (行区切りは改行、末尾の改行なし)。
+        S3 では描画と並行して、パートごとに並列でマルチパートアップロードする。
+        """
+        stream = io.BufferedReader(_LineStream(lines), buffer_size=LINE_STREAM_BUFFER_SIZE)
+        storage_adapter.write_stream(
+            stream,
+            output_path,
+            max_concurrency=upload_concurrency,
+            multipart_chunksize=upload_chunksize,
+        )
+
+    def _render_template(self, df: pd.DataFrame, template_path: str, fast_json: bool, workers: int) -> Iterator[bytes]:
+        if workers <= 1 or len(df) < 2 * RENDER_CHUNK_MIN_ROWS:
+            return _render_rows(df, template_path, fast_json)
+        # テンプレートの読み込みエラーはワーカーを起動する前に検出する
+        _load_template(template_path)
+        return self._render_parallel(df, template_path, fast_json, workers)
+
+    def _render_parallel(self, df: pd.DataFrame, template_path: str, fast_json: bool, workers: int) -> Iterator[bytes]:
+        """
+        DataFrame を行範囲で分割し、ワーカープロセスで並列に描画する。結果は分割した順に返す。
+        API サーバー等のスレッドを持つプロセスから fork しないよう spawn で起動する。
+        """
+        chunk_rows = max(RENDER_CHUNK_MIN_ROWS, -(-len(df) // (workers * 4)))
+        chunks = (df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows))
+        logger.info(f"[{self.get_plugin_name()}] Rendering {len(df)} rows with {workers} worker processes.")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            for blob in executor.map(_render_chunk, chunks, repeat(template_path), repeat(fast_json)):
+                if blob:
+                    yield blob
+
+    def _project_with_duckdb(self, df: pd.DataFrame, sql_projection: str) -> Iterator[bytes]:
+        """
+        sql_projection を DuckDB の to_json で行ごとの JSON にする。Python で行ごとに描画せず、
+        エンジン内でまとめて評価した結果をバッチ単位で連結して返す。
+        """
+        con = duckdb.connect(database=':memory:')
+        try:
+            con.register("source_data", df)
+            result = con.execute(f"SELECT to_json({sql_projection}) FROM source_data")
+        except Exception as e:
+            con.close()
+            raise RuntimeError(f"Failed to evaluate 'sql_projection': {str(e)}")
+
+        def projected_lines() -> Iterator[bytes]:
+            try:
+                # DuckDB 1.4 以降は to_arrow_reader (fetch_record_batch は非推奨)
+                to_reader = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+                for batch in to_reader(PROJECTION_BATCH_ROWS):
+                    if batch.num_rows:
+                        lines = batch.column(0).to_pylist()
+                        yield "\n".join("null" if line is None else line for line in lines).encode("utf-8")
+            finally:
+                con.close()
+
+        return projected_lines()
+
     def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
         input_path = str(self.params.get("input_path"))
         output_path = str(self.params.get("output_path"))
-        template_path = str(self.params.get("template_path"))
+        template_path = self.params.get("template_path")
+        sql_projection = self.params.get("sql_projection")
+        fast_json = bool(self.params.get("fast_json", False))
+        workers = int(self.params.get("workers", 1))
+        upload_concurrency = int(self.params.get("upload_concurrency", 8))
+        upload_chunksize = int(self.params.get("upload_chunksize_mb", 8)) * 1024 * 1024
 
-        if not all([input_path, output_path, template_path]):
-            raise ValueError("Missing required parameters: 'input_path', 'output_path', 'template_path'.")
+        if not all([input_path, output_path]):
+            raise ValueError("Missing required parameters: 'input_path', 'output_path'.")
+        if bool(template_path) == bool(sql_projection):
+            raise ValueError("Specify exactly one of 'template_path' or 'sql_projection'.")
 
-        if not os.path.exists(template_path):
+        if template_path and not os.path.exists(template_path):
             raise FileNotFoundError(f"Template file not found: {template_path}")
 
         try:
@@ -63,31 +336,14 @@ class Jinja2Transformer(BasePlugin):
         except Exception as e:
             raise RuntimeError(f"Failed to read input file: {str(e)}")
 
-        template_dir = os.path.dirname(template_path)
-        template_file = os.path.basename(template_path)
-        env = Environment(loader=FileSystemLoader(template_dir), trim_blocks=True, lstrip_blocks=True)
-
-        try:
-            template = env.get_template(template_file)
-        except Exception as e:
-            raise RuntimeError(f"Failed to load Jinja2 template: {str(e)}")
-
-        records = df.to_dict(orient='records')
-        output_lines = []
-
-        for record in records:
-            try:
-                rendered_string = template.render(record)
-                json_object = json.loads(rendered_string)
-                output_lines.append(json.dumps(json_object))
-            except Exception as e:
-                logger.error(f"Template rendering error for record: {record}. Error: {e}")
-                output_lines.append(json.dumps({"error": str(e), "source_record": record}))
-
-        full_output_text = "\n".join(output_lines)
+        if sql_projection:
+            logger.info(f"[{self.get_plugin_name()}] Rendering rows with DuckDB projection: {sql_projection}")
+            lines = self._project_with_duckdb(df, str(sql_projection))
+        else:
+            lines = self._render_template(df, str(template_path), fast_json, workers)
 
         try:
-            storage_adapter.write_text(full_output_text, output_path)
+            self._write_lines(lines, output_path, upload_concurrency, upload_chunksize)
         except Exception as e:
             raise RuntimeError(f"Failed to write output file: {str(e)}")
 
@@ -97,6 +353,7 @@ class Jinja2Transformer(BasePlugin):
             metadata={
                 "input_path": input_path,
                 "template_path": template_path,
-                "records_processed": len(records)
+                "sql_projection": sql_projection,
+                "records_processed": len(df)
             }
         )
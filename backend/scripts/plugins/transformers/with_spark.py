@@ -1,9 +1,12 @@
+import logging
 import os
+import uuid
 import pandas as pd
 from typing import Dict, Any, TYPE_CHECKING
 import pluggy
 
 from core.data_container.container import DataContainer
+from core.data_container.formats import SupportedFormats
 from core.infrastructure.storage_adapter import storage_adapter
 from core.infrastructure.spark_session_factory import SparkSessionFactory
 from core.plugin_manager.base_plugin import BasePlugin
@@ -48,6 +51,28 @@ class SparkTransformer(BasePlugin):
     def _get_query(self, path: str) -> str:
         return storage_adapter.read_text(path)
 
+    def _load_input(self, spark, input_path: str, input_encoding: str) -> "SparkDataFrame":
+        """
+        Spark のリーダーで入力を直接読み込む (ドライバーで pandas に読み込んで転送しない)。
+        Spark が読めない形式 (Excel) とパス (Glue 外の s3://、http(s)://、メモリ上のファイル) のみ
+        pandas 経由で読み込む。
+        """
+        file_format = SupportedFormats.from_path(input_path)
+        if file_format == SupportedFormats.CSV:
+            read_options = {"header": "true", "inferSchema": "true", "encoding": input_encoding}
+        elif file_format == SupportedFormats.JSON:
+            # JSON はレコードの配列として書かれるため、複数行にまたがる1つの値として読む
+            read_options = {"multiLine": "true"}
+        elif file_format in (SupportedFormats.PARQUET, SupportedFormats.JSONL):
+            read_options = {}
+        else:
+            read_options = None
+
+        if read_options is None or not SparkSessionFactory.can_read_natively(input_path):
+            pandas_df = storage_adapter.read_df(input_path, read_options={"encoding": input_encoding})
+            return spark.createDataFrame(pandas_df)
+        return storage_adapter.read_df(input_path, read_options={"spark": spark, **read_options})
+
     def run(self, input_data: DataContainer, container: DataContainer) -> DataContainer:
         input_path = self.params["input_path"]
         input_encoding = self.params.get("input_encoding", "utf-8")
@@ -55,35 +80,50 @@ class SparkTransformer(BasePlugin):
         query_file = self.params["query_file"]
         table_name = self.params.get("table_name", "source_data")
         use_spark_write = self.params.get("large_dataset", False)
+        spark = None
 
         try:
             sql_query = self._get_query(query_file)
             logger.info(f"Loading input from: {input_path}")
             logger.info(f"Will write output to: {output_path}")
 
-            spark = SparkSessionFactory.get_spark_session()
+            # JVM の起動を実行ごとに繰り返さないよう、共有の SparkSession は停止せずに再利用する。
+            # newSession() は SparkContext を共有しつつ一時ビューと SQL 設定を実行ごとに分離する
+            spark = SparkSessionFactory.get_spark_session().newSession()
+            spark.sparkContext.setJobGroup(
+                f"{self.get_plugin_name()}-{uuid.uuid4().hex}", f"{self.get_plugin_name()}: {query_file}"
+            )
 
-            pandas_df = storage_adapter.read_df(input_path, read_options={"encoding": input_encoding})
-            spark_df = spark.createDataFrame(pandas_df)
+            # toPandas() を Arrow 経由で行う (行ごとの Py4J 変換を避ける)
+            spark.conf.set("spark.sql.execution.arrow.pyspark.enabled", "true")
+
+            spark_df = self._load_input(spark, input_path, input_encoding)
             spark_df.createOrReplaceTempView(table_name)
-            logger.info(f"Registered table '{table_name}' with {spark_df.count()} rows.")
+            # 件数のためだけに入力全体を読み直さないよう、ここでは count() しない
+            logger.info(f"Registered table '{table_name}'.")
 
             result_df = spark.sql(sql_query)
-            logger.info(f"SQL executed. Result has {result_df.count()} rows.")
+            rows_output = None
 
             if use_spark_write:
+                # count() はクエリ全体をもう一度実行するため、DEBUG ログが有効な場合のみ行う
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"SQL executed. Result has {result_df.count()} rows.")
                 logger.info("Using Spark native writer (large dataset mode).")
                 storage_adapter.write_df(result_df, output_path, write_options={"spark": spark})
             else:
                 logger.info("Using StorageAdapter via pandas DataFrame (small/medium dataset).")
                 pandas_result = result_df.toPandas()
+                rows_output = len(pandas_result)
+                logger.info(f"SQL executed. Result has {rows_output} rows.")
                 storage_adapter.write_df(pandas_result, output_path)
 
         except Exception as e:
             raise RuntimeError(f"Error during Spark transformation: {e}")
         finally:
-            SparkSessionFactory.stop_spark_session()
-            logger.info("Spark session stopped if running locally.")
+            if spark is not None:
+                # 入力を保持している一時ビューを解放する (セッション自体は次の実行で再利用する)
+                spark.catalog.dropTempView(table_name)
 
         return self.finalize_container(
             container,
@@ -92,6 +132,7 @@ class SparkTransformer(BasePlugin):
                 "input_path": input_path,
                 "query_file": query_file,
                 "table_name": table_name,
-                "used_spark_write": use_spark_write
+                "used_spark_write": use_spark_write,
+                "rows_output": rows_output
             }
         )
@@ -1,6 +1,12 @@
 from .logger import AppLogger, setup_logger
+from .dns_cache import resolve_host_addresses, connect_any, clear_dns_cache
+from .prefetch_reader import PrefetchReader
 
 __all__ = [
     'AppLogger',
     'setup_logger',
-]
\ No newline at end of file
+    'resolve_host_addresses',
+    'connect_any',
+    'clear_dns_cache',
+    'PrefetchReader',
+]
@@ -0,0 +1,57 @@
+import socket
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+# 同一ホストへの接続を繰り返すパイプラインで getaddrinfo を毎回発行しないよう、
+# 解決結果をプロセス内で保持する。DNS の変更に追従できるよう TTL を設ける。
+DNS_CACHE_TTL_SECONDS = 300.0
+
+_cache: Dict[str, Tuple[Tuple[str, ...], float]] = {}
+_lock = threading.Lock()
+
+T = TypeVar("T")
+
+
+def resolve_host_addresses(host: str) -> Tuple[str, ...]:
+    """
+    host を解決したアドレスの一覧 (getaddrinfo の順、重複なし) を返し、TTL の間キャッシュする。
+    解決に失敗した場合は (host,) を返し (キャッシュしない)、
+    エラーの報告は接続を行うライブラリ側に委ねる。
+    """
+    now = time.monotonic()
+    with _lock:
+        cached = _cache.get(host)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    try:
+        infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        return (host,)
+    addresses = tuple(dict.fromkeys(info[4][0] for info in infos))
+
+    with _lock:
+        _cache[host] = (addresses, now + DNS_CACHE_TTL_SECONDS)
+    return addresses
+
+
+def connect_any(host: str, connect: Callable[[str], T]) -> T:
+    """
+    キャッシュしたアドレスを順に connect に渡し、最初に接続できた結果を返す。
+    デュアルスタック環境で先頭のアドレス (IPv6 等) に到達できない場合も、
+    socket.create_connection と同様に残りのアドレスで接続を試みる。
+    すべて失敗した場合は最後の OSError を送出する。
+    """
+    last_error: Optional[OSError] = None
+    for address in resolve_host_addresses(host):
+        try:
+            return connect(address)
+        except OSError as e:
+            last_error = e
+    raise last_error
+
+
+def clear_dns_cache() -> None:
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,89 @@
+import io
+import queue
+import threading
+
+# 先読みの既定値。1MB を最大 8 ブロック (8MB) まで読み進めておく。
+PREFETCH_BLOCK_SIZE = 1024 * 1024
+PREFETCH_MAX_BLOCKS = 8
+
+# キューが満杯の間、close の要求を確認する間隔 (秒)
+_PUT_POLL_INTERVAL = 0.1
+
+
+class PrefetchReader(io.RawIOBase):
+    """
+    source をバックグラウンドスレッドで block_size ずつ読み、上限付きキューに積んでおく
+    読み出し専用のストリーム。入力の読み出し (ディスク/S3) と呼び出し側の送信を
+    別スレッドで並行させる。読み出し中の例外は read 側で送出される。
+    close すると読み出しスレッドを止め、source も閉じる。
+    """
+
+    def __init__(self, source, block_size: int = PREFETCH_BLOCK_SIZE,
+                 max_blocks: int = PREFETCH_MAX_BLOCKS):
+        super().__init__()
+        self._source = source
+        self._block_size = block_size
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_blocks)
+        self._stop = threading.Event()
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._fill, name="prefetch-reader", daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_PUT_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self) -> None:
+        try:
+            while not self._stop.is_set():
+                block = self._source.read(self._block_size)
+                # 空のブロックが終端の目印になる
+                if not self._put(block) or not block:
+                    return
+        except Exception as e:
+            self._put(e)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if not self._pending:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._pending = memoryview(item)
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._stop.set()
+        # 満杯のキューで待っている読み出しスレッドを解放する
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join()
+        self._pending = memoryview(b"")
+        try:
+            self._source.close()
+        finally:
+            super().close()
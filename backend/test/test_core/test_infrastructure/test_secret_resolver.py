@@ -423,6 +423,60 @@ class TestAWSSecretResolverRead:
         r._decrypt_with_kms.assert_called_once()
 
 
+# ======================================================================
+# AWSSecretResolver.read (読み出しキャッシュ)
+# MCDC: 条件 キャッシュ有効 / 値が None
+# ======================================================================
+class TestAWSSecretResolverReadCache:
+
+    @pytest.fixture
+    def r(self):
+        return _make_aws_resolver()
+
+    def test_cache_hit_skips_backend(self, r):
+        """キャッシュ有効 → 2回目はバックエンドを呼ばない"""
+        r._read_from_secretsmanager = Mock(return_value="val")
+        assert r.read("aws_secretsmanager://s") == "val"
+        assert r.read("aws_secretsmanager://s") == "val"
+        r._read_from_secretsmanager.assert_called_once()
+
+    def test_different_references_cached_separately(self, r):
+        r._read_from_secretsmanager = Mock(side_effect=["user", "pass"])
+        assert r.read("aws_secretsmanager://s@user") == "user"
+        assert r.read("aws_secretsmanager://s@pass") == "pass"
+        assert r.read("aws_secretsmanager://s@user") == "user"
+        assert r._read_from_secretsmanager.call_count == 2
+
+    def test_none_is_not_cached(self, r):
+        """値が None → 保持せず次回も問い合わせる"""
+        r._read_from_secretsmanager = Mock(side_effect=[None, "val"])
+        assert r.read("aws_secretsmanager://s") is None
+        assert r.read("aws_secretsmanager://s") == "val"
+        assert r._read_from_secretsmanager.call_count == 2
+
+    def test_expired_entry_is_refreshed(self, r):
+        """キャッシュ期限切れ → 再度問い合わせる"""
+        r._read_from_secretsmanager = Mock(side_effect=["old", "new"])
+        with patch("core.infrastructure.secret_resolver.time.monotonic", return_value=1000.0):
+            assert r.read("aws_secretsmanager://s") == "old"
+        expired = 1000.0 + r._READ_CACHE_TTL_SECONDS + 1
+        with patch("core.infrastructure.secret_resolver.time.monotonic", return_value=expired):
+            assert r.read("aws_secretsmanager://s") == "new"
+
+    def test_write_invalidates_cache(self, r):
+        r._read_from_secretsmanager = Mock(side_effect=["old", "new"])
+        r._write_to_secretsmanager = Mock()
+        assert r.read("aws_secretsmanager://s@a") == "old"
+        r.write("aws_secretsmanager://s@b", "x")
+        assert r.read("aws_secretsmanager://s@a") == "new"
+
+    def test_cache_is_bounded(self, r):
+        r._read_from_parameterstore = Mock(side_effect=lambda ref: ref)
+        for i in range(r._READ_CACHE_MAX_ENTRIES + 1):
+            r.read(f"aws_parameterstore://p{i}")
+        assert len(r._read_cache) <= r._READ_CACHE_MAX_ENTRIES
+
+
 # ======================================================================
 # AWSSecretResolver._read_from_secretsmanager
 # MCDC: 条件O/P/Q
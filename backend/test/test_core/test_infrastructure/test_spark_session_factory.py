@@ -14,9 +14,13 @@ class TestSparkSessionFactory:
         """各テスト前後にファクトリ状態をリセットする"""
         SparkSessionFactory._spark_session = None
         SparkSessionFactory._glue_context = None
-        yield
+        SparkSessionFactory._atexit_registered = False
+        with patch("core.infrastructure.spark_session_factory.atexit.register") as mock_register:
+            self.mock_atexit_register = mock_register
+            yield
         SparkSessionFactory._spark_session = None
         SparkSessionFactory._glue_context = None
+        SparkSessionFactory._atexit_registered = False
 
     @pytest.fixture
     def mock_awsglue_module(self):
@@ -209,6 +213,69 @@ class TestSparkSessionFactory:
             "double-checked locking が機能していない可能性がある。"
         )
 
+    # =========================================================
+    # プロセス終了時の停止 (atexit)
+    # MCDC:
+    #   条件J: is_running_on_aws()
+    #   条件K: atexit 登録済みか
+    # =========================================================
+
+    @patch("core.infrastructure.spark_session_factory.is_running_on_aws")
+    @patch("pyspark.sql.SparkSession")
+    @patch("pyspark.SparkConf")
+    def test_local_session_registers_atexit_stop_once(
+        self, mock_conf_cls, mock_session_cls, mock_is_aws, clean_env
+    ):
+        """条件J=False, K=False→True: 初回のみ stop_spark_session を atexit に登録する
+        (stop 後の再初期化でも重複登録しない)"""
+        mock_is_aws.return_value = False
+        _make_local_mocks(mock_conf_cls, mock_session_cls)
+
+        SparkSessionFactory.get_spark_session()
+        SparkSessionFactory.stop_spark_session()
+        SparkSessionFactory.get_spark_session()
+
+        self.mock_atexit_register.assert_called_once_with(SparkSessionFactory.stop_spark_session)
+
+    @patch("core.infrastructure.spark_session_factory.is_running_on_aws")
+    def test_aws_session_does_not_register_atexit(self, mock_is_aws, mock_awsglue_module):
+        """条件J=True: Glue のセッションは Glue が管理するため登録しない"""
+        mock_is_aws.return_value = True
+        with patch("pyspark.context.SparkContext"):
+            SparkSessionFactory.get_spark_session()
+
+        self.mock_atexit_register.assert_not_called()
+
+    # =========================================================
+    # can_read_natively
+    # MCDC:
+    #   条件L: is_local_path(path)
+    #   条件M: スキームが s3
+    #   条件N: is_running_on_aws()
+    # =========================================================
+
+    @pytest.mark.parametrize("path", ["/data/input.csv", "file:///data/input.csv", "C:/data/input.csv"])
+    @patch("core.infrastructure.spark_session_factory.is_running_on_aws", return_value=False)
+    def test_can_read_natively_local_path(self, mock_is_aws, path):
+        """条件L=True: ローカルパスは環境に関わらず Spark で直接読む"""
+        assert SparkSessionFactory.can_read_natively(path) is True
+
+    @patch("core.infrastructure.spark_session_factory.is_running_on_aws", return_value=False)
+    def test_can_read_natively_s3_on_local_falls_back(self, mock_is_aws):
+        """条件L=False, M=True, N=False: ローカルのセッションは S3A 未設定のため pandas 経由にする"""
+        assert SparkSessionFactory.can_read_natively("s3://bucket/input.csv") is False
+
+    @patch("core.infrastructure.spark_session_factory.is_running_on_aws", return_value=True)
+    def test_can_read_natively_s3_on_aws(self, mock_is_aws):
+        """条件L=False, M=True, N=True: Glue 上では s3:// を Spark で直接読む"""
+        assert SparkSessionFactory.can_read_natively("s3://bucket/input.csv") is True
+
+    @pytest.mark.parametrize("path", ["https://example.com/input.csv", "memory://input.csv"])
+    @patch("core.infrastructure.spark_session_factory.is_running_on_aws", return_value=True)
+    def test_can_read_natively_other_scheme_falls_back(self, mock_is_aws, path):
+        """条件L=False, M=False: http(s) やメモリ上のファイルは AWS 上でも pandas 経由にする"""
+        assert SparkSessionFactory.can_read_natively(path) is False
+
     # =========================================================
     # 環境変数の setdefault 動作確認
     # MCDC:
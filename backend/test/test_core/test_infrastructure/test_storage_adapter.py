@@ -1,6 +1,10 @@
+import errno
+import io
 import os
 import pytest
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, call
@@ -129,6 +133,105 @@ class TestStorageAdapter:
             sa.read_df(str(tmp_path / "nonexistent.csv"))
         assert "Failed to read file" in caplog.text
 
+    # =========================================================
+    # read_arrow
+    # MCDC:
+    #   条件A: file_format (CSV/PARQUET/JSONL/other)
+    #   条件B(PARQUET): is_local_path(path)
+    #   条件C(JSONL): encoding が UTF-8 か
+    # =========================================================
+
+    @pytest.mark.parametrize("fmt", ["csv", "parquet", "jsonl"])
+    def test_read_arrow_local(self, sa, tmp_path, sample_df, fmt):
+        """A=各フォーマット × B=True: pandas と同じ内容の Arrow テーブルを返す"""
+        file_path = tmp_path / f"test.{fmt}"
+        sa.write_df(sample_df, str(file_path))
+        table = sa.read_arrow(str(file_path))
+        assert table.to_pydict() == {"col1": [1, 2], "col2": ["a", "b"]}
+
+    def test_read_arrow_csv_with_encoding(self, sa, tmp_path):
+        """A=CSV: encoding を指定して読み込める"""
+        file_path = tmp_path / "test.csv"
+        file_path.write_bytes("名前,n\n太郎,1\n".encode("cp932"))
+        table = sa.read_arrow(str(file_path), encoding="cp932")
+        assert table.to_pydict() == {"名前": ["太郎"], "n": [1]}
+
+    def test_read_arrow_parquet_remote_reads_bytes(self, sa, tmp_path, sample_df):
+        """A=PARQUET × B=False: ローカル以外は read_bytes の内容から読む"""
+        sa.write_df(sample_df, "memory://read_arrow/test.parquet")
+        table = sa.read_arrow("memory://read_arrow/test.parquet")
+        assert table.num_rows == 2
+
+    def test_read_arrow_jsonl_non_utf8_raises(self, sa, tmp_path, sample_df):
+        """A=JSONL × C=False → ValueError"""
+        file_path = tmp_path / "test.jsonl"
+        sa.write_df(sample_df, str(file_path))
+        with pytest.raises(ValueError, match="UTF-8"):
+            sa.read_arrow(str(file_path), encoding="cp932")
+
+    def test_read_arrow_unsupported_format_raises(self, sa, tmp_path, sample_df):
+        """A=other → ValueError"""
+        file_path = tmp_path / "test.json"
+        sa.write_df(sample_df, str(file_path))
+        with pytest.raises(ValueError, match="not supported"):
+            sa.read_arrow(str(file_path))
+
+    # =========================================================
+    # write_arrow
+    # MCDC:
+    #   条件A: data が pa.Table か (それ以外は RecordBatchReader)
+    #   条件B: file_format (CSV/PARQUET/other)
+    #   条件C: 書き込み中に例外が発生するか
+    #   条件D(C=True): 出力が discard を持つか (s3fs)
+    # =========================================================
+
+    @pytest.mark.parametrize("fmt", ["csv", "parquet"])
+    def test_write_arrow_table_roundtrip(self, sa, tmp_path, sample_df, fmt):
+        """A=True × B=各フォーマット × C=False: read_df で同じ内容を読める"""
+        file_path = tmp_path / "sub" / f"test.{fmt}"
+        rows = sa.write_arrow(pa.Table.from_pandas(sample_df, preserve_index=False), str(file_path))
+        assert rows == 2
+        pd.testing.assert_frame_equal(sa.read_df(str(file_path)), sample_df)
+
+    def test_write_arrow_reader_with_compression(self, sa, sample_df):
+        """A=False × B=PARQUET: Reader のバッチを順に書き、compression を適用する"""
+        table = pa.Table.from_pandas(sample_df, preserve_index=False)
+        reader = pa.RecordBatchReader.from_batches(table.schema, table.to_batches(max_chunksize=1))
+        rows = sa.write_arrow(reader, "memory://write_arrow/test.parquet", compression="zstd")
+        assert rows == 2
+        data = sa.read_bytes("memory://write_arrow/test.parquet")
+        assert pq.ParquetFile(pa.BufferReader(data)).metadata.row_group(0).column(0).compression == "ZSTD"
+
+    def test_write_arrow_unsupported_format_raises(self, sa, tmp_path, sample_df):
+        """B=other → ValueError (ファイルは作成しない)"""
+        file_path = tmp_path / "test.json"
+        with pytest.raises(ValueError, match="not supported"):
+            sa.write_arrow(pa.Table.from_pandas(sample_df), str(file_path))
+        assert not file_path.exists()
+
+    def test_write_arrow_error_discards_sink(self, sa, sample_df):
+        """C=True × D=True: 途中で失敗した場合は出力を破棄し、close せずに元の例外を再送出する"""
+        sink = MagicMock()
+        # s3fs と同様、discard 後の close は失敗する
+        sink.close.side_effect = AttributeError("'NoneType' object has no attribute 'tell'")
+        table = pa.Table.from_pandas(sample_df, preserve_index=False)
+        with patch.object(sa, "open_write_stream", return_value=sink), \
+             patch("core.infrastructure.storage_adapter.pa_csv.CSVWriter", side_effect=OSError("disk full")):
+            with pytest.raises(OSError, match="disk full"):
+                sa.write_arrow(table, "s3://bucket/test.csv")
+        sink.discard.assert_called_once()
+        sink.close.assert_not_called()
+
+    def test_write_arrow_error_closes_sink_without_discard(self, sa, sample_df):
+        """C=True × D=False: discard を持たない出力 (ローカルファイル等) は close してから例外を再送出する"""
+        sink = MagicMock(spec=["write", "close"])
+        table = pa.Table.from_pandas(sample_df, preserve_index=False)
+        with patch.object(sa, "open_write_stream", return_value=sink), \
+             patch("core.infrastructure.storage_adapter.pa_csv.CSVWriter", side_effect=OSError("disk full")):
+            with pytest.raises(OSError, match="disk full"):
+                sa.write_arrow(table, "/tmp/test.csv")
+        sink.close.assert_called_once()
+
     # =========================================================
     # write_df
     # MCDC:
@@ -146,6 +249,18 @@ class TestStorageAdapter:
         sa.write_df(sample_df, str(file_path))
         assert file_path.exists()
 
+    def test_write_df_parquet_defaults_to_zstd(self, sa, tmp_path, sample_df):
+        """A=False × E=PARQUET: compression 未指定の場合は ZSTD で圧縮する"""
+        file_path = tmp_path / "test.parquet"
+        sa.write_df(sample_df, str(file_path))
+        assert pq.ParquetFile(str(file_path)).metadata.row_group(0).column(0).compression == "ZSTD"
+
+    def test_write_df_parquet_explicit_compression(self, sa, sample_df):
+        """A=False × E=PARQUET: write_options の compression を優先する (メモリ上でも同じ)"""
+        sa.write_df(sample_df, "memory://write_df/test.parquet", write_options={"compression": "snappy"})
+        data = sa.read_bytes("memory://write_df/test.parquet")
+        assert pq.ParquetFile(pa.BufferReader(data)).metadata.row_group(0).column(0).compression == "SNAPPY"
+
     def test_write_df_excel(self, sa, tmp_path, sample_df):
         """A=False × C=False × E=EXCEL"""
         file_path = tmp_path / "test.xlsx"
@@ -363,6 +478,23 @@ class TestStorageAdapter:
             mock_s3.open.return_value.__enter__.return_value.read.return_value = b"\x00\x01"
             assert sa.read_bytes("s3://bucket/file.bin") == b"\x00\x01"
 
+    @patch("boto3.client")
+    def test_read_bytes_s3_with_transfer_options(self, mock_boto3, sa):
+        """A=True: 転送オプション指定時は download_fileobj で並列に取得する"""
+        def download(bucket, key, fileobj, Config):
+            fileobj.seek(2)
+            fileobj.write(b"\x02")
+            fileobj.seek(0)
+            fileobj.write(b"\x00\x01")
+
+        mock_boto3.return_value.download_fileobj.side_effect = download
+        data = sa.read_bytes("s3://bucket/dir/file.bin", max_concurrency=8, multipart_chunksize=16 * 1024 * 1024)
+        assert data == b"\x00\x01\x02"
+        args, kwargs = mock_boto3.return_value.download_fileobj.call_args
+        assert args[:2] == ("bucket", "dir/file.bin")
+        assert kwargs["Config"].max_concurrency == 8
+        assert kwargs["Config"].multipart_chunksize == 16 * 1024 * 1024
+
     def test_read_bytes_error_is_logged(self, sa, tmp_path, caplog):
         """例外時にエラーログが出力される"""
         with pytest.raises(Exception):
@@ -414,6 +546,181 @@ class TestStorageAdapter:
         sa.write_bytes(b"", str(file_path))
         assert sa.get_size(str(file_path)) == 0
 
+    # =========================================================
+    # open_stream
+    # MCDC:
+    #   条件A: スキーム (local / s3 / memory / http)
+    # =========================================================
+
+    def test_open_stream_local(self, sa, tmp_path):
+        """A=local: ファイルを逐次読み込み可能なオブジェクトとして開く"""
+        file_path = tmp_path / "data.bin"
+        file_path.write_bytes(b"\x00\x01\x02")
+        with sa.open_stream(str(file_path)) as stream:
+            assert stream.read(2) == b"\x00\x01"
+            assert stream.read() == b"\x02"
+
+    def test_open_stream_local_not_found(self, sa, tmp_path):
+        """A=local: 存在しないファイルは FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            sa.open_stream(str(tmp_path / "missing.bin"))
+
+    @patch("boto3.client")
+    def test_open_stream_s3_returns_streaming_body(self, mock_boto3, sa):
+        """A=s3: get_object の Body をそのまま返す"""
+        body = io.BytesIO(b"\x00")
+        mock_boto3.return_value.get_object.return_value = {"Body": body}
+        assert sa.open_stream("s3://bucket/key/file.bin") is body
+        mock_boto3.return_value.get_object.assert_called_once_with(
+            Bucket="bucket", Key="key/file.bin"
+        )
+
+    def test_open_stream_memory(self, sa):
+        """A=memory: 既定実装 (read_bytes のラップ) で読み込む"""
+        sa.write_bytes(b"\x00\x01", "memory://stream/file.bin")
+        with sa.open_stream("memory://stream/file.bin") as stream:
+            assert stream.read() == b"\x00\x01"
+
+    @patch("requests.get")
+    def test_open_stream_http(self, mock_get, sa):
+        """A=http: stream=True で取得し raw を返す"""
+        response = MagicMock()
+        mock_get.return_value = response
+
+        assert sa.open_stream("https://example.test/file.bin") is response.raw
+        mock_get.assert_called_once_with(
+            "https://example.test/file.bin", timeout=60, stream=True
+        )
+        response.raise_for_status.assert_called_once_with()
+        assert response.raw.decode_content is True
+
+    # =========================================================
+    # open_write_stream
+    # MCDC:
+    #   条件A: スキーム (local / s3 / memory)
+    #   条件B(local): bool(parent)  → makedirs 空文字ガード
+    # =========================================================
+
+    def test_open_write_stream_local_creates_parent(self, sa, tmp_path):
+        """A=local × B=True: 親ディレクトリを自動生成し、書き込んだ内容がファイルになる"""
+        file_path = tmp_path / "nested" / "out.bin"
+        with sa.open_write_stream(str(file_path)) as stream:
+            stream.write(b"\x00\x01")
+            stream.write(b"\x02")
+        assert file_path.read_bytes() == b"\x00\x01\x02"
+
+    def test_open_write_stream_local_parent_empty_skips_makedirs(self, sa):
+        """A=local × B=False(parent空): makedirs がスキップされる"""
+        with patch("os.path.dirname", return_value=""), \
+             patch("os.makedirs") as mock_makedirs, \
+             patch("builtins.open", MagicMock()) as mock_open:
+            sa.open_write_stream("/out.bin")
+            mock_makedirs.assert_not_called()
+            mock_open.assert_called_once_with("/out.bin", "wb")
+
+    def test_open_write_stream_s3_uses_s3fs(self, sa):
+        """A=s3: s3fs のファイルを 'wb' で開いて返す"""
+        mock_fs = MagicMock()
+        with patch("s3fs.S3FileSystem", return_value=mock_fs):
+            stream = sa.open_write_stream("s3://bucket/dir/out.bin")
+        mock_fs.open.assert_called_once_with("s3://bucket/dir/out.bin", "wb")
+        assert stream is mock_fs.open.return_value
+
+    def test_open_write_stream_memory_writes_on_close(self, sa):
+        """A=memory: 既定実装は close 時に write_bytes で保存する"""
+        path = "memory://write_stream/out.bin"
+        stream = sa.open_write_stream(path)
+        stream.write(b"\x00\x01")
+        assert not sa.exists(path)
+        stream.close()
+        stream.close()
+        assert sa.read_bytes(path) == b"\x00\x01"
+
+    # =========================================================
+    # write_stream
+    # MCDC:
+    #   条件A: backend (local / s3 / memory)
+    #   条件C(local): readinto の有無
+    #   条件B(local): bool(parent)  → makedirs 空文字ガード
+    # =========================================================
+
+    def test_write_stream_local_creates_parent(self, sa, tmp_path):
+        """A=local × B=True: 親ディレクトリを自動生成し内容を書き込む"""
+        file_path = tmp_path / "nested" / "dir" / "test.bin"
+        data = os.urandom(3 * 1024 * 1024 + 7)
+        sa.write_stream(io.BytesIO(data), str(file_path))
+        assert file_path.read_bytes() == data
+
+    def test_write_stream_local_without_readinto(self, sa, tmp_path):
+        """A=local: readinto を持たないストリームは read() でコピーされる"""
+        class ReadOnlyStream:
+            def __init__(self, data):
+                self._buf = io.BytesIO(data)
+
+            def read(self, size=-1):
+                return self._buf.read(size)
+
+        file_path = tmp_path / "test.bin"
+        data = os.urandom(2 * 1024 * 1024 + 3)
+        sa.write_stream(ReadOnlyStream(data), str(file_path))
+        assert file_path.read_bytes() == data
+
+    def test_write_stream_local_parent_empty_skips_makedirs(self, sa):
+        """A=local × B=False(parent空): makedirs がスキップされる"""
+        with patch("os.path.dirname", return_value=""), \
+             patch("os.makedirs") as mock_makedirs, \
+             patch("builtins.open", MagicMock()):
+            sa.write_stream(io.BytesIO(b"\x00"), "/test.bin")
+            mock_makedirs.assert_not_called()
+
+    @patch("boto3.client")
+    def test_write_stream_s3_uses_upload_fileobj(self, mock_boto3, sa):
+        """A=s3: upload_fileobj にストリームがそのまま渡される"""
+        stream = io.BytesIO(b"\x00\x01")
+        sa.write_stream(stream, "s3://bucket/dir/file.bin")
+        args = mock_boto3.return_value.upload_fileobj.call_args[0]
+        assert args[0] is stream
+        assert args[1] == "bucket"
+        assert args[2] == "dir/file.bin"
+
+    @patch("boto3.client")
+    def test_write_stream_s3_default_transfer_config(self, mock_boto3, sa):
+        """A=s3: 転送オプション未指定時は Config=None (boto3 既定値)"""
+        sa.write_stream(io.BytesIO(b"\x00"), "s3://bucket/file.bin")
+        assert mock_boto3.return_value.upload_fileobj.call_args[1]["Config"] is None
+
+    @patch("boto3.client")
+    def test_write_stream_s3_with_transfer_options(self, mock_boto3, sa):
+        """A=s3: max_concurrency / multipart_chunksize が TransferConfig に渡される"""
+        sa.write_stream(
+            io.BytesIO(b"\x00"),
+            "s3://bucket/file.bin",
+            max_concurrency=4,
+            multipart_chunksize=16 * 1024 * 1024,
+        )
+        config = mock_boto3.return_value.upload_fileobj.call_args[1]["Config"]
+        assert config.max_concurrency == 4
+        assert config.multipart_chunksize == 16 * 1024 * 1024
+        assert config.use_threads is True
+
+    @patch("boto3.client")
+    @pytest.mark.parametrize("max_concurrency, expected", [(4, 8), (8, 10), (32, 10)])
+    def test_write_stream_s3_bounds_read_ahead_parts(self, mock_boto3, sa, max_concurrency, expected):
+        """A=s3: 先読みパート数は並列数の2倍に制限され、boto3 の既定値 (10) を超えない"""
+        sa.write_stream(io.BytesIO(b"\x00"), "s3://bucket/file.bin", max_concurrency=max_concurrency)
+        config = mock_boto3.return_value.upload_fileobj.call_args[1]["Config"]
+        assert config.max_in_memory_upload_chunks == expected
+
+    def test_write_stream_memory(self, sa):
+        """A=memory: 既定実装で write_bytes に委譲される"""
+        sa.write_stream(io.BytesIO(b"abc"), "memory://run/file.bin")
+        assert sa.read_bytes("memory://run/file.bin") == b"abc"
+
+    def test_write_stream_http_is_rejected_as_read_only(self, sa):
+        """HTTPパスへの書き込みは拒否される"""
+        with pytest.raises(ValueError, match="read-only"):
+            sa.write_stream(io.BytesIO(b"abc"), "https://example.test/file.bin")
+
     # =========================================================
     # download_remote_file
     # MCDC:
@@ -552,6 +859,29 @@ class TestStorageAdapter:
         assert args[2].endswith("myfile.txt")
         assert args[2] != "myfile.txt"  # prefixが付いている
 
+    @patch("boto3.client")
+    def test_upload_to_s3_with_transfer_options(self, mock_boto3, sa, tmp_path):
+        """A=True: max_concurrency / multipart_chunksize が TransferConfig に渡される"""
+        src = tmp_path / "file.txt"
+        src.write_text("content")
+        sa.upload_local_file(
+            str(src),
+            "s3://bucket/uploaded.txt",
+            max_concurrency=8,
+            multipart_chunksize=8 * 1024 * 1024,
+        )
+        config = mock_boto3.return_value.upload_file.call_args[1]["Config"]
+        assert config.max_concurrency == 8
+        assert config.multipart_chunksize == 8 * 1024 * 1024
+
+    @patch("boto3.client")
+    def test_upload_to_s3_without_transfer_options(self, mock_boto3, sa, tmp_path):
+        """A=True: 転送オプション未指定時は Config=None (boto3 既定値)"""
+        src = tmp_path / "file.txt"
+        src.write_text("content")
+        sa.upload_local_file(str(src), "s3://bucket/uploaded.txt")
+        assert mock_boto3.return_value.upload_file.call_args[1]["Config"] is None
+
     def test_upload_to_http_is_rejected_as_read_only(self, sa, tmp_path):
         """HTTPアップロードをS3へ誤ルーティングせず明示的に拒否する"""
         src = tmp_path / "file.txt"
@@ -936,6 +1266,26 @@ class TestStorageAdapter:
         sa.copy_file_raw(str(src), str(dst))
         assert sa.read_bytes(str(dst)) == b"\x00\x01\x02"
 
+    def test_copy_file_raw_local_creates_parent(self, sa, tmp_path):
+        """ローカル同士: copyfile でコピーし、親ディレクトリを作成する"""
+        src = tmp_path / "src.bin"
+        dst = tmp_path / "sub" / "dst.bin"
+        src.write_bytes(b"\x00\x01")
+        with patch.object(sa, "read_bytes") as mock_read:
+            sa.copy_file_raw(str(src), str(dst))
+        mock_read.assert_not_called()
+        assert dst.read_bytes() == b"\x00\x01"
+        assert src.exists()
+
+    def test_copy_file_raw_local_to_memory_streams(self, sa, tmp_path):
+        """ローカル→memory: open_stream / write_stream 経由でコピーする"""
+        src = tmp_path / "src.bin"
+        src.write_bytes(b"\x00\x01")
+        with patch.object(sa, "read_bytes") as mock_read:
+            sa.copy_file_raw(str(src), "memory://copy/dst.bin")
+        mock_read.assert_not_called()
+        assert sa.read_bytes("memory://copy/dst.bin") == b"\x00\x01"
+
     def test_move_file(self, sa, tmp_path):
         """移動: ソースが削除されデスティネーションに内容が移る"""
         src = tmp_path / "src.txt"
@@ -945,6 +1295,77 @@ class TestStorageAdapter:
         assert not src.exists()
         assert sa.read_text(str(dst)) == "content"
 
+    def test_move_file_local_creates_parent(self, sa, tmp_path):
+        """移動: ローカル同士は rename で移動し、親ディレクトリを作成する"""
+        src = tmp_path / "src.txt"
+        dst = tmp_path / "sub" / "dst.txt"
+        sa.write_text("content", str(src))
+        sa.move_file(str(src), str(dst))
+        assert not src.exists()
+        assert dst.read_text() == "content"
+
+    def test_move_file_to_memory(self, sa, tmp_path):
+        """移動: ローカル→memory はコピー後にソースを削除する"""
+        src = tmp_path / "src.txt"
+        sa.write_text("content", str(src))
+        sa.move_file(str(src), "memory://moved/dst.txt")
+        assert not src.exists()
+        assert sa.read_text("memory://moved/dst.txt") == "content"
+
+    # =========================================================
+    # move_local_file
+    # MCDC:
+    #   A: ファイルが存在するか
+    #   B: 宛先がローカルか
+    #   C: os.replace が EXDEV で失敗するか
+    # =========================================================
+
+    def test_move_local_file_not_found(self, sa, tmp_path):
+        """A=False: FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            sa.move_local_file(str(tmp_path / "missing.txt"), str(tmp_path / "dst.txt"))
+
+    def test_move_local_file_same_filesystem(self, sa, tmp_path):
+        """A=True, B=True, C=False: rename でコピーせずに移動する"""
+        src = tmp_path / "src.bin"
+        dst = tmp_path / "out" / "dst.bin"
+        src.write_bytes(b"\x00\x01")
+        with patch("shutil.copyfile") as mock_copy:
+            sa.move_local_file(str(src), str(dst))
+        mock_copy.assert_not_called()
+        assert not src.exists()
+        assert dst.read_bytes() == b"\x00\x01"
+
+    def test_move_local_file_cross_filesystem(self, sa, tmp_path):
+        """A=True, B=True, C=True: copyfile 後にソースを削除する"""
+        src = tmp_path / "src.bin"
+        dst = tmp_path / "dst.bin"
+        src.write_bytes(b"\x00\x01")
+        with patch("os.replace", side_effect=OSError(errno.EXDEV, "cross-device link")):
+            sa.move_local_file(str(src), str(dst))
+        assert not src.exists()
+        assert dst.read_bytes() == b"\x00\x01"
+
+    def test_move_local_file_other_os_error_propagates(self, sa, tmp_path):
+        """A=True, B=True: EXDEV 以外の OSError はそのまま送出し、ソースを残す"""
+        src = tmp_path / "src.bin"
+        src.write_bytes(b"\x00")
+        with patch("os.replace", side_effect=OSError(errno.EACCES, "denied")):
+            with pytest.raises(OSError):
+                sa.move_local_file(str(src), str(tmp_path / "dst.bin"))
+        assert src.exists()
+
+    @patch("boto3.client")
+    def test_move_local_file_to_s3(self, mock_boto3, sa, tmp_path):
+        """A=True, B=False: upload_local_file 後にソースを削除する"""
+        src = tmp_path / "src.bin"
+        src.write_bytes(b"\x00")
+        sa.move_local_file(str(src), "s3://bucket/dst.bin", max_concurrency=4)
+        args = mock_boto3.return_value.upload_file.call_args
+        assert args[0][1:] == ("bucket", "dst.bin")
+        assert args[1]["Config"].max_concurrency == 4
+        assert not src.exists()
+
     # =========================================================
     # _get_storage_options
     # =========================================================
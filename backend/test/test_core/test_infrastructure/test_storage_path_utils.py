@@ -307,6 +307,22 @@ class TestNormalizePath:
         with pytest.raises(ValueError, match="Unknown scheme"):
             normalize_path(path, root)
 
+    # --------------------------------------------------
+    # キャッシュ
+    # --------------------------------------------------
+
+    def test_repeated_call_hits_cache(self, root):
+        """同じ (path, project_root) の2回目はキャッシュから返る"""
+        normalize_path.cache_clear()
+        first = normalize_path("data/cached.txt", root)
+        assert normalize_path("data/cached.txt", root) == first
+        assert normalize_path.cache_info().hits == 1
+
+    def test_cache_is_keyed_by_project_root(self, root):
+        """project_root が異なれば別の結果になる (cwd 変更後も正しく解決される)"""
+        assert normalize_path("data/foo.txt", root) == "/home/user/project/data/foo.txt"
+        assert normalize_path("data/foo.txt", "/other/root") == "/other/root/data/foo.txt"
+
 
 class TestParseS3Path:
     """
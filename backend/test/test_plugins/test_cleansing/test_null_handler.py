@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from unittest.mock import patch
+
+from core.data_container.container import DataContainer, DataContainerStatus
+from plugins.cleansing.null_handler import NullHandler
+
+
+@pytest.fixture
+def input_parquet(tmp_path):
+    """Arrow の null と浮動小数点の NaN が混在する Parquet"""
+    table = pa.table({
+        "a": pa.array([1.0, np.nan, None, 4.0], type=pa.float64()),
+        "b": pa.array(["x", "y", None, "z"]),
+        "c": pa.array([1, 2, 3, None], type=pa.int64()),
+    })
+    path = tmp_path / "input.parquet"
+    pq.write_table(table, path)
+    return path
+
+
+def _run(params, stream: bool):
+    plugin = NullHandler(params)
+    if stream:
+        return plugin.execute(DataContainer())
+    with patch.object(NullHandler, "_can_stream_parquet", return_value=False):
+        return plugin.execute(DataContainer())
+
+
+class TestNullHandlerParquetStreaming:
+
+    # =========================================================
+    # _process_parquet_batches (pandas 経由の処理との一致)
+    # MCDC:
+    #   条件A: strategy (drop_row / fill)
+    #   条件B(drop_row): subset の指定有無
+    #   条件C(fill): value が dict か
+    # =========================================================
+
+    @pytest.mark.parametrize("extra", [
+        {"strategy": "drop_row"},
+        {"strategy": "drop_row", "subset": ["a"]},
+        {"strategy": "fill", "value": {"a": 0, "b": "-", "c": 0}},
+        {"strategy": "fill", "value": {"a": 0.5, "c": 9}},
+    ])
+    def test_streaming_matches_pandas(self, input_parquet, tmp_path, extra):
+        """A × B × C: NaN を含む入力でも、出力内容と null 件数が pandas 経由の処理と一致する"""
+        stream_out = tmp_path / "stream.parquet"
+        pandas_out = tmp_path / "pandas.parquet"
+        streamed = _run({"input_path": str(input_parquet), "output_path": str(stream_out), **extra}, stream=True)
+        baseline = _run({"input_path": str(input_parquet), "output_path": str(pandas_out), **extra}, stream=False)
+
+        assert streamed.status == baseline.status == DataContainerStatus.SUCCESS
+        assert streamed.metadata["initial_nulls"] == baseline.metadata["initial_nulls"] == 4
+        assert streamed.metadata["final_nulls"] == baseline.metadata["final_nulls"]
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(stream_out), pd.read_parquet(pandas_out), check_dtype=False
+        )
+
+    def test_fill_replaces_nan(self, input_parquet, tmp_path):
+        """A=fill: NaN も null と同様に補完される"""
+        output = tmp_path / "out.parquet"
+        result = _run({"input_path": str(input_parquet), "output_path": str(output),
+                       "strategy": "fill", "value": {"a": 0.0}}, stream=True)
+        assert result.status == DataContainerStatus.SUCCESS
+        assert pq.read_table(output).column("a").to_pylist() == [1.0, 0.0, 0.0, 4.0]
+
+    def test_drop_row_drops_nan(self, input_parquet, tmp_path):
+        """A=drop_row × B=True: NaN の行も null の行と同様に削除される"""
+        output = tmp_path / "out.parquet"
+        result = _run({"input_path": str(input_parquet), "output_path": str(output),
+                       "strategy": "drop_row", "subset": ["a"]}, stream=True)
+        assert result.status == DataContainerStatus.SUCCESS
+        assert pq.read_table(output).column("a").to_pylist() == [1.0, 4.0]
+        assert result.metadata["final_nulls"] == 1
@@ -0,0 +1,191 @@
+import ftplib
+import io
+import pytest
+from unittest.mock import MagicMock, patch
+
+from core.data_container.container import DataContainer, DataContainerStatus
+from plugins.extractors import from_ftp
+from plugins.extractors.from_ftp import FtpExtractor
+
+
+REMOTE_CONTENT = b"id,name\n1,alice\n"
+
+
+@pytest.fixture(autouse=True)
+def clear_pool():
+    """各テスト前後に接続プールを空にする"""
+    from_ftp._FTP_POOL.clear()
+    yield
+    from_ftp._FTP_POOL.clear()
+
+
+@pytest.fixture
+def ftp():
+    """RETR のコールバックに REMOTE_CONTENT を渡す FTP 接続のモック"""
+    mock_ftp = MagicMock()
+
+    def retrbinary(cmd, callback, blocksize=8192):
+        callback(REMOTE_CONTENT)
+    mock_ftp.retrbinary.side_effect = retrbinary
+    with patch.object(from_ftp, "_acquire_ftp", return_value=mock_ftp):
+        yield mock_ftp
+
+
+def _run(output_path, remote_path="/pub/data.csv"):
+    plugin = FtpExtractor({
+        "host": "ftp.example.com",
+        "user": "u",
+        "password": "p",
+        "remote_path": remote_path,
+        "output_path": output_path,
+    })
+    return plugin.execute(DataContainer())
+
+
+class TestFtpExtractorLocal:
+
+    # =========================================================
+    # _download_to_local
+    # MCDC:
+    #   条件A: output_path が '/' で終わる、または既存のディレクトリか
+    #   条件B: 受信・rename が成功するか
+    # =========================================================
+
+    def test_download_to_file_path(self, ftp, tmp_path):
+        """A=False × B=True: 指定パスに保存し、.part を残さず接続をプールに戻す"""
+        output = tmp_path / "nested" / "out.csv"
+        result = _run(str(output))
+        assert result.status == DataContainerStatus.SUCCESS
+        assert output.read_bytes() == REMOTE_CONTENT
+        assert not (tmp_path / "nested" / "out.csv.part").exists()
+        assert list(from_ftp._FTP_POOL.values()) == [ftp]
+
+    def test_download_to_directory_with_trailing_slash(self, ftp, tmp_path):
+        """A=True('/' 終端) × B=True: リモートのファイル名でディレクトリ配下に保存する"""
+        result = _run(str(tmp_path / "outdir") + "/")
+        assert result.status == DataContainerStatus.SUCCESS
+        assert (tmp_path / "outdir" / "data.csv").read_bytes() == REMOTE_CONTENT
+        assert not (tmp_path / "outdir" / ".part").exists()
+
+    def test_download_to_existing_directory(self, ftp, tmp_path):
+        """A=True(既存ディレクトリ) × B=True: リモートのファイル名でディレクトリ配下に保存する"""
+        result = _run(str(tmp_path))
+        assert result.status == DataContainerStatus.SUCCESS
+        assert (tmp_path / "data.csv").read_bytes() == REMOTE_CONTENT
+
+    def test_ftp_error_removes_part_and_closes(self, ftp, tmp_path):
+        """A=False × B=False(ftplib): .part を削除し、接続を閉じてプールに戻さない"""
+        def retrbinary(cmd, callback, blocksize=8192):
+            callback(b"partial")
+            raise ftplib.error_perm("550 No such file")
+        ftp.retrbinary.side_effect = retrbinary
+        result = _run(str(tmp_path / "out.csv"))
+        assert result.status == DataContainerStatus.ERROR
+        assert "FTP download operation failed" in result.errors[0]
+        assert list(tmp_path.iterdir()) == []
+        ftp.close.assert_called_once()
+        assert from_ftp._FTP_POOL == {}
+
+    def test_rename_error_removes_part_and_closes(self, ftp, tmp_path):
+        """A=False × B=False(rename): rename の失敗でも .part を削除し、接続を閉じる"""
+        with patch.object(from_ftp.os, "replace", side_effect=PermissionError("denied")):
+            result = _run(str(tmp_path / "out.csv"))
+        assert result.status == DataContainerStatus.ERROR
+        assert list(tmp_path.iterdir()) == []
+        ftp.close.assert_called_once()
+        assert from_ftp._FTP_POOL == {}
+
+
+class TestFtpExtractorStorage:
+
+    # =========================================================
+    # _stream_to_storage
+    # MCDC:
+    #   条件A: output_path が '/' で終わるか
+    # =========================================================
+
+    @pytest.fixture
+    def stream_ftp(self, ftp):
+        conn = MagicMock()
+        conn.makefile.return_value.__enter__.return_value = MagicMock(name="reader")
+        ftp.transfercmd.return_value.__enter__.return_value = conn
+        return ftp
+
+    def test_stream_to_object_path(self, stream_ftp):
+        """A=False: 指定したキーにそのまま書き込む"""
+        with patch.object(from_ftp.storage_adapter, "write_stream") as mock_write:
+            result = _run("s3://bucket/prefix/out.csv")
+        assert result.status == DataContainerStatus.SUCCESS
+        assert mock_write.call_args[0][1] == "s3://bucket/prefix/out.csv"
+        assert list(from_ftp._FTP_POOL.values()) == [stream_ftp]
+
+    def test_stream_to_prefix_appends_remote_basename(self, stream_ftp):
+        """A=True: プレフィックス指定ではリモートのファイル名をキーに付与する"""
+        with patch.object(from_ftp.storage_adapter, "write_stream") as mock_write:
+            result = _run("s3://bucket/prefix/")
+        assert result.status == DataContainerStatus.SUCCESS
+        assert mock_write.call_args[0][1] == "s3://bucket/prefix/data.csv"
+
+    def test_stream_to_memory(self, stream_ftp):
+        """メモリ上のパスへもローカルディスクを経由せずに書き込む"""
+        conn = stream_ftp.transfercmd.return_value.__enter__.return_value
+        conn.makefile.return_value.__enter__.return_value = io.BytesIO(REMOTE_CONTENT)
+        result = _run("memory://ftp/out.csv")
+        assert result.status == DataContainerStatus.SUCCESS
+        assert from_ftp.storage_adapter.read_bytes("memory://ftp/out.csv") == REMOTE_CONTENT
+
+
+class TestFtpPool:
+
+    # =========================================================
+    # _acquire_ftp / _release_ftp
+    # MCDC:
+    #   条件A: 同じ (host, user, パスワード) の接続がプールにあるか
+    #   条件B(A=True): NOOP が成功するか (接続が生きているか)
+    # =========================================================
+
+    @pytest.fixture
+    def new_ftp(self):
+        with patch.object(from_ftp, "connect_any") as mock_connect:
+            mock_connect.side_effect = lambda host, connect: MagicMock(name="new_ftp")
+            yield mock_connect
+
+    def test_empty_pool_connects_and_logs_in(self, new_ftp):
+        """A=False: 新しく接続してログインする"""
+        ftp = from_ftp._acquire_ftp("ftp.example.com", "u", "p")
+        new_ftp.assert_called_once()
+        ftp.login.assert_called_once_with(user="u", passwd="p")
+
+    def test_released_connection_is_reused(self, new_ftp):
+        """A=True × B=True: 返却した接続を再利用し、再接続しない"""
+        ftp = from_ftp._acquire_ftp("ftp.example.com", "u", "p")
+        from_ftp._release_ftp("ftp.example.com", "u", "p", ftp)
+        assert from_ftp._acquire_ftp("ftp.example.com", "u", "p") is ftp
+        assert new_ftp.call_count == 1
+        ftp.voidcmd.assert_called_once_with("NOOP")
+
+    def test_stale_connection_is_replaced(self, new_ftp):
+        """A=True × B=False: 切断済みの接続は閉じて新しく接続する"""
+        stale = from_ftp._acquire_ftp("ftp.example.com", "u", "p")
+        stale.voidcmd.side_effect = EOFError()
+        from_ftp._release_ftp("ftp.example.com", "u", "p", stale)
+        fresh = from_ftp._acquire_ftp("ftp.example.com", "u", "p")
+        assert fresh is not stale
+        stale.close.assert_called_once()
+
+    def test_connection_is_not_shared_across_passwords(self, new_ftp):
+        """A=False(パスワード違い): 別の認証情報でログインした接続は再利用しない"""
+        ftp = from_ftp._acquire_ftp("ftp.example.com", "u", "p")
+        from_ftp._release_ftp("ftp.example.com", "u", "p", ftp)
+        other = from_ftp._acquire_ftp("ftp.example.com", "u", "other")
+        assert other is not ftp
+        assert new_ftp.call_count == 2
+
+    def test_release_when_slot_taken_closes_connection(self, new_ftp):
+        """同じキーの接続が既にプールにある場合は、返却した接続を閉じる"""
+        first = from_ftp._acquire_ftp("ftp.example.com", "u", "p")
+        second = from_ftp._acquire_ftp("ftp.example.com", "u", "p")
+        from_ftp._release_ftp("ftp.example.com", "u", "p", first)
+        from_ftp._release_ftp("ftp.example.com", "u", "p", second)
+        assert list(from_ftp._FTP_POOL.values()) == [first]
+        second.quit.assert_called_once()
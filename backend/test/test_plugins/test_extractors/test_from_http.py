@@ -0,0 +1,137 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from core.data_container.container import DataContainer, DataContainerStatus
+from core.infrastructure import storage_adapter
+from plugins.extractors import from_http
+from plugins.extractors.from_http import HttpExtractor
+
+
+BODIES = {
+    "https://example.test/files/a.csv": b"id\n1\n",
+    "https://example.test/files/b.csv": b"id\n2\n" * 1000,
+}
+
+
+class _FakeContent:
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def iter_chunked(self, size: int):
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+
+
+class _FakeResponse:
+    def __init__(self, body: bytes):
+        self.content = _FakeContent(body)
+
+    def raise_for_status(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    """aiohttp.ClientSession の代わりに BODIES の内容を返すセッション"""
+
+    def __init__(self, connector=None, timeout=None):
+        self.timeout = timeout
+        _FakeSession.instances.append(self)
+
+    def get(self, url):
+        return _FakeResponse(BODIES[url])
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def fake_session():
+    _FakeSession.instances = []
+    with patch.object(from_http.aiohttp, "ClientSession", _FakeSession), \
+         patch.object(from_http.aiohttp, "TCPConnector"):
+        yield _FakeSession
+
+
+def _run_batch(output_path):
+    plugin = HttpExtractor({"url": list(BODIES), "output_path": output_path, "concurrency": 2})
+    return plugin.execute(DataContainer())
+
+
+class TestHttpExtractorBatch:
+
+    # =========================================================
+    # _download / _download_all (url が配列の場合)
+    # MCDC:
+    #   条件A: is_local_path(output_path)
+    #   条件B(local): output_path の形式 (絶対パス / file:// / 相対パス)
+    # =========================================================
+
+    def test_local_directory_target(self, fake_session, tmp_path):
+        """A=True × B=絶対パス: URL のファイル名でディレクトリ配下に保存する"""
+        result = _run_batch(str(tmp_path / "out") + "/")
+        assert result.status == DataContainerStatus.SUCCESS
+        for url, body in BODIES.items():
+            assert (tmp_path / "out" / url.rsplit("/", 1)[1]).read_bytes() == body
+
+    def test_local_file_uri_target(self, fake_session, tmp_path):
+        """A=True × B=file://: file:// の出力先をローカルパスに正規化して保存する"""
+        result = _run_batch(f"file://{tmp_path.as_posix()}/out/")
+        assert result.status == DataContainerStatus.SUCCESS
+        assert (tmp_path / "out" / "a.csv").read_bytes() == BODIES["https://example.test/files/a.csv"]
+
+    def test_local_relative_target(self, fake_session, tmp_path, monkeypatch):
+        """A=True × B=相対パス: カレントディレクトリ基準で解決する"""
+        monkeypatch.chdir(tmp_path)
+        result = _run_batch("out/")
+        assert result.status == DataContainerStatus.SUCCESS
+        assert (tmp_path / "out" / "b.csv").read_bytes() == BODIES["https://example.test/files/b.csv"]
+
+    def test_non_local_target_streams_through_storage(self, fake_session):
+        """A=False: ローカル以外は StorageAdapter の書き込みストリームへ書き込む"""
+        result = _run_batch("memory://http_batch/")
+        assert result.status == DataContainerStatus.SUCCESS
+        for url, body in BODIES.items():
+            assert storage_adapter.read_bytes("memory://http_batch/" + url.rsplit("/", 1)[1]) == body
+
+    def test_timeout_limits_only_socket_operations(self, fake_session, tmp_path):
+        """接続プールの待ち時間や転送全体の時間は制限せず、接続と無通信時間のみを制限する"""
+        _run_batch(str(tmp_path) + "/")
+        timeout = fake_session.instances[0].timeout
+        assert timeout.total is None
+        assert timeout.sock_connect == 5
+        assert timeout.sock_read == 60
+
+    def test_failed_remote_write_discards_sink(self):
+        """A=False: 受信中に失敗した場合は出力を破棄し、close しない"""
+        class _Sink:
+            def __init__(self):
+                self.discarded = False
+
+            def write(self, chunk):
+                raise OSError("upload failed")
+
+            def discard(self):
+                self.discarded = True
+
+            def close(self):
+                raise AssertionError("close must not be called after discard")
+
+        sink = _Sink()
+
+        async def chunks():
+            yield b"data"
+
+        with patch.object(from_http.storage_adapter, "open_write_stream", return_value=sink):
+            with pytest.raises(OSError, match="upload failed"):
+                asyncio.run(from_http._write_remote_chunks(chunks(), "s3://bucket/out.csv"))
+        assert sink.discarded
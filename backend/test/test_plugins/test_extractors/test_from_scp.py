@@ -0,0 +1,125 @@
+import io
+import pytest
+from unittest.mock import MagicMock, patch
+
+from core.data_container.container import DataContainer, DataContainerStatus
+from core.infrastructure import storage_adapter
+from plugins.extractors import from_scp
+from plugins.extractors.from_scp import ScpExtractor
+
+
+REMOTE_CONTENT = b"id,name\n1,alice\n" * 100
+
+
+class _RemoteFile(io.BytesIO):
+    """paramiko.SFTPFile の代わりに使うファイル (prefetch は何もしない)"""
+
+    def prefetch(self):
+        pass
+
+
+@pytest.fixture
+def ssh():
+    """paramiko の SSHClient / SFTPClient をモックし、リモートファイルとして REMOTE_CONTENT を返す"""
+    sftp = MagicMock()
+    sftp.open.side_effect = lambda path, mode: _RemoteFile(REMOTE_CONTENT)
+    with patch.object(from_scp.paramiko, "SSHClient") as mock_client_cls, \
+         patch.object(from_scp.paramiko.SFTPClient, "from_transport", return_value=sftp):
+        yield mock_client_cls.return_value
+
+
+def _run(output_path, remote_path="/data/export.csv", **extra):
+    plugin = ScpExtractor({
+        "host": "sftp.example.com",
+        "user": "u",
+        "password": "p",
+        "remote_path": remote_path,
+        "output_path": output_path,
+        **extra,
+    })
+    return plugin.execute(DataContainer())
+
+
+class TestScpExtractor:
+
+    # =========================================================
+    # paramiko によるダウンロード
+    # MCDC:
+    #   条件A: is_local_path(output_path)
+    #   条件B(local): output_path が '/' で終わる、または既存のディレクトリか
+    #   条件C(local): 受信が成功するか
+    # =========================================================
+
+    def test_local_file_path(self, ssh, tmp_path):
+        """A=True × B=False × C=True: .part を残さず指定パスに保存し、接続を閉じる"""
+        output = tmp_path / "out.csv"
+        result = _run(str(output))
+        assert result.status == DataContainerStatus.SUCCESS
+        assert output.read_bytes() == REMOTE_CONTENT
+        assert not (tmp_path / "out.csv.part").exists()
+        ssh.close.assert_called_once()
+
+    def test_local_directory(self, ssh, tmp_path):
+        """A=True × B=True: リモートのファイル名でディレクトリ配下に保存する"""
+        result = _run(str(tmp_path))
+        assert result.status == DataContainerStatus.SUCCESS
+        assert (tmp_path / "export.csv").read_bytes() == REMOTE_CONTENT
+
+    def test_local_failure_removes_part(self, ssh, tmp_path):
+        """A=True × B=False × C=False: 受信に失敗した場合は .part を削除する"""
+        with patch.object(from_scp.shutil, "copyfileobj", side_effect=OSError("connection lost")):
+            result = _run(str(tmp_path / "out.csv"))
+        assert result.status == DataContainerStatus.ERROR
+        assert list(tmp_path.iterdir()) == []
+
+    def test_non_local_prefix_appends_remote_basename(self, ssh):
+        """A=False: ローカル以外はディスクを経由せず、プレフィックス指定ではファイル名を付与する"""
+        result = _run("memory://scp/")
+        assert result.status == DataContainerStatus.SUCCESS
+        assert storage_adapter.read_bytes("memory://scp/export.csv") == REMOTE_CONTENT
+
+
+class TestNativeSftp:
+
+    # =========================================================
+    # _download_with_native_sftp
+    # MCDC:
+    #   条件A: sftp コマンドの終了コードが 0 か
+    #   条件B(A=False): タイムアウトしたか
+    # =========================================================
+
+    @pytest.fixture
+    def plugin(self):
+        return ScpExtractor({"native_timeout_sec": 5})
+
+    def _fake_sftp(self, returncode):
+        def run(command, **kwargs):
+            with open(command[-1], "wb") as f:
+                f.write(REMOTE_CONTENT)
+            return MagicMock(returncode=returncode, stderr="Permission denied")
+        return run
+
+    def test_success_renames_part(self, plugin, tmp_path):
+        """A=True: .part を宛先へ rename し、ユーザーの known_hosts を使わない"""
+        with patch.object(from_scp.subprocess, "run", side_effect=self._fake_sftp(0)) as mock_run:
+            done = plugin._download_with_native_sftp("h", 22, "u", "/k", "/data/export.csv", str(tmp_path) + "/")
+        assert done is True
+        assert (tmp_path / "export.csv").read_bytes() == REMOTE_CONTENT
+        command = mock_run.call_args[0][0]
+        assert f"UserKnownHostsFile={from_scp._known_hosts_file()}" in command
+        assert mock_run.call_args[1]["timeout"] == 5
+
+    def test_failure_removes_part_and_falls_back(self, plugin, tmp_path):
+        """A=False × B=False: .part を削除して False (paramiko での転送) を返す"""
+        with patch.object(from_scp.subprocess, "run", side_effect=self._fake_sftp(1)):
+            done = plugin._download_with_native_sftp("h", 22, "u", "/k", "/data/export.csv", str(tmp_path) + "/")
+        assert done is False
+        assert list(tmp_path.iterdir()) == []
+
+    def test_timeout_falls_back(self, plugin, tmp_path):
+        """A=False × B=True: タイムアウトした場合も False を返す"""
+        timeout = from_scp.subprocess.TimeoutExpired("sftp", 5)
+        with patch.object(from_scp.subprocess, "run", side_effect=timeout):
+            done = plugin._download_with_native_sftp("h", 22, "u", "/k", "/data/export.csv", str(tmp_path) + "/")
+        assert done is False
+        assert list(tmp_path.iterdir()) == []
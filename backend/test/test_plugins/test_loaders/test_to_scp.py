@@ -0,0 +1,96 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from plugins.loaders import to_scp
+
+
+@pytest.fixture(autouse=True)
+def clear_pool():
+    """各テスト前後に接続プールを空にする"""
+    to_scp._SFTP_POOL.clear()
+    yield
+    to_scp._SFTP_POOL.clear()
+
+
+def _sftp_for(remote_version):
+    sftp = MagicMock()
+    sftp.get_channel.return_value.get_transport.return_value.remote_version = remote_version
+    return sftp
+
+
+class TestWriteRequestSize:
+
+    # =========================================================
+    # _write_request_size
+    # MCDC:
+    #   条件A: sftp_write_request_size が指定されているか
+    #   条件B(A=False): サーバーの識別文字列が OpenSSH か
+    # =========================================================
+
+    def test_explicit_size_is_used_for_any_server(self):
+        """A=True: 指定値をサーバーに関わらず使う"""
+        assert to_scp._write_request_size(_sftp_for("SSH-2.0-ApplianceSSH"), 65536) == 65536
+
+    def test_openssh_server_uses_large_requests(self):
+        """A=False × B=True: OpenSSH には SFTP_WRITE_REQUEST_SIZE で送る"""
+        sftp = _sftp_for("SSH-2.0-OpenSSH_9.6p1 Ubuntu-3ubuntu13")
+        assert to_scp._write_request_size(sftp, None) == to_scp.SFTP_WRITE_REQUEST_SIZE
+
+    def test_other_server_keeps_paramiko_default(self):
+        """A=False × B=False: 仕様が保証する paramiko の既定値 (32KB) のままにする"""
+        assert to_scp._write_request_size(_sftp_for("SSH-2.0-dropbear_2022.83"), None) == 32768
+
+
+class TestSftpPool:
+
+    # =========================================================
+    # _acquire_sftp / _release_sftp
+    # MCDC:
+    #   条件A: 同じ宛先・認証情報の接続がプールにあるか
+    #   条件B(A=True): アイドル時間内かつトランスポートが有効か
+    #   条件C(release): プールの空きがあるか
+    # =========================================================
+
+    ARGS = ("sftp.example.com", 22, "u", "p", None)
+
+    def _acquire(self, password="p"):
+        return to_scp._acquire_sftp("sftp.example.com", 22, "u", password, None, 30, 2 ** 21, 2 ** 15, False)
+
+    @pytest.fixture
+    def paramiko_mocks(self):
+        with patch.object(to_scp.paramiko, "SSHClient", side_effect=lambda: MagicMock(name="ssh")) as mock_client, \
+             patch.object(to_scp.paramiko.SFTPClient, "from_transport",
+                          side_effect=lambda *a, **k: MagicMock(name="sftp")):
+            yield mock_client
+
+    def test_released_session_is_reused(self, paramiko_mocks):
+        """A=True × B=True: 返却したセッションを再利用し、再接続しない"""
+        ssh_client, sftp = self._acquire()
+        ssh_client.get_transport.return_value.is_active.return_value = True
+        to_scp._release_sftp(*self.ARGS, False, ssh_client, sftp)
+        assert self._acquire() == (ssh_client, sftp)
+        assert paramiko_mocks.call_count == 1
+
+    def test_inactive_session_is_replaced(self, paramiko_mocks):
+        """A=True × B=False: 切断済みのセッションは閉じて新しく接続する"""
+        ssh_client, sftp = self._acquire()
+        ssh_client.get_transport.return_value.is_active.return_value = False
+        to_scp._release_sftp(*self.ARGS, False, ssh_client, sftp)
+        assert self._acquire()[0] is not ssh_client
+        ssh_client.close.assert_called()
+
+    def test_session_is_not_shared_across_passwords(self, paramiko_mocks):
+        """A=False(パスワード違い): 別の認証情報のセッションは再利用しない"""
+        ssh_client, sftp = self._acquire()
+        ssh_client.get_transport.return_value.is_active.return_value = True
+        to_scp._release_sftp(*self.ARGS, False, ssh_client, sftp)
+        assert self._acquire(password="other")[0] is not ssh_client
+
+    def test_release_beyond_max_idle_closes(self, paramiko_mocks):
+        """C=False: アイドル接続が上限に達している場合は返却した接続を閉じる"""
+        sessions = [self._acquire() for _ in range(to_scp.SFTP_POOL_MAX_IDLE + 1)]
+        for ssh_client, sftp in sessions:
+            to_scp._release_sftp(*self.ARGS, False, ssh_client, sftp)
+        sessions[-1][0].close.assert_called_once()
+        for ssh_client, _ in sessions[:-1]:
+            ssh_client.close.assert_not_called()
@@ -0,0 +1,116 @@
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from unittest.mock import patch
+
+from core.data_container.container import DataContainer, DataContainerStatus
+from core.infrastructure import storage_adapter
+from plugins.transformers import with_duckdb
+from plugins.transformers.with_duckdb import DuckDBTransformer
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    pd.DataFrame({"a": range(10), "b": list("abcdefghij")}).to_parquet(tmp_path / "in.parquet")
+    pd.DataFrame({"a": [10, 11], "b": ["x", "y"]}).to_parquet(tmp_path / "in2.parquet")
+    pd.DataFrame({"a": range(5)}).to_csv(tmp_path / "in.csv", index=False)
+    (tmp_path / "query.sql").write_text("SELECT a, b FROM source_data WHERE a > 4 ORDER BY a")
+    (tmp_path / "all.sql").write_text("SELECT * FROM source_data ORDER BY a")
+    return tmp_path
+
+
+def _run(**params):
+    return DuckDBTransformer(params).execute(DataContainer())
+
+
+class TestDuckDBTransformer:
+
+    # =========================================================
+    # 入力の登録と出力の書き込み
+    # MCDC:
+    #   条件A: 出力がローカルの CSV / Parquet か (COPY で直接書き込む)
+    #   条件B(A=True): クエリが単一の SELECT 文か
+    #   条件C: 入力がローカルか (DuckDB が直接読む)
+    # =========================================================
+
+    def test_local_parquet_to_parquet_uses_copy(self, workdir):
+        """A=True × B=True × C=True: COPY で ZSTD の Parquet を書き込み、行数をメタデータに残す"""
+        output = workdir / "out" / "result.parquet"
+        with patch.object(storage_adapter, "write_arrow") as mock_write_arrow:
+            result = _run(input_path=str(workdir / "in.parquet"), query_file=str(workdir / "query.sql"),
+                          output_path=str(output))
+        assert result.status == DataContainerStatus.SUCCESS
+        mock_write_arrow.assert_not_called()
+        assert result.metadata["rows_output"] == 5
+        assert pd.read_parquet(output)["a"].tolist() == [5, 6, 7, 8, 9]
+        assert pq.ParquetFile(output).metadata.row_group(0).column(0).compression == "ZSTD"
+
+    def test_local_csv_to_csv_uses_copy(self, workdir):
+        """A=True × B=True × C=True(CSV): ヘッダー付きの CSV を書き込む"""
+        output = workdir / "result.csv"
+        result = _run(input_path=str(workdir / "in.csv"), query_file=str(workdir / "all.sql"),
+                      output_path=str(output))
+        assert result.status == DataContainerStatus.SUCCESS
+        assert pd.read_csv(output)["a"].tolist() == [0, 1, 2, 3, 4]
+
+    def test_multiple_statements_fall_back_to_arrow_writer(self, workdir):
+        """A=True × B=False: COPY で包めないクエリは Arrow のバッチで書き込む"""
+        (workdir / "multi.sql").write_text("SELECT 1; SELECT a FROM source_data ORDER BY a")
+        output = workdir / "result.parquet"
+        result = _run(input_path=str(workdir / "in.csv"), query_file=str(workdir / "multi.sql"),
+                      output_path=str(output))
+        assert result.status == DataContainerStatus.SUCCESS
+        assert result.metadata["rows_output"] == 5
+        assert pd.read_parquet(output)["a"].tolist() == [0, 1, 2, 3, 4]
+
+    def test_memory_output_uses_arrow_writer(self, workdir):
+        """A=False: ローカル以外の出力は storage_adapter.write_arrow で書き込む"""
+        result = _run(input_path=str(workdir / "in.parquet"), query_file=str(workdir / "query.sql"),
+                      output_path="memory://duckdb/result.csv")
+        assert result.status == DataContainerStatus.SUCCESS
+        assert result.metadata["rows_output"] == 5
+        assert storage_adapter.read_bytes("memory://duckdb/result.csv").startswith(b'"a","b"\n5,"f"\n')
+
+    def test_multiple_local_inputs_are_combined(self, workdir):
+        """C=True(複数): 同じ形式の複数ファイルを1つのテーブルとして読む"""
+        output = workdir / "combined.parquet"
+        result = _run(input_path=[str(workdir / "in.parquet"), str(workdir / "in2.parquet")],
+                      query_file=str(workdir / "all.sql"), output_path=str(output))
+        assert result.status == DataContainerStatus.SUCCESS
+        assert result.metadata["rows_output"] == 12
+
+    def test_memory_input_is_registered_from_storage(self, workdir):
+        """C=False: ローカル以外の入力は StorageAdapter で読んで登録する"""
+        storage_adapter.write_bytes((workdir / "in.csv").read_bytes(), "memory://duckdb/in.csv")
+        output = workdir / "from_memory.csv"
+        result = _run(input_path="memory://duckdb/in.csv", query_file=str(workdir / "all.sql"),
+                      output_path=str(output))
+        assert result.status == DataContainerStatus.SUCCESS
+        assert pd.read_csv(output)["a"].tolist() == [0, 1, 2, 3, 4]
+
+
+class TestPrepareS3:
+
+    # =========================================================
+    # _prepare_s3 (s3_direct_read)
+    # MCDC:
+    #   条件A: この DB で httpfs を読み込み済みか
+    # =========================================================
+
+    def test_secret_is_recreated_every_run(self):
+        """A=False→True: httpfs は DB ごとに1回だけ読み込み、シークレットは毎回作り直す"""
+        class _Con:
+            def __init__(self):
+                self.statements = []
+
+            def execute(self, sql):
+                self.statements.append(sql)
+
+        con = _Con()
+        try:
+            with_duckdb._prepare_s3(con)
+            with_duckdb._prepare_s3(con)
+        finally:
+            with_duckdb._S3_READY.discard(id(con))
+        assert con.statements.count("LOAD httpfs") == 1
+        assert con.statements.count("CREATE OR REPLACE SECRET etl_s3 (TYPE S3, PROVIDER CREDENTIAL_CHAIN)") == 2
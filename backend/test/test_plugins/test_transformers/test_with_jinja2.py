@@ -0,0 +1,93 @@
+import json
+
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from core.data_container.container import DataContainer, DataContainerStatus
+from plugins.transformers import with_jinja2
+from plugins.transformers.with_jinja2 import Jinja2Transformer, _substitution_parts
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]}).to_csv(tmp_path / "in.csv", index=False)
+    (tmp_path / "plain.j2").write_text('{"id": {{ id }}, "name": "{{ name }}"}')
+    (tmp_path / "control.j2").write_text('{"id": {{ id }}{% if name %}, "name": "{{ name }}"{% endif %}}')
+    return tmp_path
+
+
+def _run(**params):
+    return Jinja2Transformer(params).execute(DataContainer())
+
+
+def _read_lines(path):
+    return [json.loads(line) for line in path.read_text().split("\n")]
+
+
+class TestSubstitutionParts:
+
+    # =========================================================
+    # _substitution_parts
+    # MCDC:
+    #   条件A: テンプレートが定数テキストと {{ 変数名 }} のみか
+    # =========================================================
+
+    def test_plain_substitution(self):
+        """A=True: (変数か, 値) の組を返す"""
+        assert _substitution_parts("x={{ id }};") == ((False, "x="), (True, "id"), (False, ";"))
+
+    @pytest.mark.parametrize("source", [
+        "{{ id | upper }}",
+        "{% if id %}{{ id }}{% endif %}",
+        "{{ row.id }}",
+    ])
+    def test_filters_and_control_flow_are_rejected(self, source):
+        """A=False: フィルタ・制御構文・属性参照を含む場合は None"""
+        assert _substitution_parts(source) is None
+
+
+class TestJinja2Transformer:
+
+    # =========================================================
+    # run
+    # MCDC:
+    #   条件A: sql_projection を指定したか (DuckDB で JSON にする)
+    #   条件B(A=False): テンプレートが列の置換のみか (列単位で展開する)
+    # =========================================================
+
+    def test_substitution_template_renders_by_column(self, workdir):
+        """A=False × B=True: 行ごとの render を呼ばずに列単位で展開する"""
+        output = workdir / "plain.jsonl"
+        with patch.object(with_jinja2, "_render_substitution", wraps=with_jinja2._render_substitution) as mock_render:
+            result = _run(input_path=str(workdir / "in.csv"), output_path=str(output),
+                          template_path=str(workdir / "plain.j2"))
+        assert result.status == DataContainerStatus.SUCCESS
+        mock_render.assert_called_once()
+        assert result.metadata["records_processed"] == 3
+        assert _read_lines(output) == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3, "name": "c"}]
+
+    def test_control_flow_template_matches_substitution(self, workdir):
+        """A=False × B=False: 行ごとに描画し、列単位の展開と同じ結果になる"""
+        plain, control = workdir / "plain.jsonl", workdir / "control.jsonl"
+        _run(input_path=str(workdir / "in.csv"), output_path=str(plain), template_path=str(workdir / "plain.j2"))
+        with patch.object(with_jinja2, "_render_substitution") as mock_render:
+            result = _run(input_path=str(workdir / "in.csv"), output_path=str(control),
+                          template_path=str(workdir / "control.j2"))
+        assert result.status == DataContainerStatus.SUCCESS
+        mock_render.assert_not_called()
+        assert _read_lines(control) == _read_lines(plain)
+
+    def test_sql_projection(self, workdir):
+        """A=True: DuckDB の to_json で行ごとの JSON を書き込む"""
+        output = workdir / "projection.jsonl"
+        result = _run(input_path=str(workdir / "in.csv"), output_path=str(output),
+                      sql_projection="{'key': id * 10, 'label': name}")
+        assert result.status == DataContainerStatus.SUCCESS
+        assert _read_lines(output) == [{"key": 10, "label": "a"}, {"key": 20, "label": "b"}, {"key": 30, "label": "c"}]
+
+    def test_template_and_projection_are_exclusive(self, workdir):
+        """A=True × テンプレートも指定: どちらか一方のみ指定できる"""
+        result = _run(input_path=str(workdir / "in.csv"), output_path=str(workdir / "out.jsonl"),
+                      template_path=str(workdir / "plain.j2"), sql_projection="{'id': id}")
+        assert result.status == DataContainerStatus.ERROR
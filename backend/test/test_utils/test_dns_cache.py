@@ -0,0 +1,101 @@
+import socket
+import pytest
+from unittest.mock import Mock, patch
+from scripts.utils import dns_cache
+from scripts.utils.dns_cache import DNS_CACHE_TTL_SECONDS, clear_dns_cache, connect_any, resolve_host_addresses
+
+
+def _addrinfo(*addresses):
+    return [
+        (socket.AF_INET6 if ":" in address else socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (address, 0))
+        for address in addresses
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_dns_cache()
+    yield
+    clear_dns_cache()
+
+
+# ======================================================================
+# resolve_host_addresses
+# MCDC:
+#   A: キャッシュに有効なエントリがあるか
+#   B: getaddrinfo が成功するか
+# ======================================================================
+class TestResolveHostAddresses:
+
+    def test_miss_resolves_and_caches(self):
+        """A=False, B=True: 解決結果を返し、2回目は getaddrinfo を呼ばない"""
+        with patch("socket.getaddrinfo", return_value=_addrinfo("192.0.2.10")) as mock_gai:
+            assert resolve_host_addresses("ftp.example.test") == ("192.0.2.10",)
+            assert resolve_host_addresses("ftp.example.test") == ("192.0.2.10",)
+        mock_gai.assert_called_once_with("ftp.example.test", None, proto=socket.IPPROTO_TCP)
+
+    def test_keeps_all_addresses_in_order_without_duplicates(self):
+        """A=False, B=True: デュアルスタックの全アドレスを getaddrinfo の順で保持する"""
+        infos = _addrinfo("2001:db8::10", "192.0.2.10", "2001:db8::10")
+        with patch("socket.getaddrinfo", return_value=infos):
+            assert resolve_host_addresses("ftp.example.test") == ("2001:db8::10", "192.0.2.10")
+
+    def test_expired_entry_is_resolved_again(self):
+        """A=False(期限切れ), B=True: TTL 経過後は再解決する"""
+        with patch("socket.getaddrinfo", side_effect=[_addrinfo("192.0.2.10"), _addrinfo("192.0.2.20")]), \
+                patch.object(dns_cache.time, "monotonic", side_effect=[0.0, DNS_CACHE_TTL_SECONDS + 1]):
+            assert resolve_host_addresses("ftp.example.test") == ("192.0.2.10",)
+            assert resolve_host_addresses("ftp.example.test") == ("192.0.2.20",)
+
+    def test_failure_returns_host_and_is_not_cached(self):
+        """A=False, B=False: host をそのまま返し、次回は再解決を試みる"""
+        with patch("socket.getaddrinfo", side_effect=[socket.gaierror("not found"), _addrinfo("192.0.2.10")]):
+            assert resolve_host_addresses("ftp.example.test") == ("ftp.example.test",)
+            assert resolve_host_addresses("ftp.example.test") == ("192.0.2.10",)
+
+    def test_clear_dns_cache(self):
+        """clear_dns_cache 後は再解決する"""
+        with patch("socket.getaddrinfo", return_value=_addrinfo("192.0.2.10")) as mock_gai:
+            resolve_host_addresses("ftp.example.test")
+            clear_dns_cache()
+            resolve_host_addresses("ftp.example.test")
+        assert mock_gai.call_count == 2
+
+
+# ======================================================================
+# connect_any
+# MCDC:
+#   C: 先頭のアドレスで接続できるか
+#   D: 残りのアドレスのいずれかで接続できるか
+# ======================================================================
+class TestConnectAny:
+
+    @pytest.fixture(autouse=True)
+    def _dual_stack(self):
+        with patch("socket.getaddrinfo", return_value=_addrinfo("2001:db8::10", "192.0.2.10")):
+            yield
+
+    def test_first_address_succeeds(self):
+        """C=True: 先頭のアドレスの接続結果を返し、残りは試さない"""
+        connect = Mock(return_value="conn")
+        assert connect_any("ftp.example.test", connect) == "conn"
+        connect.assert_called_once_with("2001:db8::10")
+
+    def test_falls_back_to_next_address(self):
+        """C=False, D=True: 先頭に到達できない場合は次のアドレスで接続する"""
+        connect = Mock(side_effect=[OSError("Network is unreachable"), "conn"])
+        assert connect_any("ftp.example.test", connect) == "conn"
+        assert [c.args[0] for c in connect.call_args_list] == ["2001:db8::10", "192.0.2.10"]
+
+    def test_all_addresses_fail_raises_last_error(self):
+        """C=False, D=False: すべて失敗した場合は最後のエラーを送出する"""
+        connect = Mock(side_effect=[OSError("unreachable"), ConnectionRefusedError("refused")])
+        with pytest.raises(ConnectionRefusedError, match="refused"):
+            connect_any("ftp.example.test", connect)
+
+    def test_non_os_error_is_not_retried(self):
+        """C=False(OSError 以外): 接続後のプロトコルエラー等は他のアドレスを試さずに送出する"""
+        connect = Mock(side_effect=ValueError("bad welcome"))
+        with pytest.raises(ValueError, match="bad welcome"):
+            connect_any("ftp.example.test", connect)
+        connect.assert_called_once()
@@ -0,0 +1,70 @@
+import io
+import pytest
+from scripts.utils.prefetch_reader import PrefetchReader
+
+
+class _FailingStream(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def readable(self):
+        return True
+
+    def read(self, n=-1):
+        if self._data:
+            data, self._data = self._data, b""
+            return data
+        raise IOError("connection reset")
+
+
+# ======================================================================
+# PrefetchReader
+# MCDC:
+#   A: 読み出しスレッドが終端まで到達するか
+#   B: 読み出し中に例外が発生するか
+#   C: 終端前に close されるか
+# ======================================================================
+class TestPrefetchReader:
+
+    def test_reads_all_blocks_in_order(self):
+        """A=True, B=False, C=False: 入力と同じ内容を順に返す"""
+        data = bytes(range(256)) * 100
+        with PrefetchReader(io.BytesIO(data), block_size=1000, max_blocks=2) as reader:
+            assert reader.read() == data
+            assert reader.read(10) == b""
+
+    def test_read_returns_at_most_requested_size(self):
+        """A=True, B=False, C=False: 1ブロックより小さい read でも分割して返す"""
+        with PrefetchReader(io.BytesIO(b"abcdef"), block_size=4) as reader:
+            assert reader.read(3) == b"abc"
+            assert reader.read(3) == b"d"
+            assert reader.read(3) == b"ef"
+            assert reader.read(3) == b""
+
+    def test_error_is_raised_on_read(self):
+        """A=False, B=True, C=False: 読み出し前のデータを返した後に例外を送出する"""
+        with PrefetchReader(_FailingStream(b"head"), block_size=4) as reader:
+            assert reader.read(4) == b"head"
+            with pytest.raises(IOError, match="connection reset"):
+                reader.read(4)
+
+    def test_close_before_eof_stops_thread_and_closes_source(self):
+        """A=False, B=False, C=True: キューが満杯でも close でスレッドが終了し、source も閉じる"""
+        source = io.BytesIO(b"x" * 100)
+        reader = PrefetchReader(source, block_size=1, max_blocks=1)
+        assert reader.read(1) == b"x"
+        reader.close()
+        assert not reader._thread.is_alive()
+        assert source.closed
+        with pytest.raises(ValueError):
+            reader.read(1)
+
+    def test_wrapped_by_buffered_reader(self):
+        """BufferedReader 越しでも要求サイズ単位で読める"""
+        data = b"y" * 10
+        buffered = io.BufferedReader(PrefetchReader(io.BytesIO(data), block_size=3), buffer_size=4)
+        assert buffered.read(4) == b"yyyy"
+        assert buffered.read() == b"yyyyyy"
+        buffered.close()
+        assert buffered.raw.closed
+        assert not buffered.raw._thread.is_alive()